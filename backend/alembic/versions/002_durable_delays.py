@@ -0,0 +1,27 @@
+"""Add checkpoint columns for durable delays
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-01-02 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Engine state of executions waiting on a durable delay
+    op.add_column('executions', sa.Column('checkpoint', postgresql.JSON(), nullable=True))
+    op.add_column('executions', sa.Column('resume_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('executions', 'resume_at')
+    op.drop_column('executions', 'checkpoint')
@@ -0,0 +1,38 @@
+"""Add per-node execution checkpoints
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-01-03 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create execution_checkpoints table
+    op.create_table(
+        'execution_checkpoints',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('execution_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('node_id', sa.String(100), nullable=False),
+        sa.Column('branch', sa.String(100), nullable=True),
+        sa.Column('output', sa.LargeBinary(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['execution_id'], ['executions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('execution_id', 'node_id', name='uq_execution_checkpoints_execution_node')
+    )
+    op.create_index(op.f('ix_execution_checkpoints_execution_id'), 'execution_checkpoints', ['execution_id'])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_execution_checkpoints_execution_id'), table_name='execution_checkpoints')
+    op.drop_table('execution_checkpoints')
@@ -0,0 +1,23 @@
+"""Add workflow version for worker cache invalidation
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-01-04 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('workflows', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('workflows', 'version')
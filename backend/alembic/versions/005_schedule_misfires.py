@@ -0,0 +1,25 @@
+"""Add scheduler misfire policy and last fire time
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-01-05 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('workflows', sa.Column('misfire_policy', sa.String(20), nullable=True))
+    op.add_column('workflows', sa.Column('schedule_fired_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('workflows', 'schedule_fired_at')
+    op.drop_column('workflows', 'misfire_policy')
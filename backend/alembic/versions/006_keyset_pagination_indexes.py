@@ -0,0 +1,24 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-01-06 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_executions_workflow_created_id', 'executions', ['workflow_id', 'created_at', 'id'])
+    op.create_index('ix_execution_logs_execution_timestamp_id', 'execution_logs', ['execution_id', 'timestamp', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_execution_logs_execution_timestamp_id', table_name='execution_logs')
+    op.drop_index('ix_executions_workflow_created_id', table_name='executions')
@@ -0,0 +1,89 @@
+"""
+Benchmark: pooled HTTP client vs a new client per request
+
+Starts a keep-alive HTTP/1.1 stub server on localhost and issues the same
+requests through a fresh ``httpx.AsyncClient`` per request (the old
+``HTTPRequestNode`` behaviour) and through the shared registry client.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_http_pool
+"""
+import asyncio
+import time
+import httpx
+from workflows.http_client import HTTPClientRegistry
+
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 11\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n"
+    b'{"ok":true}'
+)
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer every request on the connection until the client closes it"""
+    try:
+        while True:
+            headers = await reader.readuntil(b"\r\n\r\n")
+            if not headers:
+                break
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def per_request(url: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one() -> None:
+        async with semaphore:
+            async with httpx.AsyncClient(timeout=30) as client:
+                response = await client.get(url)
+                response.json()
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+async def pooled(url: str, requests: int, concurrency: int) -> float:
+    registry = HTTPClientRegistry()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one() -> None:
+        async with semaphore:
+            response = await registry.get_client().get(url, timeout=30)
+            response.json()
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await registry.aclose()
+    return elapsed
+
+
+async def main() -> None:
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/"
+    
+    async with server:
+        for requests, concurrency in ((200, 1), (400, 10)):
+            fresh = await per_request(url, requests, concurrency)
+            shared = await pooled(url, requests, concurrency)
+            print(
+                f"{requests:>5} requests, concurrency {concurrency:>2}: "
+                f"per-request {requests / fresh:8.0f} req/s  "
+                f"pooled {requests / shared:8.0f} req/s  "
+                f"speedup {fresh / shared:4.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+"""
+Simulation: Celery queue depth at the top of the hour
+
+Schedules many workflows at ``0 * * * *`` and drives ``CronScheduler`` on
+a simulated clock. Enqueued runs feed a queue drained by workers at a
+fixed throughput; the benchmark prints the queue depth curve for no
+smoothing, per-workflow jitter, a token bucket, and both together.
+Schedules live in an in-memory SQLite database.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_scheduler_load
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import time
+import uuid
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from core.config import settings
+from core.database import Base
+from models.user import User
+from models.workflow import Workflow
+from scheduler.leader import LeaderLock
+from scheduler.service import CronScheduler
+from scheduler.throttle import TokenBucket
+
+WORKFLOWS = 20000
+WORKER_THROUGHPUT = 150  # Tasks drained per second
+START = datetime(2024, 1, 1, 0, 59, 50)
+DURATION = 10 * 60  # Simulated seconds
+SAMPLE_EVERY = 20  # Seconds between printed samples
+
+
+class AlwaysLeader(LeaderLock):
+    def acquire(self) -> bool:
+        return True
+    
+    def release(self) -> None:
+        pass
+
+
+def create_sessions() -> sessionmaker:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine, tables=[User.__table__, Workflow.__table__])
+    sessions = sessionmaker(bind=engine)
+    
+    db = sessions()
+    user = User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add_all(
+        Workflow(id=uuid.uuid4(), user_id=user.id, name=f"w{i}", definition={}, schedule="0 * * * *")
+        for i in range(WORKFLOWS)
+    )
+    db.commit()
+    db.close()
+    return sessions
+
+
+def simulate(sessions: sessionmaker, jitter_seconds: int, rate: Optional[float]) -> List[int]:
+    """Run the scheduler on a simulated clock; returns enqueued runs per second"""
+    settings.SCHEDULER_JITTER_WINDOW_SECONDS = jitter_seconds
+    
+    # Forget the previous scenario's runs so they are not seen as already fired
+    db = sessions()
+    db.execute(update(Workflow).values(schedule_fired_at=None))
+    db.commit()
+    db.close()
+    elapsed = [0.0]
+    arrivals = [0] * DURATION
+    
+    def clock() -> datetime:
+        return START + timedelta(seconds=elapsed[0])
+    
+    def enqueue(runs) -> int:
+        arrivals[min(int(elapsed[0]), DURATION - 1)] += len(runs)
+        return len(runs)
+    
+    bucket = TokenBucket(rate, int(rate), clock=lambda: elapsed[0]) if rate else None
+    scheduler = CronScheduler(AlwaysLeader(), session_factory=sessions, enqueue=enqueue, clock=clock, bucket=bucket)
+    
+    while elapsed[0] < DURATION:
+        sleep = scheduler.run_once()
+        elapsed[0] += max(sleep, 0.01)
+    
+    return arrivals
+
+
+def queue_depth(arrivals: List[int]) -> List[int]:
+    """Queue depth at the end of each second with a fixed drain rate"""
+    depth = 0
+    curve = []
+    for count in arrivals:
+        depth = max(0, depth + count - WORKER_THROUGHPUT)
+        curve.append(depth)
+    return curve
+
+
+def main() -> None:
+    print(f"{WORKFLOWS} workflows at '0 * * * *', workers drain {WORKER_THROUGHPUT} tasks/s")
+    sessions = create_sessions()
+    
+    scenarios = [
+        ("no smoothing", 0, None),
+        ("jitter 300s", 300, None),
+        ("bucket 200/s", 0, 200.0),
+        ("jitter 300s + bucket 200/s", 300, 200.0),
+    ]
+    
+    curves: Dict[str, List[int]] = {}
+    print()
+    print(f"{'scenario':<28} {'last queued':>11} {'peak depth':>10} {'max wait s':>10} {'drained at':>10} {'sim time s':>10}")
+    for name, jitter_seconds, rate in scenarios:
+        start = time.perf_counter()
+        arrivals = simulate(sessions, jitter_seconds, rate)
+        took = time.perf_counter() - start
+        
+        curve = queue_depth(arrivals)
+        curves[name] = curve
+        peak = max(curve)
+        last_queued = START + timedelta(seconds=max(i for i, count in enumerate(arrivals) if count))
+        drained = "-"
+        if peak:
+            last_busy = max(i for i, depth in enumerate(curve) if depth)
+            drained = (START + timedelta(seconds=last_busy + 1)).strftime('%H:%M:%S')
+        print(
+            f"{name:<28} {last_queued.strftime('%H:%M:%S'):>11} {peak:>10} "
+            f"{peak / WORKER_THROUGHPUT:>10.0f} {drained:>10} {took:>10.2f}"
+        )
+    
+    print()
+    print("Queue depth (tasks waiting) over time:")
+    print(f"{'time':<10}" + "".join(f"{name[:14]:>16}" for name in curves))
+    for second in range(0, DURATION, SAMPLE_EVERY):
+        moment = START + timedelta(seconds=second)
+        print(f"{moment.strftime('%H:%M:%S'):<10}" + "".join(f"{curve[second]:>16}" for curve in curves.values()))
+
+
+if __name__ == "__main__":
+    main()
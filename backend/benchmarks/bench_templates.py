@@ -0,0 +1,98 @@
+"""
+Microbenchmark: compiled config templates vs per-call regex resolution
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_templates
+"""
+import re
+import time
+from typing import Any, Dict
+from workflows.context import ExecutionContext
+from workflows.templates import compile_config
+
+
+def legacy_resolve_variable(context: ExecutionContext, expression: str) -> Any:
+    """Pre-compiler resolution: re.sub with an uncompiled pattern on every call"""
+    def replace_var(match):
+        parts = match.group(1).strip().split('.')
+        if parts[0].startswith('node_'):
+            value = context.get_node_output(parts[0])
+        elif context.has_global_var(parts[0]):
+            value = context.get_global_var(parts[0])
+        else:
+            return match.group(0)
+        for part in parts[1:]:
+            if not isinstance(value, dict):
+                return match.group(0)
+            value = value.get(part)
+            if value is None:
+                return ""
+        return str(value) if value is not None else ""
+    
+    return re.sub(r'\{\{([^}]+)\}\}', replace_var, expression)
+
+
+def legacy_resolve_dict(context: ExecutionContext, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pre-compiler resolution: walk and rebuild the whole dict on every call"""
+    result = {}
+    for key, value in data.items():
+        if isinstance(value, str):
+            result[key] = legacy_resolve_variable(context, value)
+        elif isinstance(value, dict):
+            result[key] = legacy_resolve_dict(context, value)
+        elif isinstance(value, list):
+            result[key] = [
+                legacy_resolve_variable(context, item) if isinstance(item, str)
+                else legacy_resolve_dict(context, item) if isinstance(item, dict)
+                else item
+                for item in value
+            ]
+        else:
+            result[key] = value
+    return result
+
+
+def build_config(fields: int, dynamic_ratio: float) -> Dict[str, Any]:
+    """Build a config where a fraction of the fields hold {{...}} expressions"""
+    dynamic_every = max(1, int(1 / dynamic_ratio)) if dynamic_ratio else fields + 1
+    config: Dict[str, Any] = {}
+    for i in range(fields):
+        if i % dynamic_every == 0:
+            config[f"field_{i}"] = f"id={{{{node_1.body.items.{i % 10}}}}}"
+        elif i % 7 == 0:
+            config[f"field_{i}"] = {"nested": f"constant value {i}", "n": i}
+        else:
+            config[f"field_{i}"] = f"constant value {i}"
+    return config
+
+
+def run(fields: int, dynamic_ratio: float, iterations: int) -> None:
+    context = ExecutionContext()
+    context.set_node_output('node_1', {'body': {'items': {str(i): i for i in range(10)}}})
+    config = build_config(fields, dynamic_ratio)
+    
+    template = compile_config(config)
+    assert template.render(context) == legacy_resolve_dict(context, config)
+    
+    start = time.perf_counter()
+    for _ in range(iterations):
+        legacy_resolve_dict(context, config)
+    legacy = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(iterations):
+        template.render(context)
+    compiled = time.perf_counter() - start
+    
+    print(
+        f"{fields:>5} fields, {dynamic_ratio:>4.0%} dynamic: "
+        f"legacy {legacy / iterations * 1e6:9.1f} us  "
+        f"compiled {compiled / iterations * 1e6:9.1f} us  "
+        f"speedup {legacy / compiled:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    for fields in (100, 500, 2000):
+        for ratio in (0.0, 0.05, 0.25):
+            run(fields, ratio, iterations=max(50, 20000 // fields))
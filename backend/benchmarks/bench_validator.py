@@ -0,0 +1,124 @@
+"""
+Benchmark: workflow validation on 1k, 10k and 100k node graphs
+
+Validates synthetic chains (one long path) and layered DAGs (nodes wired
+to a few nodes of the previous layer) and prints the time per node. The
+time per node must stay roughly flat as graphs grow: the run fails if the
+100k graphs cost more than 4x per node what the 1k graphs do (a quadratic
+pass would cost 100x; some growth comes from larger dicts falling out of
+CPU caches). The recursive validator this replaced is run alongside for
+reference.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_validator
+"""
+import random
+import sys
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, List
+from workflows.validator import WorkflowValidator
+
+SIZES = (1000, 10000, 100000)
+MAX_GROWTH = 4.0  # Allowed per-node slowdown from the smallest to the largest graph
+
+
+def legacy_validate(definition: Dict[str, Any]) -> List[str]:
+    """Previous validator: recursive DFS for cycles, then a separate Kahn sort"""
+    nodes, edges = definition['nodes'], definition['edges']
+    
+    graph = defaultdict(list)
+    for edge in edges:
+        graph[edge['from']].append(edge['to'])
+    visited, rec_stack = set(), set()
+    
+    def has_cycle_dfs(node_id):
+        visited.add(node_id)
+        rec_stack.add(node_id)
+        for neighbor in graph[node_id]:
+            if neighbor not in visited:
+                if has_cycle_dfs(neighbor):
+                    return True
+            elif neighbor in rec_stack:
+                return True
+        rec_stack.remove(node_id)
+        return False
+    
+    for node in nodes:
+        if node['id'] not in visited and has_cycle_dfs(node['id']):
+            raise ValueError("cycle")
+    
+    graph = defaultdict(list)
+    in_degree = {node['id']: 0 for node in nodes}
+    for edge in edges:
+        graph[edge['from']].append(edge['to'])
+        in_degree[edge['to']] += 1
+    queue = deque([node_id for node_id, degree in in_degree.items() if degree == 0])
+    order = []
+    while queue:
+        node_id = queue.popleft()
+        order.append(node_id)
+        for neighbor in graph[node_id]:
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                queue.append(neighbor)
+    return order
+
+
+def chain(size: int) -> Dict[str, Any]:
+    """Linear workflow node_0 -> node_1 -> ... -> node_{size-1}"""
+    nodes = [{'id': f"node_{i}", 'type': 'delay'} for i in range(size)]
+    edges = [{'from': f"node_{i}", 'to': f"node_{i + 1}"} for i in range(size - 1)]
+    return {'nodes': nodes, 'edges': edges}
+
+
+def layered(size: int, width: int = 50, fan_in: int = 3) -> Dict[str, Any]:
+    """DAG of layers of ``width`` nodes, each reading ``fan_in`` nodes of the previous layer"""
+    rng = random.Random(size)
+    nodes = [{'id': f"node_{i}", 'type': 'delay'} for i in range(size)]
+    edges = []
+    for i in range(width, size):
+        layer_start = (i // width - 1) * width
+        for source in rng.sample(range(layer_start, layer_start + width), fan_in):
+            edges.append({'from': f"node_{source}", 'to': f"node_{i}"})
+    return {'nodes': nodes, 'edges': edges}
+
+
+def measure(validate: Callable[[Dict[str, Any]], Any], definition: Dict[str, Any]) -> float:
+    """Best of three runs, in seconds"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        validate(definition)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(name: str, build: Callable[[int], Dict[str, Any]]) -> bool:
+    per_node = []
+    for size in SIZES:
+        definition = build(size)
+        elapsed = measure(WorkflowValidator.validate, definition)
+        per_node.append(elapsed / size)
+        
+        try:
+            legacy = f"{measure(legacy_validate, definition) * 1e3:9.1f} ms"
+        except RecursionError:
+            legacy = "RecursionError"
+        
+        print(
+            f"{name:>8} {size:>7} nodes {len(definition['edges']):>7} edges: "
+            f"{elapsed * 1e3:9.1f} ms  {elapsed / size * 1e6:6.2f} us/node  "
+            f"legacy {legacy}"
+        )
+    
+    growth = per_node[-1] / per_node[0]
+    print(f"{name:>8} per-node growth {SIZES[0]} -> {SIZES[-1]}: {growth:.2f}x")
+    return growth <= MAX_GROWTH
+
+
+if __name__ == "__main__":
+    linear = [run("chain", chain), run("layered", layered)]
+    if not all(linear):
+        print(f"FAIL: per-node time grew more than {MAX_GROWTH}x")
+        sys.exit(1)
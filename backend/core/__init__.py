@@ -1,5 +1,6 @@
 from core.config import settings
 from core.database import Base, SessionLocal, engine, get_db
+from core.async_database import AsyncSessionLocal, async_engine, get_async_db
 from core.security import hash_password, verify_password, create_access_token, decode_token
 from core.dependencies import get_current_user
 
@@ -9,6 +10,9 @@ __all__ = [
     "SessionLocal",
     "engine",
     "get_db",
+    "AsyncSessionLocal",
+    "async_engine",
+    "get_async_db",
     "hash_password",
     "verify_password",
     "create_access_token",
@@ -0,0 +1,67 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from core.config import settings
+
+# Async drivers used in place of the sync ones in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url() -> str:
+    """
+    Get the database URL for the async engine
+    
+    Returns:
+        ``ASYNC_DATABASE_URL`` if set, otherwise ``DATABASE_URL`` with its
+        driver swapped for asyncpg (PostgreSQL) or aiosqlite (SQLite)
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    
+    url = make_url(settings.DATABASE_URL)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def _engine_options(url: str) -> dict:
+    """Pool options; SQLite uses a single-connection pool without sizing"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    
+    return {
+        "pool_pre_ping": True,
+        "pool_size": 10,
+        "max_overflow": 20,
+    }
+
+
+ASYNC_DATABASE_URL = get_async_database_url()
+
+# Create async database engine; connections are bound to the event loop
+# that opened them, i.e. the worker loop or the API server loop
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.DEBUG,
+    **_engine_options(ASYNC_DATABASE_URL),
+)
+
+# Create async session factory; objects stay usable after commit
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db():
+    """Dependency to get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled connections; must run on the loop that opened them"""
+    await async_engine.dispose()
@@ -0,0 +1,175 @@
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+from datetime import datetime
+from uuid import UUID
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from core.cache_bus import cache_bus
+from core.config import settings
+from models.user import User
+
+# Cache name used on the invalidation bus
+USER_CACHE = "user"
+
+# Session.info key collecting users changed in the current transaction
+_CHANGED_USERS = "changed_user_ids"
+
+
+class Principal:
+    """
+    Authenticated user as seen by route handlers
+    
+    A detached snapshot of the columns needed to authorize a request and to
+    render ``UserResponse``, so it can be shared between requests and does
+    not keep a database session alive.
+    """
+    
+    __slots__ = ('id', 'email', 'full_name', 'is_active', 'is_superuser', 'created_at', 'updated_at')
+    
+    def __init__(
+        self,
+        id: UUID,
+        email: str,
+        full_name: Optional[str],
+        is_active: bool,
+        is_superuser: bool,
+        created_at: datetime,
+        updated_at: datetime,
+    ):
+        self.id = id
+        self.email = email
+        self.full_name = full_name
+        self.is_active = is_active
+        self.is_superuser = is_superuser
+        self.created_at = created_at
+        self.updated_at = updated_at
+    
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Snapshot a user row"""
+        return cls(
+            user.id,
+            user.email,
+            user.full_name,
+            bool(user.is_active),
+            bool(user.is_superuser),
+            user.created_at,
+            user.updated_at,
+        )
+    
+    def __repr__(self):
+        return f"<Principal {self.email}>"
+
+
+class PrincipalCache:
+    """
+    Per-process LRU cache of principals keyed by the token's ``sub`` claim
+    
+    Entries expire ``ttl`` seconds after they were loaded. Committed updates
+    and deletes of a user evict its entry in every process through the cache
+    invalidation bus, so deactivating a user takes effect without waiting
+    for the TTL; the TTL bounds staleness if a message is lost.
+    """
+    
+    def __init__(self, maxsize: int = 10000, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, subject: str) -> Optional[Principal]:
+        """
+        Get the cached principal for a token subject
+        
+        Args:
+            subject: User ID from the token's ``sub`` claim
+        
+        Returns:
+            Principal, or None if it is not cached or has expired
+        """
+        now = time.monotonic()
+        
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is not None:
+                principal, expires_at = entry
+                if now < expires_at:
+                    self._entries.move_to_end(subject)
+                    self.hits += 1
+                    return principal
+                del self._entries[subject]
+            self.misses += 1
+            return None
+    
+    def put(self, subject: str, principal: Principal) -> None:
+        """
+        Cache a principal
+        
+        Args:
+            subject: User ID from the token's ``sub`` claim
+            principal: Principal loaded from the database
+        """
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        
+        with self._lock:
+            self._entries[subject] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, subject: str) -> None:
+        """Drop the entry for a user"""
+        with self._lock:
+            self._entries.pop(str(subject), None)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _track_changed_user(mapper, connection, target: User) -> None:
+    """Remember users written in a flush until the transaction commits"""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(str(target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    """Evict committed user changes locally and in other processes"""
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        principal_cache.invalidate(user_id)
+        cache_bus.publish(USER_CACHE, user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_users(session: Session, previous_transaction) -> None:
+    """Forget changes that were rolled back"""
+    session.info.pop(_CHANGED_USERS, None)
+
+
+# Per-process cache shared by all requests in an API worker
+principal_cache = PrincipalCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+cache_bus.subscribe(USER_CACHE, principal_cache.invalidate)
@@ -0,0 +1,122 @@
+from typing import Callable, Dict, List, Optional
+import json
+import logging
+import threading
+import time
+import redis
+from core.config import settings
+
+# Plain stdlib logger: utils.logging imports core, which imports this module
+# through the auth cache
+logger = logging.getLogger(__name__)
+
+
+class CacheInvalidationBus:
+    """
+    Redis pub/sub channel telling processes to drop cached entries
+    
+    Writers call ``publish(cache, key)`` after committing a change. Each
+    process that keeps a cache registers a callback with ``subscribe`` and
+    runs ``start`` once (after forking) to listen on a background thread.
+    Messages are best effort: caches must still validate entries on their
+    own (e.g. with a version check), the bus only makes them drop stale
+    entries sooner.
+    """
+    
+    def __init__(self, channel: str, redis_url: str):
+        self.channel = channel
+        self.redis_url = redis_url
+        self._callbacks: Dict[str, List[Callable[[str], None]]] = {}
+        self._client: Optional[redis.Redis] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+    
+    def _get_client(self) -> redis.Redis:
+        """Get the Redis client, creating it on first use"""
+        if self._client is None:
+            # Short timeouts: publishing must not stall requests if Redis is down
+            self._client = redis.Redis.from_url(self.redis_url, socket_connect_timeout=1.0, socket_timeout=1.0)
+        return self._client
+    
+    def publish(self, cache: str, key: str) -> None:
+        """
+        Announce that an entry changed
+        
+        Args:
+            cache: Name of the cache the entry belongs to
+            key: Key of the changed entry
+        """
+        message = json.dumps({'cache': cache, 'key': key})
+        
+        try:
+            self._get_client().publish(self.channel, message)
+        except redis.RedisError as e:
+            logger.warning(f"Cache bus: could not publish invalidation for {cache}:{key} - {str(e)}")
+    
+    def subscribe(self, cache: str, callback: Callable[[str], None]) -> None:
+        """
+        Register a callback invoked with the key of each invalidated entry
+        
+        Args:
+            cache: Name of the cache to listen for
+            callback: Function dropping the entry; runs on the listener thread
+        """
+        callbacks = self._callbacks.setdefault(cache, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+    
+    def start(self) -> None:
+        """Start the listener thread if it is not running yet"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            
+            # A client inherited from a parent process must not be reused
+            self._client = None
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+            self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the listener thread"""
+        self._stopping.set()
+    
+    def _listen(self) -> None:
+        """Dispatch invalidation messages, reconnecting after errors"""
+        while not self._stopping.is_set():
+            pubsub = None
+            try:
+                pubsub = redis.Redis.from_url(self.redis_url).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                
+                while not self._stopping.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._dispatch(message['data'])
+            except redis.RedisError as e:
+                logger.warning(f"Cache bus: listener error - {str(e)}; reconnecting")
+                time.sleep(1.0)
+            finally:
+                if pubsub is not None:
+                    pubsub.close()
+    
+    def _dispatch(self, data: bytes) -> None:
+        """Run the callbacks registered for a message's cache"""
+        try:
+            message = json.loads(data)
+            callbacks = self._callbacks.get(message['cache'], ())
+            key = message['key']
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Cache bus: ignoring malformed message {data!r}")
+            return
+        
+        for callback in callbacks:
+            try:
+                callback(key)
+            except Exception as e:
+                logger.warning(f"Cache bus: callback failed for {message['cache']}:{key} - {str(e)}")
+
+
+# Per-process bus shared by all caches
+cache_bus = CacheInvalidationBus(settings.CACHE_INVALIDATION_CHANNEL, settings.REDIS_URL)
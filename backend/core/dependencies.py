@@ -1,6 +1,8 @@
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthCredentials
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from core.auth_cache import Principal, principal_cache
 from core.database import get_db
 from core.security import decode_token
 from models.user import User
@@ -9,10 +11,15 @@ security = HTTPBearer()
 
 
 async def get_current_user(
-    credentials: HTTPAuthCredentials = Depends(security),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> User:
-    """Get the current authenticated user from JWT token"""
+) -> Principal:
+    """
+    Get the current authenticated user from JWT token
+    
+    The user is looked up in the per-process principal cache first, so
+    most requests authenticate without a database query.
+    """
     token = credentials.credentials
     
     payload = decode_token(token)
@@ -23,25 +30,30 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id: str = payload.get("sub")
-    if not user_id:
+    try:
+        user_id = str(UUID(payload.get("sub")))
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = db.query(User).filter(User.id == UUID(user_id)).first()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        
+        principal = Principal.from_user(user)
+        principal_cache.put(user_id, principal)
     
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User is inactive",
         )
     
-    return user
-
+    return principal
@@ -0,0 +1,125 @@
+from typing import Any, List, Optional, Tuple
+from datetime import datetime
+from uuid import UUID
+import asyncio
+import json
+import redis
+import redis.asyncio as aioredis
+from core.config import settings
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Event types
+NODE_STARTED = "node_started"
+NODE_FINISHED = "node_finished"
+STATUS = "status"
+
+
+def execution_channel(execution_id: Any) -> str:
+    """Redis channel carrying the events of one execution"""
+    return f"{settings.EXECUTION_EVENTS_CHANNEL_PREFIX}{execution_id}"
+
+
+class ExecutionEventPublisher:
+    """
+    Publishes engine events to per-execution Redis pub/sub channels
+    
+    ``publish`` never waits on Redis: events go to a bounded in-process
+    queue and a background task sends whatever has piled up in one
+    pipeline. When the queue is full, events are dropped; subscribers
+    re-read the execution on reconnect, so events are best effort.
+    Like the HTTP client registry, the publisher is bound to the event
+    loop it first ran on.
+    """
+    
+    def __init__(self, redis_url: str, max_pending: int):
+        self.redis_url = redis_url
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._client: Optional[aioredis.Redis] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def publish(self, execution_id: UUID, event_type: str, **fields: Any) -> None:
+        """
+        Queue an event for an execution's subscribers
+        
+        Args:
+            execution_id: Execution ID
+            event_type: ``node_started``, ``node_finished`` or ``status``
+            **fields: Event payload (node_id, status, error, ...)
+        """
+        self._bind_loop()
+        
+        event = {
+            'type': event_type,
+            'execution_id': str(execution_id),
+            'timestamp': datetime.utcnow().isoformat(),
+            **fields,
+        }
+        
+        try:
+            self._queue.put_nowait((execution_channel(execution_id), json.dumps(event, default=str)))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Execution events: queue full, {self.dropped} event(s) dropped so far")
+    
+    async def aclose(self) -> None:
+        """Send queued events and close the Redis connection"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        
+        if self._queue is not None and not self._queue.empty():
+            await self._send(self._drain([]))
+        
+        if self._client is not None:
+            await self._client.aclose()
+        
+        self._client = None
+        self._queue = None
+        self._task = None
+        self._loop = None
+    
+    def _bind_loop(self) -> None:
+        """Create the queue and sender task on the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        
+        # State from a previous loop cannot be used here
+        self._loop = loop
+        self._client = aioredis.Redis.from_url(self.redis_url, socket_connect_timeout=1.0, socket_timeout=1.0)
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = loop.create_task(self._run())
+    
+    def _drain(self, batch: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Move everything queued into a batch"""
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return batch
+    
+    async def _run(self) -> None:
+        """Send queued events, one pipeline per wakeup"""
+        while True:
+            first = await self._queue.get()
+            await self._send(self._drain([first]))
+    
+    async def _send(self, batch: List[Tuple[str, str]]) -> None:
+        """Publish a batch of (channel, message) pairs"""
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for channel, message in batch:
+                    pipe.publish(channel, message)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Execution events: could not publish {len(batch)} event(s) - {str(e)}")
+
+
+# Per-process publisher used by the workflow engine
+execution_events = ExecutionEventPublisher(settings.REDIS_URL, settings.EXECUTION_EVENTS_MAX_PENDING)
@@ -1,9 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from core.cache_bus import cache_bus
 from core.config import settings
 from core.database import Base, engine
 from utils.logging import setup_logging
 from routes import auth_router, workflows_router, executions_router, integrations_router
+from websocket import event_hub, websocket_router
 
 # Setup logging
 setup_logging()
@@ -32,6 +34,25 @@ app.include_router(auth_router, prefix="/api")
 app.include_router(workflows_router, prefix="/api")
 app.include_router(executions_router, prefix="/api")
 app.include_router(integrations_router, prefix="/api")
+app.include_router(websocket_router, prefix="/api")
+
+
+@app.on_event("startup")
+def start_cache_bus():
+    """Listen for invalidations of cached principals"""
+    cache_bus.start()
+
+
+@app.on_event("shutdown")
+def stop_cache_bus():
+    """Stop the cache invalidation listener"""
+    cache_bus.stop()
+
+
+@app.on_event("shutdown")
+async def close_event_hub():
+    """Close the Redis connection behind WebSocket event streams"""
+    await event_hub.aclose()
 
 
 @app.get("/api/health")
@@ -2,6 +2,7 @@ from models.user import User
 from models.workflow import Workflow
 from models.execution import Execution
 from models.execution_log import ExecutionLog
+from models.execution_checkpoint import ExecutionCheckpoint
 from models.integration import Integration
 
 __all__ = [
@@ -9,6 +10,7 @@ __all__ = [
     "Workflow",
     "Execution",
     "ExecutionLog",
+    "ExecutionCheckpoint",
     "Integration",
 ]
 
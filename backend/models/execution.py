@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, JSON, Text, Uuid
 from datetime import datetime
 import uuid
 from core.database import Base
@@ -7,16 +6,22 @@ from core.database import Base
 
 class Execution(Base):
     __tablename__ = "executions"
+    __table_args__ = (
+        # Keyset pagination of a workflow's executions
+        Index("ix_executions_workflow_created_id", "workflow_id", "created_at", "id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    workflow_id = Column(UUID(as_uuid=True), ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False, index=True)
-    status = Column(String(50), default="pending", index=True)  # pending, running, success, failed, cancelled
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    workflow_id = Column(Uuid(as_uuid=True), ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(50), default="pending", index=True)  # pending, running, waiting, success, failed, cancelled
     trigger_type = Column(String(50), nullable=False)  # manual, scheduled, webhook
-    triggered_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    triggered_by = Column(Uuid(as_uuid=True), ForeignKey("users.id"), nullable=True)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
     result_data = Column(JSON, nullable=True)  # Output data from execution
+    checkpoint = Column(JSON, nullable=True)  # Engine state while waiting on a durable delay
+    resume_at = Column(DateTime, nullable=True)  # When a waiting execution is resumed
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     
     def __repr__(self):
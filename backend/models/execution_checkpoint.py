@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, LargeBinary, UniqueConstraint, Uuid
+from datetime import datetime
+import uuid
+from core.database import Base
+
+
+class ExecutionCheckpoint(Base):
+    __tablename__ = "execution_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("execution_id", "node_id", name="uq_execution_checkpoints_execution_node"),
+    )
+    
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    execution_id = Column(Uuid(as_uuid=True), ForeignKey("executions.id", ondelete="CASCADE"), nullable=False, index=True)
+    node_id = Column(String(100), nullable=False)
+    branch = Column(String(100), nullable=True)  # Branch label selected by the node's output
+    output = Column(LargeBinary, nullable=True)  # zlib-compressed compact JSON of the node output
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<ExecutionCheckpoint {self.execution_id} - {self.node_id}>"
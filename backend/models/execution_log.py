@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, JSON, Text, Uuid
 from datetime import datetime
 import uuid
 from core.database import Base
@@ -7,13 +6,18 @@ from core.database import Base
 
 class ExecutionLog(Base):
     __tablename__ = "execution_logs"
+    __table_args__ = (
+        # Keyset pagination and ordered export of an execution's logs
+        Index("ix_execution_logs_execution_timestamp_id", "execution_id", "timestamp", "id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    execution_id = Column(UUID(as_uuid=True), ForeignKey("executions.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    execution_id = Column(Uuid(as_uuid=True), ForeignKey("executions.id", ondelete="CASCADE"), nullable=False, index=True)
     node_id = Column(String(100), nullable=False)
     level = Column(String(20), nullable=False)  # info, warning, error
     message = Column(Text, nullable=False)
-    metadata = Column(JSON, nullable=True)  # Additional context
+    # "metadata" is reserved on declarative models, so the attribute is renamed
+    log_metadata = Column("metadata", JSON, nullable=True)  # Additional context
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     
     def __repr__(self):
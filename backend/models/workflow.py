@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON, Integer, Uuid
 from datetime import datetime
 import uuid
 from core.database import Base
@@ -8,13 +7,16 @@ from core.database import Base
 class Workflow(Base):
     __tablename__ = "workflows"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     definition = Column(JSON, nullable=False)  # Workflow graph structure
     is_active = Column(Boolean, default=True, index=True)
     schedule = Column(String(100), nullable=True)  # Cron expression
+    misfire_policy = Column(String(20), nullable=True)  # skip, fire_once, catch_up_all; scheduler default if null
+    schedule_fired_at = Column(DateTime, nullable=True)  # Scheduled runs up to this time were enqueued
+    version = Column(Integer, default=1, nullable=False)  # Bumped on every update, used by worker caches
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
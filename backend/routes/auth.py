@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from core.database import get_db
+from core.auth_cache import Principal
 from core.dependencies import get_current_user
 from schemas.user import UserCreate, LoginRequest, LoginResponse, UserResponse
 from services.auth_service import AuthService
-from models.user import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -60,7 +60,7 @@ def login(
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """Get current user information"""
     return current_user
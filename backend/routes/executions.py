@@ -1,37 +1,154 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from uuid import UUID
-from core.database import get_db
+import json
+from core.database import SessionLocal, get_db
+from core.auth_cache import Principal
 from core.dependencies import get_current_user
-from schemas.execution import ExecutionCreate, ExecutionResponse, ExecutionLogResponse
+from schemas.execution import (
+    ExecutionCreate,
+    ExecutionBulkCreate,
+    ExecutionBulkResponse,
+    ExecutionResponse,
+    ExecutionLogResponse,
+)
 from services.execution_service import ExecutionService
-from models.user import User
+from services.workflow_service import WorkflowService
+from utils.errors import InvalidStatusTransition, ValidationError, WorkflowNotFound
+from workers.tasks import execute_workflow, resume_execution, enqueue_executions
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/executions", tags=["executions"])
 
+NDJSON = "application/x-ndjson"
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _wants_ndjson(request: Request) -> bool:
+    """Check if the client asked for an NDJSON stream"""
+    return NDJSON in request.headers.get("accept", "")
+
+
+def _publish_failed(db: Session, execution_ids: List[UUID], error: Exception) -> HTTPException:
+    """
+    Fail executions whose tasks could not be queued
+    
+    Without their task they would stay pending forever; the client gets a
+    503 and may trigger them again.
+    """
+    message = f"Could not queue execution: {str(error)}"
+    logger.error(f"{message} ({len(execution_ids)} execution(s))")
+    ExecutionService.fail_pending_executions(db, execution_ids, message)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=message,
+    )
+
+
+def _json_default(value: Any) -> str:
+    """Encode values the way the JSON responses do"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson_response(open_stream: Callable[[Session], Iterator[List[Dict[str, Any]]]]) -> StreamingResponse:
+    """
+    Stream row chunks as NDJSON
+    
+    The stream gets its own session, closed when the response ends,
+    because the request's session may be closed before the body is sent.
+    
+    Args:
+        open_stream: Service call returning row chunks for a session
+    
+    Returns:
+        Streaming response, one JSON object per line
+    """
+    db = SessionLocal()
+    try:
+        chunks = open_stream(db)
+    except ValidationError as e:
+        db.close()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    def lines() -> Iterator[str]:
+        try:
+            for rows in chunks:
+                yield "".join(
+                    json.dumps(dict(row), default=_json_default, separators=(",", ":")) + "\n"
+                    for row in rows
+                )
+        finally:
+            chunks.close()
+            db.close()
+    
+    return StreamingResponse(lines(), media_type=NDJSON)
+
 
 @router.post("", response_model=ExecutionResponse)
 def create_execution(
     execution_data: ExecutionCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Create a new execution (trigger workflow)"""
     try:
-        execution = ExecutionService.create_execution(db, current_user, execution_data)
-        # TODO: Queue execution task with Celery
-        return execution
+        execution = ExecutionService.create_execution(db, current_user.id, execution_data)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    
+    try:
+        execute_workflow.delay(str(execution.id), str(execution.workflow_id), str(current_user.id))
+    except Exception as e:
+        raise _publish_failed(db, [execution.id], e)
+    
+    return execution
+
+
+@router.post("/bulk", response_model=ExecutionBulkResponse)
+def create_executions_bulk(
+    bulk_data: ExecutionBulkCreate,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Create and queue many executions in one request"""
+    try:
+        execution_ids = ExecutionService.create_executions(db, current_user, bulk_data.executions)
+    except WorkflowNotFound as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    
+    try:
+        enqueue_executions(
+            (execution_id, execution_data.workflow_id, current_user.id)
+            for execution_id, execution_data in zip(execution_ids, bulk_data.executions)
+        )
+    except Exception as e:
+        raise _publish_failed(db, execution_ids, e)
+    
+    return ExecutionBulkResponse(count=len(execution_ids), execution_ids=execution_ids)
 
 
 @router.get("/{execution_id}", response_model=ExecutionResponse)
 def get_execution(
     execution_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get a specific execution"""
@@ -45,32 +162,114 @@ def get_execution(
         )
 
 
-@router.get("/{execution_id}/logs", response_model=list[ExecutionLogResponse])
-def get_execution_logs(
+@router.post("/{execution_id}/resume", response_model=ExecutionResponse)
+def resume_failed_execution(
     execution_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Get logs for a specific execution"""
+    """Resume a failed execution from its last completed nodes"""
     try:
-        logs = ExecutionService.get_execution_logs(db, execution_id)
-        return logs
-    except ValueError:
+        execution = ExecutionService.get_execution(db, execution_id, current_user)
+        # Only the workflow's owner may resume its executions
+        WorkflowService.get_workflow(db, execution.workflow_id, current_user)
+    except (ValueError, WorkflowNotFound):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Execution not found",
         )
+    
+    try:
+        execution = ExecutionService.prepare_resume(db, execution.id)
+    except InvalidStatusTransition as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+    
+    try:
+        resume_execution.delay(str(execution.id), str(execution.workflow_id), str(current_user.id))
+    except Exception as e:
+        raise _publish_failed(db, [execution.id], e)
+    
+    return execution
+
+
+@router.get("/{execution_id}/logs", response_model=list[ExecutionLogResponse])
+def get_execution_logs(
+    execution_id: UUID,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get logs for a specific execution
+    
+    Without ``limit`` all logs are returned. With ``limit`` the next page
+    is fetched by passing the ``X-Next-Cursor`` response header back as
+    ``cursor``. With ``Accept: application/x-ndjson`` the logs (after
+    ``cursor``, if given) are streamed one JSON object per line.
+    """
+    if _wants_ndjson(request):
+        return _ndjson_response(
+            lambda stream_db: ExecutionService.stream_execution_logs(stream_db, execution_id, cursor)
+        )
+    
+    try:
+        if limit is None and cursor is None:
+            return ExecutionService.get_execution_logs(db, execution_id)
+        
+        logs, next_cursor = ExecutionService.get_execution_logs_page(db, execution_id, limit or 100, cursor)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return logs
 
 
 @router.get("/workflow/{workflow_id}", response_model=list[ExecutionResponse])
 def list_workflow_executions(
     workflow_id: UUID,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """List executions for a specific workflow"""
-    executions = ExecutionService.list_executions(db, workflow_id, skip, limit)
+    """
+    List executions for a specific workflow, newest first
+    
+    Pages are fetched by passing the ``X-Next-Cursor`` response header
+    back as ``cursor``; ``skip`` is still accepted but slows down on deep
+    pages. With ``Accept: application/x-ndjson`` all executions (after
+    ``cursor``, if given) are streamed one JSON object per line.
+    """
+    if _wants_ndjson(request):
+        return _ndjson_response(
+            lambda stream_db: ExecutionService.stream_executions(stream_db, workflow_id, cursor)
+        )
+    
+    if skip:
+        return ExecutionService.list_executions(db, workflow_id, skip, limit)
+    
+    try:
+        executions, next_cursor = ExecutionService.list_executions_page(db, workflow_id, limit, cursor)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return executions
 
@@ -2,10 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 from core.database import get_db
+from core.auth_cache import Principal
 from core.dependencies import get_current_user
 from schemas.integration import IntegrationCreate, IntegrationUpdate, IntegrationResponse
 from services.integration_service import IntegrationService
-from models.user import User
 
 router = APIRouter(prefix="/integrations", tags=["integrations"])
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/integrations", tags=["integrations"])
 @router.post("", response_model=IntegrationResponse)
 def create_integration(
     integration_data: IntegrationCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Create a new integration"""
@@ -31,7 +31,7 @@ def create_integration(
 def list_integrations(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """List all integrations for current user"""
@@ -42,7 +42,7 @@ def list_integrations(
 @router.get("/{integration_id}", response_model=IntegrationResponse)
 def get_integration(
     integration_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get a specific integration"""
@@ -60,7 +60,7 @@ def get_integration(
 def update_integration(
     integration_id: UUID,
     integration_data: IntegrationUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Update an integration"""
@@ -77,7 +77,7 @@ def update_integration(
 @router.delete("/{integration_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_integration(
     integration_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Delete an integration"""
@@ -2,10 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 from core.database import get_db
+from core.auth_cache import Principal
 from core.dependencies import get_current_user
 from schemas.workflow import WorkflowCreate, WorkflowUpdate, WorkflowResponse
 from services.workflow_service import WorkflowService
-from models.user import User
 from utils.errors import WorkflowNotFound
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/workflows", tags=["workflows"])
 @router.post("", response_model=WorkflowResponse)
 def create_workflow(
     workflow_data: WorkflowCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Create a new workflow"""
@@ -32,7 +32,7 @@ def create_workflow(
 def list_workflows(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """List all workflows for current user"""
@@ -43,7 +43,7 @@ def list_workflows(
 @router.get("/{workflow_id}", response_model=WorkflowResponse)
 def get_workflow(
     workflow_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get a specific workflow"""
@@ -61,7 +61,7 @@ def get_workflow(
 def update_workflow(
     workflow_id: UUID,
     workflow_data: WorkflowUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Update a workflow"""
@@ -83,7 +83,7 @@ def update_workflow(
 @router.delete("/{workflow_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_workflow(
     workflow_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Delete a workflow"""
@@ -1,2 +1,16 @@
 # Scheduler package for managing workflow scheduling
+from scheduler.cron import CronExpression
+from scheduler.heap import ScheduleHeap
+from scheduler.leader import LeaderLock, RedisLeaderLock, FileLeaderLock
+from scheduler.throttle import TokenBucket
+from scheduler.service import CronScheduler
 
+__all__ = [
+    "CronExpression",
+    "ScheduleHeap",
+    "LeaderLock",
+    "RedisLeaderLock",
+    "FileLeaderLock",
+    "TokenBucket",
+    "CronScheduler",
+]
@@ -0,0 +1,40 @@
+"""
+Run the cron scheduler: ``python -m scheduler``
+
+Start one or more replicas; only the one holding the leader lock fires.
+"""
+import signal
+import redis
+from core.cache_bus import cache_bus
+from core.config import settings
+from scheduler.leader import FileLeaderLock, LeaderLock, RedisLeaderLock
+from scheduler.service import CronScheduler
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def create_lock() -> LeaderLock:
+    """Build the leader lock configured by ``SCHEDULER_LOCK_BACKEND``"""
+    if settings.SCHEDULER_LOCK_BACKEND == "file":
+        return FileLeaderLock(settings.SCHEDULER_LOCK_FILE)
+    
+    client = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1.0, socket_timeout=1.0)
+    return RedisLeaderLock(client, settings.SCHEDULER_LOCK_KEY, settings.SCHEDULER_LOCK_TTL_SECONDS)
+
+
+def main() -> None:
+    scheduler = CronScheduler(create_lock())
+    
+    signal.signal(signal.SIGTERM, lambda *args: scheduler.stop())
+    signal.signal(signal.SIGINT, lambda *args: scheduler.stop())
+    
+    cache_bus.start()
+    try:
+        scheduler.run()
+    finally:
+        cache_bus.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+from typing import Dict, Tuple
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from utils.errors import ValidationError
+
+# Shorthands accepted in place of the five fields
+CRON_ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *',
+}
+
+MONTH_NAMES = {name: i + 1 for i, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+)}
+DAY_NAMES = {name: i for i, name in enumerate(['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'])}
+
+# Far enough to cover leap days; expressions with no match in this window never fire
+MAX_SEARCH_YEARS = 8
+
+
+def _parse_field(field: str, low: int, high: int, names: Dict[str, int]) -> Tuple[int, ...]:
+    """
+    Parse one cron field into the sorted values it allows
+    
+    Supports ``*``, single values, ``a-b`` ranges, ``/step`` and comma lists.
+    """
+    values = set()
+    
+    for part in field.lower().split(','):
+        if not part:
+            raise ValidationError(f"Empty cron field element in '{field}'")
+        
+        base, _, step_text = part.partition('/')
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValidationError(f"Invalid cron step in '{field}'")
+        
+        if base == '*':
+            start, end = low, high
+        elif '-' in base:
+            start_text, end_text = base.split('-', 1)
+            start = names.get(start_text) if start_text in names else int(start_text)
+            end = names.get(end_text) if end_text in names else int(end_text)
+        else:
+            start = names.get(base) if base in names else int(base)
+            end = high if step_text else start
+        
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise ValidationError(f"Cron field '{field}' is out of range {low}-{high}")
+        
+        values.update(range(start, end + 1, step))
+    
+    return tuple(sorted(values))
+
+
+class CronExpression:
+    """
+    Parsed five-field cron expression (minute hour day-of-month month day-of-week)
+    
+    Parsing happens once; ``next_fire`` then jumps field by field instead
+    of scanning minute by minute. Times are naive UTC. As in Vixie cron,
+    when both day-of-month and day-of-week are restricted a day matches
+    if either does.
+    """
+    
+    __slots__ = ('expression', 'minutes', 'hours', 'days', 'months', 'weekdays', '_any_day', '_any_weekday')
+    
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip().lower(), expression).split()
+        
+        if len(fields) != 5:
+            raise ValidationError(f"Cron expression '{expression}' must have 5 fields")
+        
+        try:
+            self.minutes = _parse_field(fields[0], 0, 59, {})
+            self.hours = _parse_field(fields[1], 0, 23, {})
+            self.days = _parse_field(fields[2], 1, 31, {})
+            self.months = _parse_field(fields[3], 1, 12, MONTH_NAMES)
+            # 7 is accepted as Sunday
+            weekdays = _parse_field(fields[4], 0, 7, DAY_NAMES)
+        except ValueError as e:
+            raise ValidationError(f"Invalid cron expression '{expression}': {str(e)}")
+        
+        self.weekdays = tuple(sorted({day % 7 for day in weekdays}))
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+    
+    def __repr__(self) -> str:
+        return f"<CronExpression {self.expression}>"
+    
+    def _day_matches(self, moment: datetime) -> bool:
+        """Check day-of-month and day-of-week with cron's OR rule"""
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        
+        if self._any_day:
+            return weekday_ok
+        if self._any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+    
+    def next_fire(self, after: datetime) -> datetime:
+        """
+        Get the first fire time strictly after a moment
+        
+        Args:
+            after: Reference time (naive UTC)
+        
+        Returns:
+            Next matching minute
+        
+        Raises:
+            ValidationError: If the expression never matches (e.g. February 30)
+        """
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after.year + MAX_SEARCH_YEARS
+        
+        while moment.year <= limit:
+            if moment.month not in self.months:
+                index = bisect_left(self.months, moment.month)
+                if index < len(self.months):
+                    moment = moment.replace(month=self.months[index], day=1, hour=0, minute=0)
+                else:
+                    moment = moment.replace(year=moment.year + 1, month=self.months[0], day=1, hour=0, minute=0)
+                continue
+            
+            if not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            
+            if moment.hour not in self.hours:
+                index = bisect_left(self.hours, moment.hour)
+                if index < len(self.hours):
+                    moment = moment.replace(hour=self.hours[index], minute=0)
+                else:
+                    moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            
+            if moment.minute not in self.minutes:
+                index = bisect_left(self.minutes, moment.minute)
+                if index < len(self.minutes):
+                    moment = moment.replace(minute=self.minutes[index])
+                else:
+                    moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+            
+            return moment
+        
+        raise ValidationError(f"Cron expression '{self.expression}' never fires")
@@ -0,0 +1,89 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import heapq
+import itertools
+from uuid import UUID
+
+
+class ScheduleHeap:
+    """
+    Min-heap of next fire times keyed by workflow ID
+    
+    ``upsert`` and ``remove`` are O(log n): replaced entries stay in the
+    heap and are skipped when they surface (lazy deletion), and the heap is
+    rebuilt once stale entries outnumber live ones.
+    """
+    
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, UUID]] = []
+        self._entries: Dict[UUID, Tuple[datetime, int, UUID]] = {}
+        self._counter = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, workflow_id: UUID) -> bool:
+        return workflow_id in self._entries
+    
+    def get(self, workflow_id: UUID) -> Optional[datetime]:
+        """Get the next fire time of a workflow, or None if it is not scheduled"""
+        entry = self._entries.get(workflow_id)
+        return entry[0] if entry is not None else None
+    
+    def upsert(self, workflow_id: UUID, fire_at: datetime) -> None:
+        """Schedule a workflow, replacing its previous fire time"""
+        entry = (fire_at, next(self._counter), workflow_id)
+        self._entries[workflow_id] = entry
+        heapq.heappush(self._heap, entry)
+        self._maybe_compact()
+    
+    def remove(self, workflow_id: UUID) -> None:
+        """Unschedule a workflow"""
+        if self._entries.pop(workflow_id, None) is not None:
+            self._maybe_compact()
+    
+    def clear(self) -> None:
+        """Unschedule everything"""
+        self._heap = []
+        self._entries = {}
+    
+    def next_deadline(self) -> Optional[datetime]:
+        """Get the earliest fire time, or None if nothing is scheduled"""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+    
+    def pop_due(self, now: datetime, limit: Optional[int] = None) -> List[Tuple[UUID, datetime]]:
+        """
+        Remove and return the workflows due at or before a moment
+        
+        Args:
+            now: Current time
+            limit: Max number of entries to pop
+        
+        Returns:
+            (workflow_id, fire_at) pairs in fire time order
+        """
+        due = []
+        
+        while self._heap and (limit is None or len(due) < limit):
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            
+            fire_at, _, workflow_id = heapq.heappop(self._heap)
+            del self._entries[workflow_id]
+            due.append((workflow_id, fire_at))
+        
+        return due
+    
+    def _drop_stale(self) -> None:
+        """Pop replaced or removed entries off the top of the heap"""
+        heap = self._heap
+        while heap and self._entries.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+    
+    def _maybe_compact(self) -> None:
+        """Rebuild the heap when most of it is stale"""
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
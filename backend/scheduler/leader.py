@@ -0,0 +1,118 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+import fcntl
+import os
+import uuid
+import redis
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LeaderLock(ABC):
+    """
+    Lock held by the single active scheduler replica
+    
+    ``acquire`` is non-blocking and is called on every scheduler loop: it
+    takes the lock if it is free and renews it if this replica already
+    holds it. A replica that loses the lock stops firing.
+    """
+    
+    @abstractmethod
+    def acquire(self) -> bool:
+        """Take or renew the lock; returns True while this replica is leader"""
+        pass
+    
+    @abstractmethod
+    def release(self) -> None:
+        """Give up the lock if held"""
+        pass
+
+
+class RedisLeaderLock(LeaderLock):
+    """
+    Leader lock stored in a Redis key with a TTL
+    
+    The key holds a random token of the owning replica, so only the owner
+    can renew or delete it. If the leader dies the key expires after
+    ``ttl_seconds`` and another replica takes over.
+    """
+    
+    # Renew or delete only if the key still holds our token
+    RENEW_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('pexpire', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+    
+    def __init__(self, client: redis.Redis, key: str, ttl_seconds: float):
+        self.client = client
+        self.key = key
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.token = uuid.uuid4().hex
+        self.is_leader = False
+    
+    def acquire(self) -> bool:
+        try:
+            if self.is_leader:
+                self.is_leader = bool(self.client.eval(self.RENEW_SCRIPT, 1, self.key, self.token, self.ttl_ms))
+            if not self.is_leader:
+                self.is_leader = bool(self.client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        except redis.RedisError as e:
+            # Without Redis we cannot prove we still own the lock
+            logger.warning(f"Scheduler: leader lock unavailable - {str(e)}")
+            self.is_leader = False
+        
+        return self.is_leader
+    
+    def release(self) -> None:
+        if not self.is_leader:
+            return
+        
+        self.is_leader = False
+        try:
+            self.client.eval(self.RELEASE_SCRIPT, 1, self.key, self.token)
+        except redis.RedisError as e:
+            logger.warning(f"Scheduler: could not release leader lock - {str(e)}")
+
+
+class FileLeaderLock(LeaderLock):
+    """
+    Leader lock on a local file (``flock``)
+    
+    Only protects replicas on the same host; meant for development and
+    tests. The OS releases the lock when the process exits.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+    
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        
+        self._fd = fd
+        return True
+    
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
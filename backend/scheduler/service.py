@@ -0,0 +1,468 @@
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from collections import deque
+from datetime import datetime, timedelta
+import threading
+import time
+import zlib
+from uuid import UUID
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+from core.cache_bus import cache_bus
+from core.config import settings
+from core.database import SessionLocal
+from models.workflow import Workflow
+from scheduler.cron import CronExpression
+from scheduler.heap import ScheduleHeap
+from scheduler.leader import LeaderLock
+from scheduler.throttle import TokenBucket
+from services.workflow_service import WORKFLOW_CACHE
+from utils.errors import ValidationError
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Misfire policies: what to do with runs missed while no scheduler was leader
+MISFIRE_SKIP = "skip"
+MISFIRE_FIRE_ONCE = "fire_once"
+MISFIRE_CATCH_UP_ALL = "catch_up_all"
+MISFIRE_POLICIES = (MISFIRE_SKIP, MISFIRE_FIRE_ONCE, MISFIRE_CATCH_UP_ALL)
+
+
+def schedule_jitter(workflow_id: UUID, window_seconds: int) -> timedelta:
+    """
+    Deterministic offset of a workflow's runs within the jitter window
+    
+    Derived from the workflow ID, so it is the same on every replica and
+    across restarts, and workflows sharing a cron expression spread evenly.
+    
+    Args:
+        workflow_id: Workflow ID
+        window_seconds: Jitter window; 0 disables jitter
+    
+    Returns:
+        Offset added to each nominal fire time
+    """
+    if window_seconds <= 0:
+        return timedelta(0)
+    return timedelta(seconds=zlib.crc32(workflow_id.bytes) % window_seconds)
+
+
+class ScheduledWorkflow:
+    """
+    Schedule of one active workflow as known to the scheduler
+    
+    Heap entries hold the effective fire time, i.e. the nominal cron time
+    plus ``jitter``.
+    """
+    
+    __slots__ = ('workflow_id', 'user_id', 'version', 'cron', 'jitter', 'misfire_policy')
+    
+    def __init__(
+        self,
+        workflow_id: UUID,
+        user_id: UUID,
+        version: int,
+        cron: CronExpression,
+        jitter: timedelta,
+        misfire_policy: str,
+    ):
+        self.workflow_id = workflow_id
+        self.user_id = user_id
+        self.version = version
+        self.cron = cron
+        self.jitter = jitter
+        self.misfire_policy = misfire_policy
+
+
+class CronScheduler:
+    """
+    Daemon firing scheduled workflows
+    
+    All active schedules sit in a ``ScheduleHeap`` ordered by next fire
+    time, so the loop sleeps until the earliest deadline (or until a
+    workflow changes) instead of polling every schedule. Cron expressions
+    are parsed once and shared between workflows using the same one.
+    Edits arrive through the cache invalidation bus and only reload the
+    changed workflows; a periodic full resync catches missed messages.
+    
+    Only the replica holding the leader lock fires; the lock is renewed on
+    every loop, at least every third of its TTL.
+    
+    Load smoothing: each workflow's runs are shifted by a fixed offset
+    within ``SCHEDULER_JITTER_WINDOW_SECONDS`` and enqueueing is limited by
+    a token bucket (``SCHEDULER_ENQUEUE_RATE``). Runs delayed by the bucket
+    are late, not missed. How far each workflow's runs have been enqueued
+    is stored in ``Workflow.schedule_fired_at``; a leader starting up uses it to find
+    runs missed while no scheduler was running and applies the workflow's
+    misfire policy:
+    
+    - ``skip``: drop them
+    - ``fire_once``: enqueue one run for all of them
+    - ``catch_up_all``: enqueue each of them, up to ``SCHEDULER_MAX_CATCHUP_RUNS``
+    """
+    
+    def __init__(
+        self,
+        lock: LeaderLock,
+        session_factory: Callable[[], Session] = SessionLocal,
+        enqueue: Optional[Callable[[List[Tuple[UUID, UUID]]], int]] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        self.lock = lock
+        self.session_factory = session_factory
+        self.enqueue = enqueue or _enqueue_scheduled
+        self.clock = clock
+        self.heap = ScheduleHeap()
+        self.bucket = bucket
+        if bucket is None and settings.SCHEDULER_ENQUEUE_RATE > 0:
+            self.bucket = TokenBucket(settings.SCHEDULER_ENQUEUE_RATE, settings.SCHEDULER_ENQUEUE_BURST)
+        self.renew_interval = settings.SCHEDULER_LOCK_TTL_SECONDS / 3
+        self._schedules: Dict[UUID, ScheduledWorkflow] = {}
+        self._expressions: Dict[str, CronExpression] = {}
+        self._dirty: Set[UUID] = set()
+        self._dirty_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._loaded_at: Optional[float] = None
+    
+    def __len__(self) -> int:
+        return len(self._schedules)
+    
+    def mark_dirty(self, workflow_id: str) -> None:
+        """
+        Reload a workflow's schedule on the next loop
+        
+        Args:
+            workflow_id: ID of the changed workflow (cache bus key)
+        """
+        try:
+            workflow_id = UUID(str(workflow_id))
+        except ValueError:
+            return
+        
+        with self._dirty_lock:
+            self._dirty.add(workflow_id)
+        self._wakeup.set()
+    
+    def run(self) -> None:
+        """Run the scheduler loop until ``stop`` is called"""
+        cache_bus.subscribe(WORKFLOW_CACHE, self.mark_dirty)
+        logger.info("Scheduler: started")
+        
+        try:
+            while not self._stopping.is_set():
+                self._wait(self.run_once())
+        finally:
+            self.lock.release()
+            logger.info("Scheduler: stopped")
+    
+    def stop(self) -> None:
+        """Ask the loop to exit"""
+        self._stopping.set()
+        self._wakeup.set()
+    
+    def run_once(self) -> float:
+        """
+        One scheduler iteration
+        
+        Returns:
+            Seconds to sleep before the next iteration
+        """
+        if not self.lock.acquire():
+            if self._loaded_at is not None:
+                logger.warning("Scheduler: lost leadership, pausing")
+                self._reset()
+            return self.renew_interval
+        
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= settings.SCHEDULER_RESYNC_SECONDS:
+            self.load_all()
+        else:
+            self._apply_dirty()
+        
+        now = self.clock()
+        self.fire_due(now)
+        
+        timeout = self.renew_interval
+        deadline = self.heap.next_deadline()
+        if deadline is not None:
+            if deadline <= now:
+                # Runs are still due: throttled, so wait for tokens, or
+                # enqueueing failed, so retry after the usual interval
+                if self.bucket is not None and self.bucket.available() == 0:
+                    return min(timeout, self.bucket.wait_time())
+                return timeout
+            timeout = min(timeout, max(0.0, (deadline - now).total_seconds()))
+        
+        return timeout
+    
+    def load_all(self) -> None:
+        """Reload every active schedule, keeping fire times of unchanged ones"""
+        now = self.clock()
+        seen = set()
+        
+        with self._dirty_lock:
+            self._dirty.clear()
+        
+        db = self.session_factory()
+        try:
+            rows = db.execute(self._schedule_query()).yield_per(1000)
+            for row in rows:
+                seen.add(row.id)
+                self._apply_row(row, now)
+        finally:
+            db.close()
+        
+        for workflow_id in list(self._schedules):
+            if workflow_id not in seen:
+                self._unschedule(workflow_id)
+        
+        self._loaded_at = time.monotonic()
+        logger.info(f"Scheduler: loaded {len(self._schedules)} schedule(s)")
+    
+    def fire_due(self, now: datetime) -> int:
+        """
+        Enqueue workflows whose fire time has passed and reschedule them
+        
+        Stops early when the token bucket runs dry or enqueueing fails; the
+        remaining runs stay due in the heap. Runs are only rescheduled and
+        recorded once they were enqueued.
+        
+        Args:
+            now: Current time (naive UTC)
+        
+        Returns:
+            Number of runs enqueued
+        """
+        fired = 0
+        batch_size = settings.EXECUTION_PUBLISH_BATCH_SIZE
+        
+        while True:
+            limit = batch_size
+            if self.bucket is not None:
+                limit = min(limit, self.bucket.available())
+                if limit == 0:
+                    break
+            
+            due = self.heap.pop_due(now, limit=limit)
+            if not due:
+                break
+            
+            runs = [(workflow_id, self._schedules[workflow_id].user_id) for workflow_id, _ in due]
+            try:
+                fired += self.enqueue(runs)
+            except Exception as e:
+                logger.error(f"Scheduler: failed to enqueue {len(runs)} run(s) - {str(e)}; retrying next iteration")
+                # Still due: put them back untouched
+                for workflow_id, fire_at in due:
+                    self.heap.upsert(workflow_id, fire_at)
+                break
+            
+            if self.bucket is not None:
+                self.bucket.consume(len(due))
+            
+            fired_at = []
+            for workflow_id, fire_at in due:
+                schedule = self._schedules[workflow_id]
+                fired_at.append((workflow_id, self._reschedule(schedule, fire_at - schedule.jitter, now)))
+            
+            self._record_fired(fired_at)
+        
+        return fired
+    
+    def _apply_dirty(self) -> None:
+        """Reload the schedules of workflows changed since the last loop"""
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        
+        if not dirty:
+            return
+        
+        now = self.clock()
+        db = self.session_factory()
+        try:
+            rows = db.execute(self._schedule_query().where(Workflow.id.in_(dirty))).all()
+        finally:
+            db.close()
+        
+        for row in rows:
+            dirty.discard(row.id)
+            self._apply_row(row, now)
+        
+        # Deleted, deactivated or unscheduled
+        for workflow_id in dirty:
+            self._unschedule(workflow_id)
+    
+    @staticmethod
+    def _schedule_query():
+        """Columns the scheduler needs from active scheduled workflows"""
+        return select(
+            Workflow.id,
+            Workflow.user_id,
+            Workflow.schedule,
+            Workflow.version,
+            Workflow.misfire_policy,
+            Workflow.schedule_fired_at,
+        ).where(
+            Workflow.is_active.is_(True),
+            Workflow.schedule.isnot(None),
+        )
+    
+    def _apply_row(self, row, now: datetime) -> None:
+        """Add or update one workflow's schedule"""
+        current = self._schedules.get(row.id)
+        if current is not None and current.version == row.version and current.cron.expression == row.schedule:
+            return
+        
+        cron = self._parse(row.schedule)
+        if cron is None:
+            self._unschedule(row.id)
+            return
+        
+        misfire_policy = row.misfire_policy or settings.SCHEDULER_MISFIRE_POLICY
+        if misfire_policy not in MISFIRE_POLICIES:
+            logger.warning(f"Scheduler: workflow {row.id} has unknown misfire policy {misfire_policy}, using {MISFIRE_FIRE_ONCE}")
+            misfire_policy = MISFIRE_FIRE_ONCE
+        
+        schedule = ScheduledWorkflow(
+            row.id,
+            row.user_id,
+            row.version,
+            cron,
+            schedule_jitter(row.id, settings.SCHEDULER_JITTER_WINDOW_SECONDS),
+            misfire_policy,
+        )
+        self._schedules[row.id] = schedule
+        
+        if current is None:
+            self._schedule_first(schedule, row.schedule_fired_at, now)
+        elif current.cron.expression != cron.expression:
+            self._schedule_first(schedule, None, now)
+    
+    def _parse(self, expression: str) -> Optional[CronExpression]:
+        """Parse a cron expression, reusing earlier parses"""
+        cron = self._expressions.get(expression)
+        if cron is None:
+            try:
+                cron = CronExpression(expression)
+            except ValidationError as e:
+                logger.warning(f"Scheduler: ignoring schedule - {str(e)}")
+                return None
+            self._expressions[expression] = cron
+        return cron
+    
+    def _schedule_first(self, schedule: ScheduledWorkflow, last_fired: Optional[datetime], now: datetime) -> None:
+        """
+        Push the first fire time of a newly loaded schedule
+        
+        Args:
+            schedule: Workflow schedule
+            last_fired: Nominal time of the last run enqueued, if known
+            now: Current time
+        """
+        try:
+            if last_fired is None:
+                nominal = schedule.cron.next_fire(now - schedule.jitter)
+            else:
+                nominal = self._first_after_downtime(schedule, last_fired, now)
+            self.heap.upsert(schedule.workflow_id, nominal + schedule.jitter)
+        except ValidationError as e:
+            logger.warning(f"Scheduler: workflow {schedule.workflow_id} - {str(e)}")
+            self._unschedule(schedule.workflow_id)
+    
+    def _first_after_downtime(self, schedule: ScheduledWorkflow, last_fired: datetime, now: datetime) -> datetime:
+        """Apply the misfire policy to runs missed since the last one enqueued"""
+        cron = schedule.cron
+        horizon = now - schedule.jitter
+        nominal = cron.next_fire(last_fired)
+        
+        if nominal > horizon:
+            return nominal
+        
+        if schedule.misfire_policy == MISFIRE_SKIP:
+            logger.info(f"Scheduler: skipping missed runs of workflow {schedule.workflow_id}")
+            return cron.next_fire(horizon)
+        
+        if schedule.misfire_policy == MISFIRE_CATCH_UP_ALL:
+            # Keep the latest missed runs; popping one reschedules the next
+            missed = deque(maxlen=max(1, settings.SCHEDULER_MAX_CATCHUP_RUNS))
+            while nominal <= horizon:
+                missed.append(nominal)
+                nominal = cron.next_fire(nominal)
+            return missed[0]
+        
+        # fire_once: the overdue entry fires now and _reschedule jumps past now
+        return nominal
+    
+    def _reschedule(self, schedule: ScheduledWorkflow, nominal: datetime, now: datetime) -> datetime:
+        """
+        Push the fire time following a run that was just enqueued
+        
+        Args:
+            schedule: Workflow schedule
+            nominal: Nominal time of the enqueued run
+            now: Current time
+        
+        Returns:
+            Nominal time up to which runs are covered, stored as ``schedule_fired_at``
+        """
+        horizon = now - schedule.jitter
+        covered = horizon
+        
+        try:
+            following = schedule.cron.next_fire(nominal)
+            if following <= horizon:
+                if schedule.misfire_policy == MISFIRE_CATCH_UP_ALL:
+                    covered = nominal
+                else:
+                    # Overdue runs collapse into the one just enqueued
+                    following = schedule.cron.next_fire(horizon)
+            self.heap.upsert(schedule.workflow_id, following + schedule.jitter)
+        except ValidationError as e:
+            logger.warning(f"Scheduler: workflow {schedule.workflow_id} - {str(e)}")
+            self._unschedule(schedule.workflow_id)
+        
+        return covered
+    
+    def _record_fired(self, fired_at: List[Tuple[UUID, datetime]]) -> None:
+        """Store how far each workflow's runs are enqueued, for misfire detection"""
+        statement = (
+            update(Workflow.__table__)
+            .where(Workflow.__table__.c.id == bindparam('workflow_id'))
+            # Bookkeeping only: keep updated_at
+            .values(schedule_fired_at=bindparam('fired_at'), updated_at=Workflow.__table__.c.updated_at)
+        )
+        
+        db = self.session_factory()
+        try:
+            db.execute(statement, [
+                {'workflow_id': workflow_id, 'fired_at': nominal} for workflow_id, nominal in fired_at
+            ])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Scheduler: could not record {len(fired_at)} fire time(s) - {str(e)}")
+        finally:
+            db.close()
+    
+    def _unschedule(self, workflow_id: UUID) -> None:
+        """Forget a workflow's schedule"""
+        self._schedules.pop(workflow_id, None)
+        self.heap.remove(workflow_id)
+    
+    def _reset(self) -> None:
+        """Drop all state; a new leader reloads from the database"""
+        self._schedules.clear()
+        self.heap.clear()
+        self._loaded_at = None
+    
+    def _wait(self, timeout: float) -> None:
+        """Sleep until the timeout or until woken by a change or ``stop``"""
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+
+def _enqueue_scheduled(runs: Iterable[Tuple[UUID, UUID]]) -> int:
+    """Default publisher, imported on first use to keep this module light"""
+    from workers.tasks import enqueue_scheduled_workflows
+    return enqueue_scheduled_workflows(runs)
@@ -0,0 +1,42 @@
+from typing import Callable
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket limiting how fast scheduled runs are enqueued
+    
+    Holds up to ``burst`` tokens and refills at ``rate`` tokens per
+    second. Callers check ``available``, consume what they used, and
+    sleep ``wait_time`` when the bucket is empty.
+    """
+    
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("Token bucket needs a positive rate and burst")
+        
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+    
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def available(self) -> int:
+        """Whole tokens that can be consumed now"""
+        self._refill()
+        return int(self._tokens)
+    
+    def consume(self, tokens: int) -> None:
+        """Use tokens obtained from ``available``"""
+        self._refill()
+        self._tokens -= tokens
+    
+    def wait_time(self, tokens: int = 1) -> float:
+        """Seconds until ``tokens`` tokens are available"""
+        self._refill()
+        return max(0.0, (tokens - self._tokens) / self.rate)
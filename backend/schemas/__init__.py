@@ -15,6 +15,8 @@ from schemas.workflow import (
 )
 from schemas.execution import (
     ExecutionCreate,
+    ExecutionBulkCreate,
+    ExecutionBulkResponse,
     ExecutionResponse,
     ExecutionLogResponse,
 )
@@ -37,6 +39,8 @@ __all__ = [
     "WorkflowResponse",
     "WorkflowDefinition",
     "ExecutionCreate",
+    "ExecutionBulkCreate",
+    "ExecutionBulkResponse",
     "ExecutionResponse",
     "ExecutionLogResponse",
     "IntegrationCreate",
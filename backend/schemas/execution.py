@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
+from core.config import settings
 
 
 class ExecutionCreate(BaseModel):
@@ -9,6 +10,15 @@ class ExecutionCreate(BaseModel):
     trigger_type: str = "manual"
 
 
+class ExecutionBulkCreate(BaseModel):
+    executions: List[ExecutionCreate] = Field(..., min_length=1, max_length=settings.EXECUTION_BULK_MAX_SIZE)
+
+
+class ExecutionBulkResponse(BaseModel):
+    count: int
+    execution_ids: List[UUID]
+
+
 class ExecutionResponse(BaseModel):
     id: UUID
     workflow_id: UUID
@@ -31,7 +41,7 @@ class ExecutionLogResponse(BaseModel):
     node_id: str
     level: str
     message: str
-    metadata: Optional[Dict[str, Any]]
+    metadata: Optional[Dict[str, Any]] = Field(None, validation_alias="log_metadata")
     timestamp: datetime
     
     class Config:
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal, Union
 from uuid import UUID
 
 
@@ -10,16 +10,26 @@ class WorkflowNodeConfig(BaseModel):
     position: Dict[str, float]
     config: Dict[str, Any]
     data: Optional[Dict[str, Any]] = None
+    retry: Optional[Dict[str, Any]] = None  # Retry policy for transient failures (see RetryPolicy); no retries if omitted
+    executor: Optional[Literal["inline", "process"]] = None  # Where the node runs; by node type if omitted
+    timeout: Optional[float] = Field(None, gt=0)  # Seconds each call may take
 
 
 class WorkflowEdgeConfig(BaseModel):
     from_node: str
     to_node: str
+    when: Optional[Union[bool, str]] = None  # Only taken if the source node's branch matches (true/false from conditions)
 
 
 class WorkflowDefinition(BaseModel):
     nodes: List[WorkflowNodeConfig]
     edges: List[WorkflowEdgeConfig]
+    output_nodes: Optional[List[str]] = None  # Outputs kept in result_data; all if omitted
+    max_concurrency: Optional[int] = Field(None, gt=0)  # Nodes running at once; WORKFLOW_MAX_CONCURRENCY if omitted
+
+
+# What the scheduler does with runs missed while it was down
+MisfirePolicy = Literal["skip", "fire_once", "catch_up_all"]
 
 
 class WorkflowCreate(BaseModel):
@@ -27,6 +37,7 @@ class WorkflowCreate(BaseModel):
     description: Optional[str] = None
     definition: WorkflowDefinition
     schedule: Optional[str] = None
+    misfire_policy: Optional[MisfirePolicy] = None
 
 
 class WorkflowUpdate(BaseModel):
@@ -35,6 +46,7 @@ class WorkflowUpdate(BaseModel):
     definition: Optional[WorkflowDefinition] = None
     is_active: Optional[bool] = None
     schedule: Optional[str] = None
+    misfire_policy: Optional[MisfirePolicy] = None
 
 
 class WorkflowResponse(BaseModel):
@@ -45,6 +57,8 @@ class WorkflowResponse(BaseModel):
     definition: WorkflowDefinition
     is_active: bool
     schedule: Optional[str]
+    misfire_policy: Optional[str]
+    version: int
     created_at: datetime
     updated_at: datetime
     
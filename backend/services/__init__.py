@@ -1,12 +1,15 @@
 from services.auth_service import AuthService
 from services.workflow_service import WorkflowService
-from services.execution_service import ExecutionService
+from services.execution_service import ExecutionService, AsyncExecutionService
+from services.execution_log_buffer import ExecutionLogBuffer
 from services.integration_service import IntegrationService
 
 __all__ = [
     "AuthService",
     "WorkflowService",
     "ExecutionService",
+    "AsyncExecutionService",
+    "ExecutionLogBuffer",
     "IntegrationService",
 ]
 
@@ -0,0 +1,114 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from uuid import UUID
+import asyncio
+import time
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from services.execution_service import AsyncExecutionService
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DURABILITY_IMMEDIATE = "immediate"
+DURABILITY_BUFFERED = "buffered"
+
+
+class ExecutionLogBuffer:
+    """
+    In-memory buffer of execution log rows for one execution
+    
+    Rows are written with one multi-row INSERT and one commit when the
+    buffer reaches ``batch_size`` rows, when the oldest row is older than
+    ``flush_interval`` seconds, and before the execution reaches a
+    terminal status. In ``immediate`` mode every row is written as soon as
+    it is added, so no log line is lost if the worker dies, at the cost of
+    one commit per row.
+    
+    Pass the lock that guards other users of the same ``AsyncSession``,
+    since a session does not allow concurrent operations.
+    """
+    
+    def __init__(
+        self,
+        db: AsyncSession,
+        execution_id: UUID,
+        durability: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        lock: Optional[asyncio.Lock] = None,
+    ):
+        self.db = db
+        self.lock = lock or asyncio.Lock()
+        self.execution_id = execution_id
+        self.durability = durability or settings.EXECUTION_LOG_DURABILITY
+        self.batch_size = max(1, batch_size or settings.EXECUTION_LOG_BATCH_SIZE)
+        self.flush_interval = flush_interval if flush_interval is not None else settings.EXECUTION_LOG_FLUSH_INTERVAL_SECONDS
+        self._rows: List[Dict[str, Any]] = []
+        self._oldest = 0.0
+        
+        if self.durability not in (DURABILITY_IMMEDIATE, DURABILITY_BUFFERED):
+            raise ValueError(f"Unknown execution log durability: {self.durability}")
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    async def add(self, node_id: str, level: str, message: str, metadata: dict = None) -> None:
+        """
+        Buffer a log row, flushing if a threshold is reached
+        
+        Args:
+            node_id: Node the entry belongs to
+            level: Log level (info, warning, error)
+            message: Log message
+            metadata: Additional context
+        """
+        if not self._rows:
+            self._oldest = time.monotonic()
+        
+        # Timestamped when logged, not when the buffer is flushed
+        self._rows.append({
+            'id': uuid.uuid4(),
+            'execution_id': self.execution_id,
+            'node_id': node_id,
+            'level': level,
+            'message': message,
+            'metadata': metadata,
+            'timestamp': datetime.utcnow(),
+        })
+        
+        if (
+            self.durability == DURABILITY_IMMEDIATE
+            or len(self._rows) >= self.batch_size
+            or time.monotonic() - self._oldest >= self.flush_interval
+        ):
+            await self.flush()
+    
+    async def flush(self) -> None:
+        """Write all buffered rows"""
+        if not self._rows:
+            return
+        
+        rows, self._rows = self._rows, []
+        try:
+            async with self.lock:
+                await AsyncExecutionService.add_execution_logs(self.db, rows)
+        except BaseException:
+            # Kept for the next flush, e.g. after the session is rolled back
+            self._rows[:0] = rows
+            raise
+        
+        logger.debug(f"Execution {self.execution_id}: Flushed {len(rows)} log row(s)")
+    
+    async def flush_periodically(self) -> None:
+        """
+        Flush rows that reached ``flush_interval`` while no new row was added
+        
+        Runs until cancelled; meant to be started as a task next to the
+        execution it belongs to.
+        """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._rows and time.monotonic() - self._oldest >= self.flush_interval:
+                await self.flush()
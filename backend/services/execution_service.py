@@ -1,23 +1,145 @@
+from sqlalchemy import func, insert, null, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
 from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import json
+import uuid
+import zlib
 from models.execution import Execution
+from models.execution_checkpoint import ExecutionCheckpoint
 from models.execution_log import ExecutionLog
 from models.user import User
+from models.workflow import Workflow
+from core.config import settings
 from schemas.execution import ExecutionCreate
+from utils.errors import InvalidStatusTransition, WorkflowNotFound
+from utils.pagination import decode_cursor, encode_cursor
+
+# Allowed current statuses for each target status
+STATUS_TRANSITIONS = {
+    "pending": ("failed", "cancelled"),  # Resume from checkpoints
+    "running": ("pending", "waiting"),
+    "waiting": ("running",),
+    "success": ("running",),
+    "failed": ("pending", "running", "waiting"),
+    "cancelled": ("pending", "running", "waiting"),
+}
+
+TERMINAL_STATUSES = ("success", "failed", "cancelled")
+
+# Columns of ExecutionResponse, selected directly for exports
+EXECUTION_EXPORT_COLUMNS = (
+    "id",
+    "workflow_id",
+    "status",
+    "trigger_type",
+    "triggered_by",
+    "started_at",
+    "completed_at",
+    "error_message",
+    "result_data",
+    "created_at",
+)
+
+
+def _encode_output(output: Any) -> bytes:
+    """Serialize a node output as zlib-compressed compact JSON"""
+    payload = json.dumps(output, separators=(',', ':'), default=str)
+    return zlib.compress(payload.encode('utf-8'), 1)
+
+
+def _decode_output(data: Optional[bytes]) -> Any:
+    """Inverse of _encode_output"""
+    if data is None:
+        return None
+    return json.loads(zlib.decompress(data))
+
+
+def _transition_statement(execution_id: UUID, status: str, error_message: str = None, values: dict = None):
+    """
+    Build the conditional UPDATE ... RETURNING for a status transition
+    
+    The row is only updated if its current status may move to ``status``,
+    and the timestamps that go with the new status are set in the same
+    statement.
+    """
+    if status not in STATUS_TRANSITIONS:
+        raise ValueError(f"Unknown execution status: {status}")
+    
+    now = datetime.utcnow()
+    changes = {'status': status}
+    
+    if status == "running":
+        changes['started_at'] = func.coalesce(Execution.started_at, now)
+    elif status in TERMINAL_STATUSES:
+        changes['completed_at'] = now
+        changes['checkpoint'] = null()
+        changes['resume_at'] = None
+    
+    if error_message:
+        changes['error_message'] = error_message
+    changes.update(values or {})
+    
+    return update(Execution).where(
+        Execution.id == execution_id,
+        Execution.status.in_(STATUS_TRANSITIONS[status]),
+    ).values(**changes).returning(Execution)
+
+
+def _rejected_transition(execution_id: UUID, current: Optional[str], status: str) -> Exception:
+    """Error for a transition whose UPDATE matched no row"""
+    if current is None:
+        return ValueError(f"Execution {execution_id} not found")
+    return InvalidStatusTransition(f"Execution {execution_id} cannot go from {current} to {status}")
+
+
+def _next_cursor(rows: Sequence[Any], limit: int, sort_attribute: str) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim a page fetched with ``limit + 1`` rows and build the next cursor
+    
+    Returns:
+        Rows of the page and the cursor of the next page (None on the last page)
+    """
+    if len(rows) <= limit:
+        return list(rows), None
+    
+    rows = list(rows[:limit])
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_attribute), last.id)
+
+
+def _stream_partitions(db: Session, statement, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Yield result rows as mappings, chunk by chunk from a server-side cursor"""
+    result = db.execute(statement.execution_options(yield_per=chunk_size))
+    try:
+        for partition in result.mappings().partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def _build_checkpoint(execution: Execution, rows: list) -> dict:
+    """Assemble resume state from an execution and its checkpoint rows"""
+    return {
+        'outputs': {node_id: _decode_output(output) for node_id, _, output in rows},
+        'finished': {node_id: branch for node_id, branch, _ in rows},
+        'suspended': (execution.checkpoint or {}).get('suspended', {}),
+    }
 
 
 class ExecutionService:
     """Service for execution operations"""
     
     @staticmethod
-    def create_execution(db: Session, user: User, execution_data: ExecutionCreate) -> Execution:
-        """Create a new execution"""
+    def create_execution(db: Session, user_id: UUID, execution_data: ExecutionCreate) -> Execution:
+        """Create a new execution triggered by a user"""
         execution = Execution(
             workflow_id=execution_data.workflow_id,
             status="pending",
             trigger_type=execution_data.trigger_type,
-            triggered_by=user.id,
+            triggered_by=user_id,
         )
         
         db.add(execution)
@@ -26,6 +148,83 @@ class ExecutionService:
         
         return execution
     
+    @staticmethod
+    def create_executions(db: Session, user: User, executions_data: list[ExecutionCreate]) -> list[UUID]:
+        """
+        Create many executions with multi-row INSERTs and a single commit
+        
+        Args:
+            db: Database session
+            user: User triggering the executions
+            executions_data: Executions to create
+        
+        Returns:
+            IDs of the created executions, in request order
+        
+        Raises:
+            WorkflowNotFound: If a workflow does not exist or belongs to another user
+        """
+        workflow_ids = {data.workflow_id for data in executions_data}
+        owned = set(db.scalars(
+            select(Workflow.id).where(Workflow.id.in_(workflow_ids), Workflow.user_id == user.id)
+        ))
+        missing = workflow_ids - owned
+        if missing:
+            raise WorkflowNotFound(f"Workflow {next(iter(missing))} not found")
+        
+        # IDs are generated here so they are known before the INSERT and can
+        # be returned without a RETURNING clause
+        now = datetime.utcnow()
+        rows = [
+            {
+                'id': uuid.uuid4(),
+                'workflow_id': data.workflow_id,
+                'status': "pending",
+                'trigger_type': data.trigger_type,
+                'triggered_by': user.id,
+                'created_at': now,
+            }
+            for data in executions_data
+        ]
+        
+        batch_size = settings.EXECUTION_BULK_INSERT_BATCH_SIZE
+        for start in range(0, len(rows), batch_size):
+            db.execute(insert(Execution.__table__).values(rows[start:start + batch_size]))
+        db.commit()
+        
+        return [row['id'] for row in rows]
+    
+    @staticmethod
+    def fail_pending_executions(db: Session, execution_ids: Sequence[UUID], error_message: str) -> int:
+        """
+        Mark executions no worker has started as failed
+        
+        For executions whose tasks could not be published; any that a
+        worker already claimed are left alone.
+        
+        Args:
+            db: Database session
+            execution_ids: Execution IDs
+            error_message: Error message to record
+        
+        Returns:
+            Number of executions marked failed
+        """
+        now = datetime.utcnow()
+        failed = 0
+        batch_size = settings.EXECUTION_BULK_INSERT_BATCH_SIZE
+        for start in range(0, len(execution_ids), batch_size):
+            result = db.execute(
+                update(Execution).where(
+                    Execution.id.in_(execution_ids[start:start + batch_size]),
+                    Execution.status == "pending",
+                ).values(status="failed", error_message=error_message, completed_at=now)
+            )
+            failed += result.rowcount
+        db.commit()
+        
+        return failed
+    
     @staticmethod
     def get_execution(db: Session, execution_id: UUID, user: User) -> Execution:
         """Get execution by ID"""
@@ -45,27 +244,174 @@ class ExecutionService:
             Execution.workflow_id == workflow_id
         ).order_by(Execution.created_at.desc()).offset(skip).limit(limit).all()
     
+    @staticmethod
+    def list_executions_page(
+        db: Session,
+        workflow_id: UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Execution], Optional[str]]:
+        """
+        List executions for a workflow, newest first, with keyset pagination
+        
+        Seeks on ``(created_at, id)`` instead of skipping rows, so deep
+        pages cost the same as the first one.
+        
+        Args:
+            db: Database session
+            workflow_id: Workflow ID
+            limit: Page size
+            cursor: Cursor returned with the previous page
+        
+        Returns:
+            Executions of the page and the cursor of the next page (None on the last page)
+        
+        Raises:
+            ValidationError: If the cursor is malformed
+        """
+        statement = select(Execution).where(Execution.workflow_id == workflow_id)
+        if cursor is not None:
+            statement = statement.where(tuple_(Execution.created_at, Execution.id) < decode_cursor(cursor))
+        
+        rows = db.execute(
+            statement.order_by(Execution.created_at.desc(), Execution.id.desc()).limit(limit + 1)
+        ).scalars().all()
+        
+        return _next_cursor(rows, limit, 'created_at')
+    
+    @staticmethod
+    def stream_executions(
+        db: Session,
+        workflow_id: UUID,
+        cursor: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Export a workflow's executions, newest first, in constant memory
+        
+        Rows come from a server-side cursor in chunks of ``chunk_size`` and
+        are plain mappings of the ``ExecutionResponse`` columns.
+        
+        Args:
+            db: Database session, kept open until the iterator is exhausted or closed
+            workflow_id: Workflow ID
+            cursor: Continue after a page or an interrupted export
+            chunk_size: Rows per chunk (``EXECUTION_STREAM_CHUNK_SIZE`` by default)
+        
+        Returns:
+            Iterator of row chunks
+        
+        Raises:
+            ValidationError: If the cursor is malformed (raised before iterating)
+        """
+        table = Execution.__table__
+        statement = select(*(table.c[name] for name in EXECUTION_EXPORT_COLUMNS)).where(
+            table.c.workflow_id == workflow_id
+        )
+        if cursor is not None:
+            statement = statement.where(tuple_(table.c.created_at, table.c.id) < decode_cursor(cursor))
+        
+        statement = statement.order_by(table.c.created_at.desc(), table.c.id.desc())
+        return _stream_partitions(db, statement, chunk_size or settings.EXECUTION_STREAM_CHUNK_SIZE)
+    
+    @staticmethod
+    def transition(db: Session, execution_id: UUID, status: str, error_message: str = None, values: dict = None) -> Execution:
+        """
+        Move an execution to a new status in a single statement
+        
+        Args:
+            db: Database session
+            execution_id: Execution ID
+            status: Target status
+            error_message: Error message to record
+            values: Other columns to set in the same statement
+        
+        Returns:
+            Updated execution
+        
+        Raises:
+            ValueError: If the execution does not exist
+            InvalidStatusTransition: If the current status cannot move to ``status``
+        """
+        statement = _transition_statement(execution_id, status, error_message, values)
+        execution = db.execute(statement, execution_options={"populate_existing": True}).scalar_one_or_none()
+        
+        if execution is None:
+            db.rollback()
+            current = db.execute(select(Execution.status).where(Execution.id == execution_id)).scalar_one_or_none()
+            raise _rejected_transition(execution_id, current, status)
+        
+        # Detach so that the commit does not expire what RETURNING just loaded
+        db.expunge(execution)
+        db.commit()
+        
+        return execution
+    
     @staticmethod
     def update_execution_status(db: Session, execution_id: UUID, status: str, error_message: str = None) -> Execution:
         """Update execution status"""
+        return ExecutionService.transition(db, execution_id, status, error_message)
+    
+    @staticmethod
+    def suspend_execution(db: Session, execution_id: UUID, checkpoint: dict, resume_at: datetime) -> Execution:
+        """Mark execution as waiting and save the nodes it is waiting on"""
+        return ExecutionService.transition(
+            db,
+            execution_id,
+            "waiting",
+            values={'checkpoint': checkpoint, 'resume_at': resume_at},
+        )
+    
+    @staticmethod
+    def prepare_resume(db: Session, execution_id: UUID) -> Execution:
+        """
+        Reset a failed execution so that it can be resumed from its checkpoints
+        
+        Raises:
+            InvalidStatusTransition: If the execution is not failed or cancelled
+        """
+        return ExecutionService.transition(
+            db,
+            execution_id,
+            "pending",
+            values={'error_message': None, 'completed_at': None},
+        )
+    
+    @staticmethod
+    def save_node_checkpoint(db: Session, execution_id: UUID, node_id: str, output: Any, branch: str = None) -> None:
+        """Persist the output of a completed node"""
+        db.add(ExecutionCheckpoint(
+            execution_id=execution_id,
+            node_id=node_id,
+            branch=branch,
+            output=_encode_output(output),
+        ))
+        db.commit()
+    
+    @staticmethod
+    def get_checkpoint(db: Session, execution_id: UUID) -> dict:
+        """
+        Load the state needed to resume an execution
+        
+        Returns:
+            Dictionary with ``outputs`` and ``finished`` (node ID -> branch)
+            from the node checkpoints, and ``suspended`` nodes waiting on a
+            durable delay
+        """
         execution = db.query(Execution).filter(Execution.id == execution_id).first()
         
         if not execution:
             raise ValueError(f"Execution {execution_id} not found")
         
-        execution.status = status
-        if error_message:
-            execution.error_message = error_message
-        
-        if status == "running" and not execution.started_at:
-            execution.started_at = datetime.utcnow()
-        elif status in ["success", "failed", "cancelled"]:
-            execution.completed_at = datetime.utcnow()
+        rows = db.query(
+            ExecutionCheckpoint.node_id,
+            ExecutionCheckpoint.branch,
+            ExecutionCheckpoint.output,
+        ).filter(
+            ExecutionCheckpoint.execution_id == execution_id
+        ).all()
         
-        db.commit()
-        db.refresh(execution)
-        
-        return execution
+        return _build_checkpoint(execution, rows)
     
     @staticmethod
     def add_execution_log(db: Session, execution_id: UUID, node_id: str, level: str, message: str, metadata: dict = None) -> ExecutionLog:
@@ -75,7 +421,7 @@ class ExecutionService:
             node_id=node_id,
             level=level,
             message=message,
-            metadata=metadata,
+            log_metadata=metadata,
         )
         
         db.add(log)
@@ -84,10 +430,180 @@ class ExecutionService:
         
         return log
     
+    @staticmethod
+    def add_execution_logs(db: Session, rows: list[dict]) -> None:
+        """
+        Insert log rows with a single multi-row INSERT
+        
+        Args:
+            db: Database session
+            rows: Rows keyed by ``execution_logs`` column name
+        """
+        if not rows:
+            return
+        
+        db.execute(insert(ExecutionLog.__table__).values(rows))
+        db.commit()
+    
     @staticmethod
     def get_execution_logs(db: Session, execution_id: UUID) -> list[ExecutionLog]:
         """Get all logs for an execution"""
         return db.query(ExecutionLog).filter(
             ExecutionLog.execution_id == execution_id
-        ).order_by(ExecutionLog.timestamp.asc()).all()
+        ).order_by(ExecutionLog.timestamp.asc(), ExecutionLog.id.asc()).all()
+    
+    @staticmethod
+    def get_execution_logs_page(
+        db: Session,
+        execution_id: UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ExecutionLog], Optional[str]]:
+        """
+        Get logs for an execution, oldest first, with keyset pagination on ``(timestamp, id)``
+        
+        Args:
+            db: Database session
+            execution_id: Execution ID
+            limit: Page size
+            cursor: Cursor returned with the previous page
+        
+        Returns:
+            Logs of the page and the cursor of the next page (None on the last page)
+        
+        Raises:
+            ValidationError: If the cursor is malformed
+        """
+        statement = select(ExecutionLog).where(ExecutionLog.execution_id == execution_id)
+        if cursor is not None:
+            statement = statement.where(tuple_(ExecutionLog.timestamp, ExecutionLog.id) > decode_cursor(cursor))
+        
+        rows = db.execute(
+            statement.order_by(ExecutionLog.timestamp.asc(), ExecutionLog.id.asc()).limit(limit + 1)
+        ).scalars().all()
+        
+        return _next_cursor(rows, limit, 'timestamp')
+    
+    @staticmethod
+    def stream_execution_logs(
+        db: Session,
+        execution_id: UUID,
+        cursor: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Export an execution's logs, oldest first, in constant memory
+        
+        Rows come from a server-side cursor in chunks of ``chunk_size`` and
+        are plain mappings keyed by column name (``metadata``, not ``log_metadata``).
+        
+        Args:
+            db: Database session, kept open until the iterator is exhausted or closed
+            execution_id: Execution ID
+            cursor: Continue after a page or an interrupted export
+            chunk_size: Rows per chunk (``EXECUTION_STREAM_CHUNK_SIZE`` by default)
+        
+        Returns:
+            Iterator of row chunks
+        
+        Raises:
+            ValidationError: If the cursor is malformed (raised before iterating)
+        """
+        table = ExecutionLog.__table__
+        statement = select(table).where(table.c.execution_id == execution_id)
+        if cursor is not None:
+            statement = statement.where(tuple_(table.c.timestamp, table.c.id) > decode_cursor(cursor))
+        
+        statement = statement.order_by(table.c.timestamp.asc(), table.c.id.asc())
+        return _stream_partitions(db, statement, chunk_size or settings.EXECUTION_STREAM_CHUNK_SIZE)
 
+
+class AsyncExecutionService:
+    """
+    Async versions of the ExecutionService operations used while a
+    workflow runs
+    
+    Sessions come from ``core.async_database``. An ``AsyncSession`` does
+    not allow concurrent operations, so callers running nodes concurrently
+    must serialize calls that share a session.
+    """
+    
+    @staticmethod
+    async def get_execution(db: AsyncSession, execution_id: UUID) -> Execution:
+        """Get execution by ID"""
+        execution = await db.get(Execution, execution_id)
+        
+        if not execution:
+            raise ValueError(f"Execution {execution_id} not found")
+        
+        return execution
+    
+    @staticmethod
+    async def transition(db: AsyncSession, execution_id: UUID, status: str, error_message: str = None, values: dict = None) -> Execution:
+        """
+        Move an execution to a new status in a single statement
+        
+        See ``ExecutionService.transition``.
+        """
+        statement = _transition_statement(execution_id, status, error_message, values)
+        result = await db.execute(statement, execution_options={"populate_existing": True})
+        execution = result.scalar_one_or_none()
+        
+        if execution is None:
+            await db.rollback()
+            result = await db.execute(select(Execution.status).where(Execution.id == execution_id))
+            raise _rejected_transition(execution_id, result.scalar_one_or_none(), status)
+        
+        await db.commit()
+        
+        return execution
+    
+    @staticmethod
+    async def update_execution_status(db: AsyncSession, execution_id: UUID, status: str, error_message: str = None) -> Execution:
+        """Update execution status"""
+        return await AsyncExecutionService.transition(db, execution_id, status, error_message)
+    
+    @staticmethod
+    async def suspend_execution(db: AsyncSession, execution_id: UUID, checkpoint: dict, resume_at: datetime) -> Execution:
+        """Mark execution as waiting and save the nodes it is waiting on"""
+        return await AsyncExecutionService.transition(
+            db,
+            execution_id,
+            "waiting",
+            values={'checkpoint': checkpoint, 'resume_at': resume_at},
+        )
+    
+    @staticmethod
+    async def save_node_checkpoint(db: AsyncSession, execution_id: UUID, node_id: str, output: Any, branch: str = None) -> None:
+        """Persist the output of a completed node"""
+        db.add(ExecutionCheckpoint(
+            execution_id=execution_id,
+            node_id=node_id,
+            branch=branch,
+            output=_encode_output(output),
+        ))
+        await db.commit()
+    
+    @staticmethod
+    async def get_checkpoint(db: AsyncSession, execution_id: UUID) -> dict:
+        """Load the state needed to resume an execution"""
+        execution = await AsyncExecutionService.get_execution(db, execution_id)
+        
+        result = await db.execute(
+            select(
+                ExecutionCheckpoint.node_id,
+                ExecutionCheckpoint.branch,
+                ExecutionCheckpoint.output,
+            ).where(ExecutionCheckpoint.execution_id == execution_id)
+        )
+        
+        return _build_checkpoint(execution, result.all())
+    
+    @staticmethod
+    async def add_execution_logs(db: AsyncSession, rows: list[dict]) -> None:
+        """Insert log rows with a single multi-row INSERT"""
+        if not rows:
+            return
+        
+        await db.execute(insert(ExecutionLog.__table__).values(rows))
+        await db.commit()
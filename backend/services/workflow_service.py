@@ -1,10 +1,14 @@
 from sqlalchemy.orm import Session
 from uuid import UUID
+from core.cache_bus import cache_bus
 from models.workflow import Workflow
 from models.user import User
 from schemas.workflow import WorkflowCreate, WorkflowUpdate
 from utils.errors import WorkflowNotFound
 
+# Cache name used for invalidation messages about workflows
+WORKFLOW_CACHE = "workflow"
+
 
 class WorkflowService:
     """Service for workflow operations"""
@@ -18,12 +22,17 @@ class WorkflowService:
             description=workflow_data.description,
             definition=workflow_data.definition.model_dump(),
             schedule=workflow_data.schedule,
+            misfire_policy=workflow_data.misfire_policy,
         )
         
         db.add(workflow)
         db.commit()
         db.refresh(workflow)
         
+        # Lets the scheduler pick up a new schedule right away
+        if workflow.schedule:
+            cache_bus.publish(WORKFLOW_CACHE, str(workflow.id))
+        
         return workflow
     
     @staticmethod
@@ -59,12 +68,21 @@ class WorkflowService:
             workflow.definition = workflow_data.definition.model_dump()
         if workflow_data.is_active is not None:
             workflow.is_active = workflow_data.is_active
-        if workflow_data.schedule is not None:
+        if workflow_data.schedule is not None and workflow_data.schedule != workflow.schedule:
             workflow.schedule = workflow_data.schedule
+            # Runs of the old expression are not misfires of the new one
+            workflow.schedule_fired_at = None
+        if workflow_data.misfire_policy is not None:
+            workflow.misfire_policy = workflow_data.misfire_policy
+        
+        # Workers compare versions before reusing a cached definition
+        workflow.version = Workflow.version + 1
         
         db.commit()
         db.refresh(workflow)
         
+        cache_bus.publish(WORKFLOW_CACHE, str(workflow_id))
+        
         return workflow
     
     @staticmethod
@@ -73,4 +91,6 @@ class WorkflowService:
         workflow = WorkflowService.get_workflow(db, workflow_id, user)
         db.delete(workflow)
         db.commit()
+        
+        cache_bus.publish(WORKFLOW_CACHE, str(workflow_id))
 
@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+# Settings are read on import, so the test database is chosen before any
+# application module is loaded
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["DEBUG"] = "false"
+
+import uuid
+import pytest
+from core.async_database import async_engine
+from core.database import Base, SessionLocal, engine
+from models.user import User
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once for the whole run"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+async def async_db_engine():
+    """Async engine, disposed on the test's own event loop"""
+    yield async_engine
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def user():
+    """A stored user"""
+    db = SessionLocal()
+    try:
+        user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        db.expunge(user)
+        return user
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client(user):
+    """API client authenticated as ``user``"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from core.auth_cache import Principal
+    from core.dependencies import get_current_user
+    from routes import executions_router, workflows_router
+    
+    app = FastAPI()
+    app.include_router(workflows_router, prefix="/api")
+    app.include_router(executions_router, prefix="/api")
+    app.dependency_overrides[get_current_user] = lambda: Principal.from_user(user)
+    
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from core.async_database import AsyncSessionLocal
+from core.config import settings
+from core.database import SessionLocal
+from models import Execution, ExecutionLog, Workflow
+from services.execution_service import AsyncExecutionService
+from workflows.context import ExecutionContext
+from workflows.engine import WorkflowEngine
+from workflows.executor import NodeExecutorFactory
+from workflows.nodes.base_node import BaseNode
+from utils.errors import ExecutionError
+
+
+class PassingNode(BaseNode):
+    """Finishes, and starts writing, just as its sibling's failure is logged"""
+    
+    failure_logged: asyncio.Event
+    
+    async def execute(self, context: ExecutionContext):
+        await PassingNode.failure_logged.wait()
+        return {'ok': True}
+    
+    def validate_config(self) -> bool:
+        return True
+
+
+class FailingNode(BaseNode):
+    async def execute(self, context: ExecutionContext):
+        raise ValueError("node exploded")
+    
+    def validate_config(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def node_types():
+    NodeExecutorFactory.register_node_type('test_pass', PassingNode)
+    NodeExecutorFactory.register_node_type('test_fail', FailingNode)
+    yield
+    del NodeExecutorFactory.NODE_TYPES['test_pass']
+    del NodeExecutorFactory.NODE_TYPES['test_fail']
+
+
+def create_execution(user, definition: dict) -> Execution:
+    db = SessionLocal()
+    try:
+        workflow = Workflow(user_id=user.id, name="test", definition=definition)
+        db.add(workflow)
+        db.flush()
+        execution = Execution(workflow_id=workflow.id, trigger_type="manual")
+        db.add(execution)
+        db.commit()
+        db.refresh(execution)
+        db.expunge(execution)
+        return execution
+    finally:
+        db.close()
+
+
+async def test_failure_during_sibling_write_marks_execution_failed(user, node_types, async_db_engine, monkeypatch):
+    """A node failing while a sibling writes its logs must not wedge the session"""
+    PassingNode.failure_logged = asyncio.Event()
+    add_execution_logs = AsyncExecutionService.add_execution_logs
+    
+    async def signalling_add_execution_logs(db, rows):
+        await add_execution_logs(db, rows)
+        if any(row['node_id'] == 'node_fail' for row in rows):
+            PassingNode.failure_logged.set()
+    
+    monkeypatch.setattr(AsyncExecutionService, 'add_execution_logs', staticmethod(signalling_add_execution_logs))
+    monkeypatch.setattr(settings, 'EXECUTION_LOG_DURABILITY', 'immediate')
+    
+    definition = {
+        'nodes': [
+            {'id': 'node_pass', 'type': 'test_pass', 'config': {}},
+            {'id': 'node_fail', 'type': 'test_fail', 'config': {}},
+        ],
+        'edges': [],
+    }
+    execution = create_execution(user, definition)
+    
+    async with AsyncSessionLocal() as session:
+        with pytest.raises(ExecutionError, match="node exploded"):
+            await WorkflowEngine(definition, session).execute(execution.id)
+    
+    db = SessionLocal()
+    try:
+        stored = db.get(Execution, execution.id)
+        assert stored.status == "failed"
+        assert "node exploded" in stored.error_message
+        
+        logs = db.query(ExecutionLog).filter(ExecutionLog.execution_id == execution.id).all()
+        assert {(log.node_id, log.level) for log in logs} == {('node_pass', 'info'), ('node_fail', 'error')}
+    finally:
+        db.close()
@@ -0,0 +1,49 @@
+from uuid import UUID
+from kombu.exceptions import OperationalError
+from core.database import SessionLocal
+from models import Execution
+from routes import executions
+
+
+def create_workflow(client) -> str:
+    definition = {
+        'nodes': [{'id': 'node_a', 'type': 'delay', 'position': {'x': 0, 'y': 0}, 'config': {'seconds': 0}}],
+        'edges': [],
+    }
+    response = client.post("/api/workflows", json={'name': "queued", 'definition': definition})
+    return response.json()['id']
+
+
+def execution_statuses(workflow_id: str) -> list:
+    db = SessionLocal()
+    try:
+        return [execution.status for execution in db.query(Execution).filter(Execution.workflow_id == UUID(workflow_id))]
+    finally:
+        db.close()
+
+
+def broker_down(*args, **kwargs):
+    raise OperationalError("Error 111 connecting to localhost:6379. Connection refused.")
+
+
+def test_execution_is_failed_when_its_task_cannot_be_queued(client, monkeypatch):
+    monkeypatch.setattr(executions.execute_workflow, 'delay', broker_down)
+    
+    workflow_id = create_workflow(client)
+    
+    response = client.post("/api/executions", json={'workflow_id': workflow_id})
+    
+    assert response.status_code == 503
+    assert "Connection refused" in response.json()['detail']
+    assert execution_statuses(workflow_id) == ["failed"]
+
+
+def test_bulk_executions_are_failed_when_their_tasks_cannot_be_queued(client, monkeypatch):
+    monkeypatch.setattr(executions, 'enqueue_executions', broker_down)
+    workflow_id = create_workflow(client)
+    
+    response = client.post("/api/executions/bulk", json={'executions': [{'workflow_id': workflow_id}] * 3})
+    
+    assert response.status_code == 503
+    assert execution_statuses(workflow_id) == ["failed"] * 3
+
@@ -0,0 +1,64 @@
+import pytest
+from workflows.expressions import ColumnSet, compile_expression
+
+np = pytest.importorskip("numpy")
+
+
+def evaluate(source: str, records: list, vectorized: bool):
+    """Result column as Python values, or the exception type it raised"""
+    columns = ColumnSet(records, vectorized)
+    try:
+        return columns.to_list(compile_expression(source).evaluate(columns))
+    except Exception as e:
+        return type(e)
+
+
+RECORDS = [
+    {'a': 7, 'b': 0, 'c': True, 'd': 2 ** 40, 'f': 2.5, 'n': -3},
+    {'a': -9, 'b': 2, 'c': False, 'd': 3, 'f': -0.5, 'n': 4},
+]
+
+
+@pytest.mark.parametrize("source", [
+    "a // b",
+    "a % b",
+    "d * d * d",
+    "c + c",
+    "c - c",
+    "-c",
+    "a ** -1",
+    "n ** 2",
+    "a / b",
+    "d * d / 3",
+    "a + f * 2",
+    "f // 2",
+    "f % 2",
+    "a // n",
+    "a % n",
+    "-a",
+    "d > f",
+    "a * 2 - n",
+])
+def test_numpy_matches_lists(source: str):
+    """NumPy columns give the same values (and errors) as Python lists"""
+    expected = evaluate(source, RECORDS, vectorized=False)
+    assert evaluate(source, RECORDS, vectorized=True) == expected
+
+
+def test_numpy_matches_lists_per_value():
+    """Results do not change with which records share a batch"""
+    for record in RECORDS[1:]:
+        for source in ("a // b", "a % b", "c + c", "a ** -1"):
+            assert evaluate(source, [record], vectorized=True) == evaluate(source, [record], vectorized=False)
+
+
+def test_large_products_are_exact():
+    assert evaluate("d * d * d", RECORDS[:1], vectorized=True) == [2 ** 120]
+
+
+def test_native_path_still_used_for_safe_operations(monkeypatch):
+    """Float arithmetic and int arithmetic that fits int64 stay vectorized"""
+    monkeypatch.setattr(np, 'frompyfunc', None)
+    records = [{'a': 1, 'f': 0.5}, {'a': 2, 'f': 1.5}]
+    assert evaluate("a * 3 + f - a // 2", records, vectorized=True) == [3.5, 6.5]
+    assert evaluate("a > f", records, vectorized=True) == [True, True]
@@ -0,0 +1,36 @@
+def test_edge_with_boolean_when_is_saved(client):
+    """Condition nodes branch on true/false, so edges may be labelled with booleans"""
+    definition = {
+        'nodes': [
+            {'id': 'node_check', 'type': 'conditional', 'position': {'x': 0, 'y': 0},
+             'config': {'condition': '{{value}} > 1'}},
+            {'id': 'node_yes', 'type': 'delay', 'position': {'x': 0, 'y': 100}, 'config': {'seconds': 0}},
+        ],
+        'edges': [
+            {'from_node': 'node_check', 'to_node': 'node_yes', 'when': True},
+        ],
+    }
+    
+    response = client.post("/api/workflows", json={'name': "branching", 'definition': definition})
+    
+    assert response.status_code == 200, response.text
+    edge = response.json()['definition']['edges'][0]
+    assert edge['when'] is True
+    
+    response = client.get(f"/api/workflows/{response.json()['id']}")
+    assert response.json()['definition']['edges'][0]['when'] is True
+
+
+def test_edge_with_string_when_is_kept_as_string(client):
+    definition = {
+        'nodes': [
+            {'id': 'node_a', 'type': 'delay', 'position': {'x': 0, 'y': 0}, 'config': {'seconds': 0}},
+            {'id': 'node_b', 'type': 'delay', 'position': {'x': 0, 'y': 100}, 'config': {'seconds': 0}},
+        ],
+        'edges': [{'from_node': 'node_a', 'to_node': 'node_b', 'when': "true"}],
+    }
+    
+    response = client.post("/api/workflows", json={'name': "labelled", 'definition': definition})
+    
+    assert response.status_code == 200, response.text
+    assert response.json()['definition']['edges'][0]['when'] == "true"
@@ -5,9 +5,15 @@ from utils.errors import (
     IntegrationError,
     ValidationError,
     NodeExecutionError,
+    RetryableError,
+    StreamNodeError,
+    CircuitOpenError,
+    ExecutionSuspended,
+    InvalidStatusTransition,
 )
 from utils.logging import setup_logging, get_logger
 from utils.helpers import resolve_variable, resolve_dict_variables
+from utils.pagination import encode_cursor, decode_cursor
 
 __all__ = [
     "AutomationPlatformException",
@@ -16,9 +22,16 @@ __all__ = [
     "IntegrationError",
     "ValidationError",
     "NodeExecutionError",
+    "RetryableError",
+    "StreamNodeError",
+    "CircuitOpenError",
+    "ExecutionSuspended",
+    "InvalidStatusTransition",
     "setup_logging",
     "get_logger",
     "resolve_variable",
     "resolve_dict_variables",
+    "encode_cursor",
+    "decode_cursor",
 ]
 
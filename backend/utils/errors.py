@@ -1,3 +1,7 @@
+from typing import Any
+from datetime import datetime
+
+
 class AutomationPlatformException(Exception):
     """Base exception for automation platform"""
     pass
@@ -27,3 +31,45 @@ class NodeExecutionError(AutomationPlatformException):
     """Raised when node execution fails"""
     pass
 
+
+class InvalidStatusTransition(AutomationPlatformException):
+    """Raised when an execution cannot move from its current status to the requested one"""
+    pass
+
+
+class RetryableError(NodeExecutionError):
+    """Raised when node execution fails with a transient error"""
+    
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class StreamNodeError(NodeExecutionError):
+    """Raised when a node of a streaming pipeline fails"""
+    
+    def __init__(self, message: str, node_id: str):
+        super().__init__(message)
+        self.node_id = node_id
+    
+    def __reduce__(self):
+        # Keeps the error picklable across process pool boundaries
+        return (type(self), (str(self), self.node_id))
+
+
+class CircuitOpenError(NodeExecutionError):
+    """Raised when a call is rejected by an open circuit breaker"""
+    pass
+
+
+class ExecutionSuspended(AutomationPlatformException):
+    """Raised when an execution is suspended until a later time"""
+    
+    def __init__(self, message: str, resume_at: datetime, output: Any = None):
+        super().__init__(message)
+        self.resume_at = resume_at
+        self.output = output
+    
+    def __reduce__(self):
+        # Keeps the error picklable across process pool boundaries
+        return (type(self), (str(self), self.resume_at, self.output))
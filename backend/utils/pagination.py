@@ -0,0 +1,42 @@
+from typing import Tuple
+from datetime import datetime
+from uuid import UUID
+import base64
+import binascii
+from utils.errors import ValidationError
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """
+    Build an opaque keyset pagination cursor
+    
+    Args:
+        sort_value: Sort column value of the last row on the page
+        row_id: ID of the last row on the page (tie-breaker)
+    
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{sort_value.isoformat()}|{row_id.hex}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Inverse of ``encode_cursor``
+    
+    Args:
+        cursor: Cursor from a previous page
+    
+    Returns:
+        Tuple of sort value and row ID to continue after
+    
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        sort_value, row_id = raw.split('|')
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (ValueError, binascii.Error):
+        raise ValidationError("Invalid pagination cursor")
@@ -1,2 +1,10 @@
 # WebSocket package for real-time updates
+from websocket.hub import ExecutionEventHub, Subscription, event_hub
+from websocket.routes import router as websocket_router
 
+__all__ = [
+    "ExecutionEventHub",
+    "Subscription",
+    "event_hub",
+    "websocket_router",
+]
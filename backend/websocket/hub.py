@@ -0,0 +1,222 @@
+from typing import Dict, List, Optional, Set
+from collections import OrderedDict
+import asyncio
+import json
+import redis
+import redis.asyncio as aioredis
+from core.config import settings
+from core.event_stream import STATUS, execution_channel
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Statuses after which an execution emits no more events
+FINAL_STATUSES = frozenset({"success", "failed", "cancelled"})
+
+
+def coalesce_key(event: dict) -> str:
+    """
+    Key under which newer events replace older ones for a connection
+    
+    The latest status wins, and a node's finished event replaces its
+    started event.
+    """
+    if event.get('type') == STATUS:
+        return STATUS
+    return f"node:{event.get('node_id')}"
+
+
+class Subscription:
+    """
+    Events waiting to be sent to one WebSocket connection
+    
+    Pending events are coalesced by ``coalesce_key`` and kept as the raw
+    JSON received from Redis, so they are parsed once per API process and
+    never re-serialized. The hub never blocks on a connection: if more
+    than ``max_pending`` distinct events pile up, the subscription is
+    marked overflowed and the connection is closed.
+    """
+    
+    def __init__(self, execution_id: str, max_pending: int):
+        self.execution_id = execution_id
+        self.channel = execution_channel(execution_id)
+        self.max_pending = max_pending
+        self.overflowed = False
+        self.finished = False
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self._ready = asyncio.Event()
+    
+    def put(self, key: str, raw: str, final: bool = False) -> None:
+        """Add an event, replacing a pending one with the same key"""
+        if self.overflowed:
+            return
+        
+        self._pending[key] = raw
+        self._pending.move_to_end(key)
+        self.finished = self.finished or final
+        
+        if len(self._pending) > self.max_pending:
+            self.overflowed = True
+            self._pending.clear()
+        
+        self._ready.set()
+    
+    async def get_batch(self) -> List[str]:
+        """Wait for events and take all pending ones"""
+        await self._ready.wait()
+        self._ready.clear()
+        
+        batch = list(self._pending.values())
+        self._pending.clear()
+        return batch
+
+
+class ExecutionEventHub:
+    """
+    Fans execution events from Redis out to this process's WebSockets
+    
+    One pub/sub connection per API process is subscribed to the channels
+    of executions that have at least one local subscriber, so any replica
+    can serve any client and Redis only sends each event once per
+    interested replica.
+    """
+    
+    def __init__(self, redis_url: str):
+        self.redis_url = redis_url
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._client: Optional[aioredis.Redis] = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+    
+    async def subscribe(self, execution_id: str) -> Subscription:
+        """
+        Start receiving an execution's events
+        
+        Args:
+            execution_id: Execution ID
+        
+        Returns:
+            Subscription to read batches from; pass it to ``unsubscribe`` when done
+        
+        Raises:
+            redis.RedisError: If Redis cannot be reached
+        """
+        subscription = Subscription(str(execution_id), settings.WS_MAX_PENDING_EVENTS)
+        
+        async with self._lock:
+            subscribers = self._subscriptions.setdefault(subscription.channel, set())
+            subscribers.add(subscription)
+            
+            try:
+                if self._pubsub is None:
+                    await self._connect()
+                elif len(subscribers) == 1:
+                    await self._pubsub.subscribe(subscription.channel)
+            except (redis.RedisError, OSError):
+                self._discard(subscription)
+                raise
+            
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+        
+        return subscription
+    
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop receiving events for a subscription"""
+        async with self._lock:
+            if not self._discard(subscription) or self._pubsub is None:
+                return
+            
+            try:
+                await self._pubsub.unsubscribe(subscription.channel)
+            except (redis.RedisError, OSError) as e:
+                logger.warning(f"Event hub: could not unsubscribe {subscription.channel} - {str(e)}")
+    
+    async def aclose(self) -> None:
+        """Stop the reader and close the Redis connection"""
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        
+        self._subscriptions.clear()
+        await self._disconnect()
+    
+    def _discard(self, subscription: Subscription) -> bool:
+        """Remove a subscription; returns True if it was its channel's last one"""
+        subscribers = self._subscriptions.get(subscription.channel)
+        if subscribers is None or subscription not in subscribers:
+            return False
+        
+        subscribers.discard(subscription)
+        if subscribers:
+            return False
+        
+        del self._subscriptions[subscription.channel]
+        return True
+    
+    async def _connect(self) -> None:
+        """Open the pub/sub connection and subscribe to every active channel"""
+        self._client = aioredis.Redis.from_url(self.redis_url)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await self._pubsub.subscribe(*self._subscriptions)
+        except (redis.RedisError, OSError):
+            await self._disconnect()
+            raise
+    
+    async def _disconnect(self) -> None:
+        """Close the pub/sub connection, ignoring errors"""
+        pubsub, client = self._pubsub, self._client
+        self._pubsub = None
+        self._client = None
+        
+        for resource in (pubsub, client):
+            if resource is None:
+                continue
+            try:
+                await resource.aclose()
+            except (redis.RedisError, OSError):
+                pass
+    
+    async def _read(self) -> None:
+        """Dispatch messages until no subscriber is left, reconnecting after errors"""
+        while self._subscriptions:
+            try:
+                if self._pubsub is None:
+                    async with self._lock:
+                        if self._pubsub is None and self._subscriptions:
+                            await self._connect()
+                    continue
+                
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    self._dispatch(message['channel'], message['data'])
+            except (redis.RedisError, OSError) as e:
+                logger.warning(f"Event hub: listener error - {str(e)}; reconnecting")
+                async with self._lock:
+                    await self._disconnect()
+                await asyncio.sleep(1.0)
+    
+    def _dispatch(self, channel: bytes, data: bytes) -> None:
+        """Hand one event to every local subscriber of its channel"""
+        subscribers = self._subscriptions.get(channel.decode() if isinstance(channel, bytes) else channel)
+        if not subscribers:
+            return
+        
+        raw = data.decode() if isinstance(data, bytes) else data
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            logger.warning(f"Event hub: ignoring malformed event {raw!r}")
+            return
+        
+        key = coalesce_key(event)
+        final = event.get('type') == STATUS and event.get('status') in FINAL_STATUSES
+        for subscription in list(subscribers):
+            subscription.put(key, raw, final)
+
+
+# Per-process hub shared by all WebSocket connections
+event_hub = ExecutionEventHub(settings.REDIS_URL)
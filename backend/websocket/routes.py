@@ -0,0 +1,151 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+import asyncio
+import json
+import redis
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import run_in_threadpool
+from core.config import settings
+from core.database import SessionLocal
+from core.security import decode_token
+from models.execution import Execution
+from models.user import User
+from models.workflow import Workflow
+from websocket.hub import FINAL_STATUSES, Subscription, event_hub
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter(tags=["websocket"])
+
+# Close codes
+TRY_AGAIN_LATER = 1013
+
+
+def _load_snapshot(token: str, execution_id: UUID) -> Optional[Dict[str, Any]]:
+    """
+    Authenticate a connection and read the execution's current state
+    
+    Browsers cannot set headers on WebSocket requests, so the access token
+    comes as a query parameter.
+    
+    Args:
+        token: JWT access token
+        execution_id: Execution ID
+    
+    Returns:
+        Snapshot event, or None if the token is invalid or the execution
+        does not belong to the user
+    """
+    payload = decode_token(token)
+    try:
+        user_id = UUID(str(payload["sub"]))
+    except (TypeError, KeyError, ValueError):
+        return None
+    
+    db = SessionLocal()
+    try:
+        row = db.query(Execution, User.is_active).join(
+            Workflow, Workflow.id == Execution.workflow_id
+        ).join(
+            User, User.id == Workflow.user_id
+        ).filter(
+            Execution.id == execution_id,
+            User.id == user_id,
+        ).first()
+    finally:
+        db.close()
+    
+    if row is None or not row.is_active:
+        return None
+    
+    execution = row.Execution
+    return {
+        'type': 'snapshot',
+        'execution_id': str(execution.id),
+        'status': execution.status,
+        'error_message': execution.error_message,
+        'started_at': execution.started_at.isoformat() if execution.started_at else None,
+        'completed_at': execution.completed_at.isoformat() if execution.completed_at else None,
+    }
+
+
+async def _send_events(websocket: WebSocket, subscription: Subscription) -> None:
+    """
+    Send coalesced event batches until the execution finishes
+    
+    Each frame is ``{"events": [...]}``. After a frame, events arriving
+    during ``WS_COALESCE_SECONDS`` are merged into the next one.
+    """
+    while True:
+        batch = await subscription.get_batch()
+        
+        if subscription.overflowed:
+            logger.warning(f"WebSocket: closing slow client of execution {subscription.execution_id}")
+            await websocket.close(code=TRY_AGAIN_LATER, reason="Client too slow")
+            return
+        
+        if batch:
+            frame = '{"events":[' + ','.join(batch) + ']}'
+            await asyncio.wait_for(websocket.send_text(frame), settings.WS_SEND_TIMEOUT_SECONDS)
+        
+        if subscription.finished:
+            await websocket.close()
+            return
+        
+        await asyncio.sleep(settings.WS_COALESCE_SECONDS)
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Consume client messages until it disconnects"""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/ws/executions/{execution_id}")
+async def stream_execution_events(
+    websocket: WebSocket,
+    execution_id: UUID,
+    token: str = Query(...),
+):
+    """Stream node and status events of an execution"""
+    # Subscribe before loading the snapshot, so an event published in
+    # between (e.g. the final status) is still delivered
+    try:
+        subscription = await event_hub.subscribe(str(execution_id))
+    except (redis.RedisError, OSError) as e:
+        logger.error(f"WebSocket: event stream unavailable - {str(e)}")
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    
+    sender = None
+    receiver = None
+    try:
+        snapshot = await run_in_threadpool(_load_snapshot, token, execution_id)
+        if snapshot is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        
+        await websocket.accept()
+        await websocket.send_text(json.dumps({'events': [snapshot]}))
+        if snapshot['status'] in FINAL_STATUSES:
+            await websocket.close()
+            return
+        
+        sender = asyncio.create_task(_send_events(websocket, subscription))
+        receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                logger.info(f"WebSocket: stream of execution {execution_id} ended - {str(task.exception())}")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in (sender, receiver):
+            if task is not None:
+                task.cancel()
+        await event_hub.unsubscribe(subscription)
@@ -1,9 +1,12 @@
 from workers.celery_app import celery_app
-from workers.tasks import execute_workflow, execute_scheduled_workflow
+from workers.tasks import execute_workflow, execute_scheduled_workflow, resume_execution, enqueue_executions, enqueue_scheduled_workflows
 
 __all__ = [
     "celery_app",
     "execute_workflow",
     "execute_scheduled_workflow",
+    "resume_execution",
+    "enqueue_executions",
+    "enqueue_scheduled_workflows",
 ]
 
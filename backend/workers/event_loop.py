@@ -0,0 +1,142 @@
+from typing import Any, Awaitable, Callable, List, Optional
+import asyncio
+import threading
+from celery.signals import worker_process_init, worker_process_shutdown
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class WorkerEventLoop:
+    """
+    Long-lived asyncio event loop for a worker process
+    
+    The loop runs on a dedicated daemon thread and tasks submit coroutines
+    to it with ``run``, so loop-bound resources (pooled HTTP clients, async
+    DB engines, caches) are reused across tasks instead of being rebuilt
+    for each one. Resources register an async shutdown callback that is
+    awaited on the loop when the worker process exits.
+    """
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._shutdown_callbacks: List[Callable[[], Awaitable[Any]]] = []
+    
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Start the loop thread if it is not running yet"""
+        with self._lock:
+            if self.is_running:
+                return
+            
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            
+            def run_loop() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+            
+            self._loop = loop
+            self._thread = threading.Thread(target=run_loop, name="worker-event-loop", daemon=True)
+            self._thread.start()
+            ready.wait()
+            
+            logger.info("Worker event loop: started")
+    
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the worker loop and wait for its result
+        
+        The loop is started on first use, so pools without the
+        worker-process-init signal (solo, threads, eager mode) work too.
+        
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before cancelling the coroutine
+        
+        Returns:
+            Result of the coroutine
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timeouts and Celery's SoftTimeLimitExceeded interrupt this thread;
+            # cancel the coroutine so it does not keep running on the loop
+            future.cancel()
+            raise
+    
+    def add_shutdown_callback(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        """Register an async callback that releases a loop-bound resource"""
+        if callback not in self._shutdown_callbacks:
+            self._shutdown_callbacks.append(callback)
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Release loop-bound resources, then stop and close the loop
+        
+        Args:
+            timeout: Seconds to wait for each shutdown step
+        """
+        with self._lock:
+            if not self.is_running:
+                return
+            
+            loop, thread = self._loop, self._thread
+            
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Worker event loop: error during shutdown - {str(e)}")
+            
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            
+            if not loop.is_running():
+                loop.close()
+            
+            self._loop = None
+            self._thread = None
+            
+            logger.info("Worker event loop: stopped")
+    
+    async def _shutdown(self) -> None:
+        """Run shutdown callbacks and cancel whatever is still pending"""
+        for callback in self._shutdown_callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                logger.warning(f"Worker event loop: shutdown callback failed - {str(e)}")
+        
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        await asyncio.get_running_loop().shutdown_asyncgens()
+
+
+# One loop per worker process
+worker_loop = WorkerEventLoop()
+
+
+@worker_process_init.connect
+def start_worker_loop(**kwargs) -> None:
+    """Start the loop in each freshly forked worker process"""
+    worker_loop.start()
+
+
+@worker_process_shutdown.connect
+def stop_worker_loop(**kwargs) -> None:
+    """Close loop-bound resources before the worker process exits"""
+    worker_loop.stop()
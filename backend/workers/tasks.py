@@ -1,15 +1,146 @@
-import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
+from core.config import settings
+from celery.signals import worker_process_init, worker_process_shutdown
+from core.cache_bus import cache_bus
+from core.event_stream import execution_events
 from workers.celery_app import celery_app
+from workers.event_loop import worker_loop
 from core.database import SessionLocal
+from core.async_database import AsyncSessionLocal, dispose_async_engine
 from workflows.engine import WorkflowEngine
-from services.workflow_service import WorkflowService
-from services.execution_service import ExecutionService
+from workflows.definition_cache import CachedWorkflow, workflow_cache
+from workflows.http_client import http_clients
+from workflows.process_pool import process_pool
+from services.execution_service import ExecutionService, AsyncExecutionService
+from utils.errors import ExecutionSuspended, InvalidStatusTransition
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Pooled HTTP clients, async DB connections and the event publisher
+# live on the worker loop and are closed with it
+worker_loop.add_shutdown_callback(http_clients.aclose)
+worker_loop.add_shutdown_callback(execution_events.aclose)
+worker_loop.add_shutdown_callback(dispose_async_engine)
+
+
+@worker_process_init.connect
+def start_cache_invalidation(**kwargs) -> None:
+    """Listen for workflow updates so cached definitions are dropped early"""
+    cache_bus.start()
+
+
+@worker_process_shutdown.connect
+def stop_cache_invalidation(**kwargs) -> None:
+    """Stop the invalidation listener"""
+    cache_bus.stop()
+
+
+@worker_process_shutdown.connect
+def stop_process_pool(**kwargs) -> None:
+    """Terminate the processes running CPU-bound nodes"""
+    process_pool.shutdown()
+
+
+async def _execute(workflow: CachedWorkflow, execution_id: UUID, resume: bool) -> Dict[str, Any]:
+    """Run the engine with an async session so DB writes do not block node I/O"""
+    async with AsyncSessionLocal() as session:
+        checkpoint = None
+        if resume:
+            checkpoint = await AsyncExecutionService.get_checkpoint(session, execution_id)
+        
+        engine = WorkflowEngine(workflow.definition, session, plan=workflow.plan)
+        return await engine.execute(execution_id, checkpoint)
+
+
+def _run_engine(workflow: CachedWorkflow, execution_id: UUID, resume: bool = False) -> Dict[str, Any]:
+    """
+    Run a workflow on the worker's event loop
+    
+    Args:
+        workflow: Cached workflow definition and plan
+        execution_id: Execution ID
+        resume: Continue from the execution's checkpoints
+    
+    Returns:
+        Final output from workflow execution
+    
+    Raises:
+        ExecutionSuspended: If the execution was suspended
+    """
+    return worker_loop.run(_execute(workflow, execution_id, resume))
+
+
+def _schedule_resume(execution_id: UUID, workflow_id: UUID, user_id: UUID, resume_at: datetime) -> Dict[str, Any]:
+    """
+    Enqueue the task that resumes a suspended execution
+    
+    The broker holds the task until its ETA, so no worker slot is used
+    while waiting. ETAs are capped below the Redis visibility timeout to
+    avoid redelivery; a resume that comes early just suspends again.
+    
+    Args:
+        execution_id: Execution ID
+        workflow_id: Workflow ID
+        user_id: User ID
+        resume_at: When the execution should continue (UTC)
+    
+    Returns:
+        Task result for the suspended execution
+    """
+    eta = min(resume_at, datetime.utcnow() + timedelta(seconds=settings.DURABLE_DELAY_MAX_ETA_SECONDS))
+    resume_execution.apply_async(
+        args=[str(execution_id), str(workflow_id), str(user_id)],
+        eta=eta,
+    )
+    
+    logger.info(f"Task: Execution {execution_id} waiting until {resume_at.isoformat()}")
+    return {
+        "status": "waiting",
+        "execution_id": str(execution_id),
+        "resume_at": resume_at.isoformat(),
+    }
+
+
+def _skip_execution(execution_id: UUID, error: InvalidStatusTransition) -> Dict[str, Any]:
+    """
+    Task result for an execution another delivery already claimed or finished
+    
+    Args:
+        execution_id: Execution ID
+        error: Rejected transition to running
+    
+    Returns:
+        Task result that leaves the execution untouched
+    """
+    logger.warning(f"Task: Not running execution {execution_id} - {str(error)}")
+    return {
+        "status": "skipped",
+        "execution_id": str(execution_id),
+    }
+
+
+def _mark_failed(db: Session, execution_id: UUID, error: Exception) -> None:
+    """
+    Mark an execution failed after the engine raised
+    
+    The engine marks failures itself, but cannot when its own database
+    writes fail; without this the execution would stay running. A no-op
+    if the execution is already failed.
+    
+    Args:
+        db: Database session
+        execution_id: Execution ID
+        error: Error the engine raised
+    """
+    try:
+        ExecutionService.update_execution_status(db, UUID(str(execution_id)), "failed", str(error))
+    except:
+        pass
+
 
 @celery_app.task(bind=True, name="execute_workflow")
 def execute_workflow(self, execution_id: str, workflow_id: str, user_id: str):
@@ -30,49 +161,31 @@ def execute_workflow(self, execution_id: str, workflow_id: str, user_id: str):
         
         logger.info(f"Task: Starting execution {execution_id} for workflow {workflow_id}")
         
-        # Get workflow
-        from models.user import User
-        user = db.query(User).filter(User.id == user_id).first()
-        
-        if not user:
-            raise ValueError(f"User {user_id} not found")
-        
-        workflow = WorkflowService.get_workflow(db, workflow_id, user)
-        
-        # Create workflow engine
-        engine = WorkflowEngine(workflow.definition, db)
+        # Get workflow (cached per worker, validated by version)
+        workflow = workflow_cache.get(db, workflow_id, user_id)
         
         # Execute workflow
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         try:
-            result = loop.run_until_complete(engine.execute(execution_id))
-            logger.info(f"Task: Execution {execution_id} completed successfully")
-            return {
-                "status": "success",
-                "execution_id": str(execution_id),
-                "result": result,
-            }
-        finally:
-            loop.close()
+            result = _run_engine(workflow, execution_id)
+        except ExecutionSuspended as e:
+            return _schedule_resume(execution_id, workflow_id, user_id, e.resume_at)
+        except InvalidStatusTransition as e:
+            return _skip_execution(execution_id, e)
+        
+        logger.info(f"Task: Execution {execution_id} completed successfully")
+        logger.debug(f"Task: Workflow cache stats {workflow_cache.stats()}")
+        return {
+            "status": "success",
+            "execution_id": str(execution_id),
+            "result": result,
+        }
         
     except Exception as e:
         logger.error(f"Task: Execution {execution_id} failed - {str(e)}")
         
-        try:
-            execution_id_obj = UUID(execution_id)
-            ExecutionService.update_execution_status(
-                db,
-                execution_id_obj,
-                "failed",
-                str(e)
-            )
-        except:
-            pass
-        
+        _mark_failed(db, execution_id, e)
         raise
-    
+        
     finally:
         db.close()
 
@@ -94,14 +207,9 @@ def execute_scheduled_workflow(self, workflow_id: str, user_id: str):
         
         logger.info(f"Task: Starting scheduled execution for workflow {workflow_id}")
         
-        # Get workflow
-        from models.user import User
-        user = db.query(User).filter(User.id == user_id).first()
-        
-        if not user:
-            raise ValueError(f"User {user_id} not found")
-        
-        workflow = WorkflowService.get_workflow(db, workflow_id, user)
+        # Get workflow (cached per worker, validated by version); also
+        # checks that it still belongs to the user
+        workflow = workflow_cache.get(db, workflow_id, user_id)
         
         # Create execution
         from schemas.execution import ExecutionCreate
@@ -109,30 +217,135 @@ def execute_scheduled_workflow(self, workflow_id: str, user_id: str):
             workflow_id=workflow_id,
             trigger_type="scheduled"
         )
-        execution = ExecutionService.create_execution(db, user, execution_data)
-        
-        # Create workflow engine
-        engine = WorkflowEngine(workflow.definition, db)
+        execution = ExecutionService.create_execution(db, user_id, execution_data)
         
         # Execute workflow
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         try:
-            result = loop.run_until_complete(engine.execute(execution.id))
-            logger.info(f"Task: Scheduled execution {execution.id} completed successfully")
-            return {
-                "status": "success",
-                "execution_id": str(execution.id),
-                "result": result,
-            }
-        finally:
-            loop.close()
+            result = _run_engine(workflow, execution.id)
+        except ExecutionSuspended as e:
+            return _schedule_resume(execution.id, workflow_id, user_id, e.resume_at)
+        except InvalidStatusTransition as e:
+            return _skip_execution(execution.id, e)
+        except Exception as e:
+            _mark_failed(db, execution.id, e)
+            raise
+        
+        logger.info(f"Task: Scheduled execution {execution.id} completed successfully")
+        return {
+            "status": "success",
+            "execution_id": str(execution.id),
+            "result": result,
+        }
         
     except Exception as e:
         logger.error(f"Task: Scheduled workflow execution failed - {str(e)}")
         raise
+        
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True, name="resume_execution")
+def resume_execution(self, execution_id: str, workflow_id: str, user_id: str):
+    """
+    Resume an execution suspended by a durable delay, or a failed
+    execution from its node checkpoints
     
+    Args:
+        execution_id: UUID of the execution
+        workflow_id: UUID of the workflow
+        user_id: UUID of the user
+    """
+    db = SessionLocal()
+    
+    try:
+        execution_id = UUID(execution_id)
+        workflow_id = UUID(workflow_id)
+        user_id = UUID(user_id)
+        
+        logger.info(f"Task: Resuming execution {execution_id}")
+        
+        workflow = workflow_cache.get(db, workflow_id, user_id)
+        
+        # Duplicate deliveries and cancelled executions fail the transition
+        # to running and are skipped
+        try:
+            result = _run_engine(workflow, execution_id, resume=True)
+        except ExecutionSuspended as e:
+            return _schedule_resume(execution_id, workflow_id, user_id, e.resume_at)
+        except InvalidStatusTransition as e:
+            return _skip_execution(execution_id, e)
+        except Exception as e:
+            _mark_failed(db, execution_id, e)
+            raise
+        
+        logger.info(f"Task: Execution {execution_id} completed successfully")
+        return {
+            "status": "success",
+            "execution_id": str(execution_id),
+            "result": result,
+        }
+        
+    except Exception as e:
+        logger.error(f"Task: Resuming execution {execution_id} failed - {str(e)}")
+        raise
+        
     finally:
         db.close()
 
+
+def enqueue_executions(executions: Iterable[Tuple[UUID, UUID, UUID]]) -> int:
+    """
+    Publish execute_workflow tasks for many executions
+    
+    Messages are sent in batches of ``EXECUTION_PUBLISH_BATCH_SIZE`` on a
+    single producer, so the broker connection and channel are acquired
+    once per batch rather than once per task.
+    
+    Args:
+        executions: (execution_id, workflow_id, user_id) tuples
+    
+    Returns:
+        Number of tasks published
+    """
+    executions = list(executions)
+    batch_size = settings.EXECUTION_PUBLISH_BATCH_SIZE
+    
+    for start in range(0, len(executions), batch_size):
+        with celery_app.producer_or_acquire() as producer:
+            for execution_id, workflow_id, user_id in executions[start:start + batch_size]:
+                execute_workflow.apply_async(
+                    args=[str(execution_id), str(workflow_id), str(user_id)],
+                    producer=producer,
+                )
+    
+    logger.info(f"Task: Published {len(executions)} execution(s)")
+    return len(executions)
+
+
+def enqueue_scheduled_workflows(runs: Iterable[Tuple[UUID, UUID]]) -> int:
+    """
+    Publish execute_scheduled_workflow tasks for many due schedules
+    
+    Batched on one producer per ``EXECUTION_PUBLISH_BATCH_SIZE`` messages,
+    like ``enqueue_executions``.
+    
+    Args:
+        runs: (workflow_id, user_id) tuples
+    
+    Returns:
+        Number of tasks published
+    """
+    runs = list(runs)
+    batch_size = settings.EXECUTION_PUBLISH_BATCH_SIZE
+    
+    for start in range(0, len(runs), batch_size):
+        with celery_app.producer_or_acquire() as producer:
+            for workflow_id, user_id in runs[start:start + batch_size]:
+                execute_scheduled_workflow.apply_async(
+                    args=[str(workflow_id), str(user_id)],
+                    producer=producer,
+                )
+    
+    logger.info(f"Task: Published {len(runs)} scheduled run(s)")
+    return len(runs)
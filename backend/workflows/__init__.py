@@ -1,12 +1,20 @@
 from workflows.context import ExecutionContext
 from workflows.engine import WorkflowEngine
 from workflows.executor import NodeExecutorFactory
-from workflows.validator import WorkflowValidator
+from workflows.plan import ExecutionPlan, PlanCache, plan_cache
+from workflows.definition_cache import WorkflowDefinitionCache, workflow_cache
+from workflows.validator import GraphOrder, WorkflowValidator
 
 __all__ = [
     "ExecutionContext",
     "WorkflowEngine",
     "NodeExecutorFactory",
+    "ExecutionPlan",
+    "PlanCache",
+    "plan_cache",
+    "WorkflowDefinitionCache",
+    "workflow_cache",
+    "GraphOrder",
     "WorkflowValidator",
 ]
 
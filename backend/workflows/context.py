@@ -1,5 +1,5 @@
-from typing import Any, Dict, Optional
-import re
+from typing import Any, Dict, Iterable, List, Optional
+from workflows.templates import compile_config, compile_string
 
 
 class ExecutionContext:
@@ -8,6 +8,7 @@ class ExecutionContext:
     def __init__(self):
         self._node_outputs: Dict[str, Any] = {}
         self._global_vars: Dict[str, Any] = {}
+        self._skipped_nodes: List[str] = []
     
     def set_node_output(self, node_id: str, data: Any) -> None:
         """Store output from a node"""
@@ -17,6 +18,18 @@ class ExecutionContext:
         """Get output from a previous node"""
         return self._node_outputs.get(node_id)
     
+    def release_node_output(self, node_id: str) -> None:
+        """Drop a node output that no later node needs"""
+        self._node_outputs.pop(node_id, None)
+    
+    def mark_node_skipped(self, node_id: str) -> None:
+        """Record a node that was skipped because its branch was not taken"""
+        self._skipped_nodes.append(node_id)
+    
+    def get_skipped_nodes(self) -> List[str]:
+        """Get IDs of skipped nodes"""
+        return list(self._skipped_nodes)
+    
     def set_global_var(self, key: str, value: Any) -> None:
         """Set a global variable"""
         self._global_vars[key] = value
@@ -25,6 +38,30 @@ class ExecutionContext:
         """Get a global variable"""
         return self._global_vars.get(key)
     
+    def has_global_var(self, key: str) -> bool:
+        """Check if a global variable is set"""
+        return key in self._global_vars
+    
+    def fork(self, node_ids: Optional[Iterable[str]], global_vars: Dict[str, Any]) -> "ExecutionContext":
+        """
+        Create a context for one run of a nested subgraph or a node run elsewhere
+        
+        Args:
+            node_ids: Outer nodes whose outputs the subgraph reads, None for all
+            global_vars: Variables added on top of this context's globals
+        
+        Returns:
+            New context; outputs set in it do not reach this one
+        """
+        child = ExecutionContext()
+        if node_ids is None:
+            node_ids = self._node_outputs
+        for node_id in node_ids:
+            if node_id in self._node_outputs:
+                child._node_outputs[node_id] = self._node_outputs[node_id]
+        child._global_vars = {**self._global_vars, **global_vars}
+        return child
+    
     def resolve_variable(self, expression: str) -> Any:
         """
         Resolve variable like {{node_1.output.id}}
@@ -38,79 +75,40 @@ class ExecutionContext:
         if not isinstance(expression, str):
             return expression
         
-        # Pattern to match {{...}}
-        pattern = r'\{\{([^}]+)\}\}'
-        
-        def replace_var(match):
-            var_path = match.group(1).strip()
-            parts = var_path.split('.')
-            
-            # Check if it's a node output reference
-            if parts[0].startswith('node_'):
-                node_id = parts[0]
-                value = self.get_node_output(node_id)
-                
-                # Navigate through the remaining path
-                for part in parts[1:]:
-                    if isinstance(value, dict):
-                        value = value.get(part)
-                    else:
-                        return str(match.group(0))
-                    
-                    if value is None:
-                        return ""
-                
-                return str(value) if value is not None else ""
-            
-            # Check if it's a global variable
-            elif parts[0] in self._global_vars:
-                value = self._global_vars[parts[0]]
-                
-                for part in parts[1:]:
-                    if isinstance(value, dict):
-                        value = value.get(part)
-                    else:
-                        return str(match.group(0))
-                    
-                    if value is None:
-                        return ""
-                
-                return str(value) if value is not None else ""
-            
-            return str(match.group(0))
-        
-        return re.sub(pattern, replace_var, expression)
+        # Parsed expressions are cached, so repeated strings skip the regex
+        return compile_string(expression).render(self)
     
     def resolve_dict_variables(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Recursively resolve variables in a dictionary
         
+        Nodes resolve their own config through a template compiled once in
+        ``BaseNode.__init__``; this is for ad-hoc dictionaries.
+        
         Args:
             data: Dictionary with potential variable expressions
         
         Returns:
             Dictionary with resolved variables
         """
-        result = {}
+        return compile_config(data).render(self)
+    
+    def get_final_output(self, node_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get node outputs for the execution result
         
-        for key, value in data.items():
-            if isinstance(value, str):
-                result[key] = self.resolve_variable(value)
-            elif isinstance(value, dict):
-                result[key] = self.resolve_dict_variables(value)
-            elif isinstance(value, list):
-                result[key] = [
-                    self.resolve_variable(item) if isinstance(item, str)
-                    else self.resolve_dict_variables(item) if isinstance(item, dict)
-                    else item
-                    for item in value
-                ]
-            else:
-                result[key] = value
+        Args:
+            node_ids: Nodes to include; all stored outputs if omitted
         
-        return result
-    
-    def get_final_output(self) -> Dict[str, Any]:
-        """Get all node outputs"""
-        return self._node_outputs.copy()
+        Returns:
+            Mapping of node ID to output
+        """
+        if node_ids is None:
+            return self._node_outputs.copy()
+        
+        return {
+            node_id: self._node_outputs[node_id]
+            for node_id in node_ids
+            if node_id in self._node_outputs
+        }
 
@@ -0,0 +1,134 @@
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+from uuid import UUID
+import threading
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from core.cache_bus import cache_bus
+from core.config import settings
+from models.workflow import Workflow
+from workflows.plan import ExecutionPlan
+from services.workflow_service import WORKFLOW_CACHE
+from utils.errors import WorkflowNotFound
+
+
+class CachedWorkflow:
+    """Definition and compiled plan of one workflow version"""
+    
+    __slots__ = ('workflow_id', 'user_id', 'version', 'definition', 'plan')
+    
+    def __init__(self, workflow_id: UUID, user_id: UUID, version: int, definition: Dict[str, Any]):
+        self.workflow_id = workflow_id
+        self.user_id = user_id
+        self.version = version
+        self.definition = definition
+        self.plan: Optional[ExecutionPlan] = None
+
+
+class WorkflowDefinitionCache:
+    """
+    Per-worker LRU cache of workflow definitions and compiled plans
+    
+    Entries are keyed by workflow ID and validated on every lookup with a
+    query reading only the workflow's owner and version, so the JSON
+    definition is fetched and compiled once per version. Updates and
+    deletes also evict entries through the cache invalidation bus.
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[UUID, CachedWorkflow]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, db: Session, workflow_id: UUID, user_id: UUID) -> CachedWorkflow:
+        """
+        Get the current definition and plan of a workflow
+        
+        Args:
+            db: Database session
+            workflow_id: Workflow ID
+            user_id: User the workflow must belong to
+        
+        Returns:
+            Cached workflow; ``plan`` is None if the definition is invalid,
+            which the engine reports when it runs
+        
+        Raises:
+            WorkflowNotFound: If the workflow does not exist or belongs to another user
+        """
+        row = db.execute(
+            select(Workflow.user_id, Workflow.version).where(Workflow.id == workflow_id)
+        ).first()
+        
+        if row is None or row.user_id != user_id:
+            raise WorkflowNotFound(f"Workflow {workflow_id} not found")
+        
+        with self._lock:
+            entry = self._entries.get(workflow_id)
+            if entry is not None and entry.version == row.version:
+                self._entries.move_to_end(workflow_id)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        
+        entry = self._load(db, workflow_id)
+        
+        with self._lock:
+            self._entries[workflow_id] = entry
+            self._entries.move_to_end(workflow_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        
+        return entry
+    
+    @staticmethod
+    def _load(db: Session, workflow_id: UUID) -> CachedWorkflow:
+        """Read a workflow's definition and compile its plan"""
+        row = db.execute(
+            select(Workflow.user_id, Workflow.version, Workflow.definition).where(Workflow.id == workflow_id)
+        ).first()
+        
+        if row is None:
+            raise WorkflowNotFound(f"Workflow {workflow_id} not found")
+        
+        entry = CachedWorkflow(workflow_id, row.user_id, row.version, row.definition)
+        
+        # Invalid definitions are not compiled here so that the engine
+        # marks the execution failed with the validation error
+        try:
+            entry.plan = ExecutionPlan(row.definition)
+        except Exception:
+            entry.plan = None
+        
+        return entry
+    
+    def invalidate(self, workflow_id: str) -> None:
+        """Drop the entry for a workflow"""
+        with self._lock:
+            self._entries.pop(UUID(str(workflow_id)), None)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+# Per-process cache shared by all tasks in a worker
+workflow_cache = WorkflowDefinitionCache(settings.WORKFLOW_CACHE_SIZE)
+cache_bus.subscribe(WORKFLOW_CACHE, workflow_cache.invalidate)
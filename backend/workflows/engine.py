@@ -1,139 +1,585 @@
-from typing import Dict, Any, List
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from core.event_stream import NODE_FINISHED, NODE_STARTED, STATUS, execution_events
 from workflows.context import ExecutionContext
-from workflows.executor import NodeExecutorFactory
-from workflows.validator import WorkflowValidator
-from services.execution_service import ExecutionService
+from workflows.plan import ExecutionPlan, branch_label, plan_cache
+from workflows.streaming import run_pipeline
+from services.execution_service import AsyncExecutionService
+from services.execution_log_buffer import ExecutionLogBuffer
 from utils.logging import get_logger
-from utils.errors import ExecutionError
+from utils.errors import ExecutionError, ExecutionSuspended, StreamNodeError
 
 logger = get_logger(__name__)
 
+# Returned by _execute_node for nodes that suspended the execution
+SUSPENDED = object()
+
 
 class WorkflowEngine:
     """Engine for executing workflows"""
     
-    def __init__(self, workflow_definition: Dict[str, Any], db: Session):
+    def __init__(
+        self,
+        workflow_definition: Dict[str, Any],
+        db: AsyncSession,
+        max_concurrency: Optional[int] = None,
+        plan: Optional[ExecutionPlan] = None,
+    ):
         self.definition = workflow_definition
         self.db = db
         self.nodes = workflow_definition.get('nodes', [])
         self.edges = workflow_definition.get('edges', [])
         self.execution_context = ExecutionContext()
+        self.plan = plan
+        self.logs: Optional[ExecutionLogBuffer] = None
+        
+        # The async session allows one operation at a time, while nodes
+        # checkpoint and log concurrently
+        self._db_lock = asyncio.Lock()
+        
+        # Nodes waiting on a durable delay
+        self._suspended: Dict[str, Dict[str, Any]] = {}
+        
+        # Explicit argument wins over the definition, which wins over settings
+        self.max_concurrency = max(
+            1,
+            max_concurrency
+            or workflow_definition.get('max_concurrency')
+            or settings.WORKFLOW_MAX_CONCURRENCY,
+        )
     
-    async def execute(self, execution_id: UUID) -> Dict[str, Any]:
+    async def execute(self, execution_id: UUID, checkpoint: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Execute workflow
         
         Args:
             execution_id: Execution ID for logging
+            checkpoint: State saved by an earlier run (see
+                ``AsyncExecutionService.get_checkpoint``); nodes finished before
+                are replayed instead of executed again
         
         Returns:
             Final output from workflow execution
+        
+        Raises:
+            ExecutionSuspended: If a durable delay suspended the execution;
+                the checkpoint has been saved and the caller must re-enqueue it
+            InvalidStatusTransition: If the execution cannot be started, e.g.
+                because another worker is already running it
         """
+        # Claim the execution; a duplicate delivery stops here and leaves it untouched
+        await self._db_call(AsyncExecutionService.transition, execution_id, "running")
+        execution_events.publish(execution_id, STATUS, status="running")
+        
+        # Log rows are written in batches and flushed before any status change
+        self.logs = ExecutionLogBuffer(self.db, execution_id, lock=self._db_lock)
+        flusher = asyncio.create_task(self.logs.flush_periodically())
+        
         try:
-            # Validate workflow definition
-            WorkflowValidator.validate_definition(self.definition)
+            # Validated, compiled plan (cached per worker by definition hash)
+            if self.plan is None:
+                self.plan = plan_cache.get(self.definition)
             
-            # Get execution order
-            execution_order = WorkflowValidator.get_execution_order(self.nodes, self.edges)
+            logger.info(f"Execution {execution_id}: Starting workflow execution")
             
-            # Update execution status to running
-            ExecutionService.update_execution_status(self.db, execution_id, "running")
+            # Execute nodes as soon as their predecessors have finished
+            await self._run_graph(execution_id, checkpoint or {})
             
-            logger.info(f"Execution {execution_id}: Starting workflow execution")
+            if self._suspended:
+                await self._suspend(execution_id)
             
-            # Execute each node in order
-            for node_id in execution_order:
-                node_def = self._get_node(node_id)
-                
-                try:
-                    logger.info(f"Execution {execution_id}: Executing node {node_id}")
-                    
-                    # Create node executor
-                    executor = NodeExecutorFactory.create(
-                        node_def['type'],
-                        node_id,
-                        node_def.get('config', {})
-                    )
-                    
-                    # Validate node config
-                    if not executor.validate_config():
-                        raise ExecutionError(f"Invalid configuration for node {node_id}")
-                    
-                    # Execute node
-                    result = await executor.execute(self.execution_context)
-                    
-                    # Store result in context
-                    self.execution_context.set_node_output(node_id, result)
-                    
-                    # Log success
-                    ExecutionService.add_execution_log(
-                        self.db,
-                        execution_id,
-                        node_id,
-                        "info",
-                        f"Node executed successfully",
-                        {"result": result}
-                    )
-                    
-                    logger.info(f"Execution {execution_id}: Node {node_id} completed")
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    logger.error(f"Execution {execution_id}: Node {node_id} failed - {error_msg}")
-                    
-                    # Log error
-                    ExecutionService.add_execution_log(
-                        self.db,
-                        execution_id,
-                        node_id,
-                        "error",
-                        f"Node execution failed: {error_msg}"
-                    )
-                    
-                    # Check if we should continue on error
-                    if node_def.get('on_error') == 'continue':
-                        logger.info(f"Execution {execution_id}: Continuing after error in node {node_id}")
-                        continue
-                    else:
-                        # Update execution status to failed
-                        ExecutionService.update_execution_status(
-                            self.db,
-                            execution_id,
-                            "failed",
-                            error_msg
-                        )
-                        raise ExecutionError(f"Node {node_id} execution failed: {error_msg}")
+            # Record pruned branches with a single log row
+            skipped = self.execution_context.get_skipped_nodes()
+            if skipped:
+                await self.logs.add(
+                    "workflow",
+                    "info",
+                    f"Skipped {len(skipped)} node(s) on untaken branches",
+                    {"skipped": skipped}
+                )
             
             # Update execution status to success
-            final_output = self.execution_context.get_final_output()
-            execution = ExecutionService.update_execution_status(self.db, execution_id, "success")
-            execution.result_data = final_output
-            self.db.commit()
+            await self.logs.flush()
+            final_output = self.execution_context.get_final_output(self.plan.output_node_ids)
+            await self._db_call(
+                AsyncExecutionService.transition,
+                execution_id,
+                "success",
+                None,
+                {'result_data': final_output},
+            )
+            execution_events.publish(execution_id, STATUS, status="success")
             
             logger.info(f"Execution {execution_id}: Workflow execution completed successfully")
             
             return final_output
             
+        except ExecutionSuspended:
+            raise
+            
         except Exception as e:
             error_msg = str(e)
             logger.error(f"Execution {execution_id}: Workflow execution failed - {error_msg}")
             
+            # A write that failed along with the run leaves the session
+            # unusable until it is rolled back
+            async with self._db_lock:
+                await self.db.rollback()
+            
+            # Buffered logs go first; failing to write them must not hide the error
+            try:
+                await self.logs.flush()
+            except Exception as flush_error:
+                logger.warning(f"Execution {execution_id}: Could not write buffered logs - {str(flush_error)}")
+            
             # Update execution status to failed
-            ExecutionService.update_execution_status(
-                self.db,
+            await self._db_call(
+                AsyncExecutionService.transition,
                 execution_id,
                 "failed",
                 error_msg
             )
+            execution_events.publish(execution_id, STATUS, status="failed", error=error_msg)
             
             raise ExecutionError(f"Workflow execution failed: {error_msg}")
+            
+        finally:
+            # Only between writes; cancelling a commit would break the session
+            async with self._db_lock:
+                flusher.cancel()
     
-    def _get_node(self, node_id: str) -> Dict[str, Any]:
-        """Get node definition by ID"""
-        for node in self.nodes:
-            if node['id'] == node_id:
-                return node
-        raise ExecutionError(f"Node {node_id} not found in workflow definition")
-
+    async def _db_call(self, method, *args) -> Any:
+        """Run an AsyncExecutionService method on the engine's session"""
+        async with self._db_lock:
+            return await method(self.db, *args)
+    
+    async def _suspend(self, execution_id: UUID) -> None:
+        """
+        Checkpoint the execution and hand it back to the caller
+        
+        Raises:
+            ExecutionSuspended: Always, carrying the earliest resume time
+        """
+        resume_at = min(
+            datetime.fromisoformat(entry['resume_at']) for entry in self._suspended.values()
+        )
+        
+        # Finished nodes are already checkpointed one by one
+        await self.logs.flush()
+        await self._db_call(AsyncExecutionService.suspend_execution, execution_id, {'suspended': self._suspended}, resume_at)
+        execution_events.publish(execution_id, STATUS, status="waiting", resume_at=resume_at.isoformat())
+        
+        logger.info(f"Execution {execution_id}: Suspended until {resume_at.isoformat()}")
+        raise ExecutionSuspended(f"Execution {execution_id} suspended", resume_at=resume_at)
+    
+    async def _run_graph(self, execution_id: UUID, checkpoint: Dict[str, Any]) -> None:
+        """
+        Run nodes with a ready-set scheduler
+        
+        A node is started as soon as all of its predecessors have finished,
+        so independent branches run concurrently. At most
+        ``self.max_concurrency`` nodes execute at the same time.
+        
+        Edges labelled with ``when`` are only taken if the source node's
+        ``branch`` output matches the label. A node whose incoming edges
+        are all untaken is skipped without running, and so is everything
+        that only it leads to.
+        
+        Nodes that suspend the execution (durable delays) hold back their
+        successors; everything independent of them still runs. Every node
+        that completes is checkpointed, so a resumed run replays finished
+        nodes and continues from where the previous run stopped.
+        
+        Args:
+            execution_id: Execution ID for logging
+            checkpoint: Saved state to replay, empty for a fresh run
+        
+        Raises:
+            ExecutionError: If a node fails and is not marked ``on_error: continue``
+        """
+        plan = self.plan
+        remaining = [len(predecessors) for predecessors in plan.predecessors]
+        
+        # A node runs if at least one incoming edge was taken; roots always run
+        reachable = [count == 0 for count in remaining]
+        
+        # Readers still to finish per node output
+        self._readers_left = list(plan.consumer_counts)
+        
+        # Plan indexes follow topological order, so ready nodes start deterministically
+        ready = deque(i for i, count in enumerate(remaining) if count == 0)
+        running: Dict[asyncio.Task, int] = {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # Outputs of pipeline nodes that finished with their producer
+        streamed: Dict[int, Any] = {}
+        
+        finished_before = checkpoint.get('finished', {})
+        suspended_before = checkpoint.get('suspended', {})
+        for node_id, output in checkpoint.get('outputs', {}).items():
+            self.execution_context.set_node_output(node_id, output)
+        
+        try:
+            while ready or running:
+                while ready:
+                    index = ready.popleft()
+                    node_id = plan.node_ids[index]
+                    
+                    if node_id in finished_before:
+                        # Replay so that branch pruning and liveness match the first run
+                        self._release_successors(index, finished_before[node_id], remaining, reachable, ready)
+                        continue
+                    
+                    if node_id in suspended_before:
+                        await self._resume_node(execution_id, index, suspended_before[node_id], remaining, reachable, ready)
+                        continue
+                    
+                    if index in streamed:
+                        # Ran inside its producer's pipeline
+                        result = streamed.pop(index)
+                        branch = branch_label(result.get('branch')) if isinstance(result, dict) else None
+                        self._release_successors(index, branch, remaining, reachable, ready)
+                        continue
+                    
+                    if index in plan.pipelines:
+                        task = asyncio.create_task(self._execute_pipeline(execution_id, index, semaphore))
+                    else:
+                        task = asyncio.create_task(self._execute_node(execution_id, index, semaphore))
+                    running[task] = index
+                
+                if not running:
+                    break
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    index = running.pop(task)
+                    
+                    # Re-raises fatal node errors
+                    result = task.result()
+                    if result is SUSPENDED:
+                        continue
+                    
+                    if index in plan.pipelines:
+                        # Consumers are released as their producers are
+                        streamed.update(result)
+                        result = streamed.pop(index)
+                    
+                    branch = branch_label(result.get('branch')) if isinstance(result, dict) else None
+                    self._release_successors(index, branch, remaining, reachable, ready)
+        finally:
+            # Stop in-flight siblings when a node fails or the run is cancelled.
+            # Holding the session lock lets a sibling finish the database call
+            # it is in; cancelled mid-commit it would break the shared session
+            if running:
+                async with self._db_lock:
+                    for task in running:
+                        task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+    
+    async def _resume_node(
+        self,
+        execution_id: UUID,
+        index: int,
+        entry: Dict[str, Any],
+        remaining: List[int],
+        reachable: List[bool],
+        ready: deque,
+    ) -> None:
+        """
+        Complete a node suspended in an earlier run, or keep it suspended
+        
+        Args:
+            execution_id: Execution ID for logging
+            index: Plan index of the suspended node
+            entry: Saved ``resume_at`` and output of the node
+            remaining: Unfinished predecessor count per node
+            reachable: Whether any taken edge leads to each node
+            ready: Queue of nodes ready to run
+        """
+        node_id = self.plan.node_ids[index]
+        
+        if datetime.fromisoformat(entry['resume_at']) > datetime.utcnow():
+            self._suspended[node_id] = entry
+            return
+        
+        output = entry.get('output')
+        self.execution_context.set_node_output(node_id, output)
+        await self._db_call(AsyncExecutionService.save_node_checkpoint, execution_id, node_id, output)
+        
+        await self.logs.add(
+            node_id,
+            "info",
+            f"Node executed successfully",
+            {"result": output}
+        )
+        
+        logger.info(f"Execution {execution_id}: Node {node_id} resumed")
+        execution_events.publish(execution_id, NODE_FINISHED, node_id=node_id, status="success")
+        self._release_successors(index, None, remaining, reachable, ready)
+    
+    def _release_successors(
+        self,
+        index: int,
+        branch: Optional[str],
+        remaining: List[int],
+        reachable: List[bool],
+        ready: deque,
+    ) -> None:
+        """
+        Mark a node finished and queue or skip successors that became ready
+        
+        Args:
+            index: Plan index of the finished node
+            branch: Branch label the node's output selected, if any
+            remaining: Unfinished predecessor count per node
+            reachable: Whether any taken edge leads to each node
+            ready: Queue of nodes ready to run
+        """
+        plan = self.plan
+        pending = [(index, branch, True)]
+        
+        while pending:
+            index, branch, ran = pending.pop()
+            self._release_inputs(index)
+            
+            for neighbor, label in zip(plan.successors[index], plan.edge_labels[index]):
+                if ran and (label is None or label == branch):
+                    reachable[neighbor] = True
+                
+                remaining[neighbor] -= 1
+                if remaining[neighbor] > 0:
+                    continue
+                
+                if reachable[neighbor]:
+                    ready.append(neighbor)
+                else:
+                    # Skipped nodes never run, so their own edges are untaken too
+                    self.execution_context.mark_node_skipped(plan.node_ids[neighbor])
+                    pending.append((neighbor, None, False))
+    
+    def _release_inputs(self, index: int) -> None:
+        """
+        Drop outputs that no unfinished node reads any more
+        
+        Called once for every node when it finishes, fails or is skipped.
+        
+        Args:
+            index: Plan index of the finished node
+        """
+        plan = self.plan
+        readers_left = self._readers_left
+        
+        for source in plan.inputs[index]:
+            readers_left[source] -= 1
+            if readers_left[source] == 0 and plan.release_outputs[source]:
+                self.execution_context.release_node_output(plan.node_ids[source])
+        
+        # Outputs nobody reads are dropped straight away
+        if readers_left[index] == 0 and plan.release_outputs[index]:
+            self.execution_context.release_node_output(plan.node_ids[index])
+    
+    async def _execute_node(self, execution_id: UUID, index: int, semaphore: asyncio.Semaphore) -> Any:
+        """
+        Execute a single node and record its result
+        
+        Args:
+            execution_id: Execution ID for logging
+            index: Plan index of the node to execute
+            semaphore: Per-execution concurrency limit
+        
+        Returns:
+            Node output, None if the node failed with ``on_error: continue``,
+            or ``SUSPENDED`` if the node suspended the execution
+        
+        Raises:
+            ExecutionError: If the node fails and is not marked ``on_error: continue``
+        """
+        node_def = self.plan.nodes[index]
+        node_id = node_def['id']
+        
+        try:
+            result, attempts = await self._execute_with_retry(execution_id, index, semaphore)
+            
+            # Store result in context and checkpoint it for resumes
+            self.execution_context.set_node_output(node_id, result)
+            branch = branch_label(result.get('branch')) if isinstance(result, dict) else None
+            await self._db_call(AsyncExecutionService.save_node_checkpoint, execution_id, node_id, result, branch)
+            
+            # Log success
+            metadata = {"result": result}
+            if attempts > 1:
+                metadata["attempts"] = attempts
+            await self.logs.add(
+                node_id,
+                "info",
+                f"Node executed successfully",
+                metadata
+            )
+            
+            logger.info(f"Execution {execution_id}: Node {node_id} completed")
+            execution_events.publish(execution_id, NODE_FINISHED, node_id=node_id, status="success")
+            
+            return result
+            
+        except ExecutionSuspended as e:
+            # Durable delay: the node completes with this output when resumed
+            self._suspended[node_id] = {
+                'resume_at': e.resume_at.isoformat(),
+                'output': e.output,
+            }
+            logger.info(f"Execution {execution_id}: Node {node_id} suspended until {e.resume_at.isoformat()}")
+            execution_events.publish(execution_id, NODE_FINISHED, node_id=node_id, status="waiting")
+            return SUSPENDED
+            
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"Execution {execution_id}: Node {node_id} failed - {error_msg}")
+            execution_events.publish(execution_id, NODE_FINISHED, node_id=node_id, status="failed", error=error_msg)
+            
+            # Log error
+            await self.logs.add(
+                node_id,
+                "error",
+                f"Node execution failed: {error_msg}"
+            )
+            
+            # Check if we should continue on error
+            if node_def.get('on_error') == 'continue':
+                logger.info(f"Execution {execution_id}: Continuing after error in node {node_id}")
+                return None
+            
+            raise ExecutionError(f"Node {node_id} execution failed: {error_msg}")
+    
+    async def _execute_pipeline(self, execution_id: UUID, head: int, semaphore: asyncio.Semaphore) -> Dict[int, Any]:
+        """
+        Run a stream producer together with the nodes consuming its records
+        
+        The whole pipeline holds one concurrency slot. Streams cannot be
+        replayed, so pipeline nodes are not retried and a failure of any of
+        them fails the pipeline; ``on_error: continue`` is honoured for the
+        node that failed, which then outputs None like the rest of the
+        pipeline. Outputs are checkpointed from the last node back to the
+        producer, so a resumed run that finds the producer finished finds
+        its consumers finished too.
+        
+        Args:
+            execution_id: Execution ID for logging
+            head: Plan index of the pipeline's first producer
+            semaphore: Per-execution concurrency limit
+        
+        Returns:
+            Output per plan index of every node in the pipeline
+        
+        Raises:
+            ExecutionError: If a node fails and is not marked ``on_error: continue``
+        """
+        plan = self.plan
+        members = (head,) + plan.pipelines[head]
+        
+        try:
+            async with semaphore:
+                logger.info(
+                    f"Execution {execution_id}: Executing pipeline of {len(members)} node(s) "
+                    f"from node {plan.node_ids[head]}"
+                )
+                for index in members:
+                    execution_events.publish(execution_id, NODE_STARTED, node_id=plan.node_ids[index], attempt=1)
+                
+                outputs = await run_pipeline(plan, head, self.execution_context, settings.STREAM_QUEUE_SIZE)
+                
+        except StreamNodeError as e:
+            error_msg = str(e)
+            logger.error(f"Execution {execution_id}: Node {e.node_id} failed in pipeline - {error_msg}")
+            
+            for index in members:
+                node_id = plan.node_ids[index]
+                failed = node_id == e.node_id
+                status = "failed" if failed else "cancelled"
+                execution_events.publish(execution_id, NODE_FINISHED, node_id=node_id, status=status, error=error_msg)
+            
+            await self.logs.add(
+                e.node_id,
+                "error",
+                f"Node execution failed: {error_msg}",
+                {"pipeline": [plan.node_ids[index] for index in members]}
+            )
+            
+            if plan.get_node(e.node_id).get('on_error') == 'continue':
+                logger.info(f"Execution {execution_id}: Continuing after error in node {e.node_id}")
+                return {index: None for index in members}
+            
+            raise ExecutionError(f"Node {e.node_id} execution failed: {error_msg}")
+        
+        for index in reversed(members):
+            node_id = plan.node_ids[index]
+            result = outputs.get(index)
+            
+            self.execution_context.set_node_output(node_id, result)
+            branch = branch_label(result.get('branch')) if isinstance(result, dict) else None
+            await self._db_call(AsyncExecutionService.save_node_checkpoint, execution_id, node_id, result, branch)
+        
+        for index in members:
+            node_id = plan.node_ids[index]
+            await self.logs.add(
+                node_id,
+                "info",
+                "Node executed successfully",
+                {"result": outputs.get(index)}
+            )
+            execution_events.publish(execution_id, NODE_FINISHED, node_id=node_id, status="success")
+        
+        logger.info(f"Execution {execution_id}: Pipeline from node {plan.node_ids[head]} completed")
+        return outputs
+    
+    async def _execute_with_retry(self, execution_id: UUID, index: int, semaphore: asyncio.Semaphore) -> tuple:
+        """
+        Run a node, retrying transient failures according to its retry policy
+        
+        The concurrency slot is released while waiting between attempts.
+        
+        Args:
+            execution_id: Execution ID for logging
+            index: Plan index of the node to execute
+            semaphore: Per-execution concurrency limit
+        
+        Returns:
+            Tuple of node output and number of attempts made
+        """
+        node_id = self.plan.node_ids[index]
+        executor = self.plan.executors[index]
+        policy = self.plan.retry_policies[index]
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            
+            try:
+                async with semaphore:
+                    logger.info(f"Execution {execution_id}: Executing node {node_id}")
+                    execution_events.publish(execution_id, NODE_STARTED, node_id=node_id, attempt=attempt)
+                    
+                    if executor is None:
+                        raise ExecutionError(self.plan.executor_errors[index])
+                    
+                    # Execute node
+                    result = await self.plan.execute_node(index, self.execution_context)
+                
+                policy.check_result(result)
+                return result, attempt
+                
+            except Exception as e:
+                if not policy.should_retry(e, attempt):
+                    raise
+                
+                delay = policy.backoff(attempt)
+                logger.warning(
+                    f"Execution {execution_id}: Node {node_id} attempt {attempt}/{policy.max_attempts} "
+                    f"failed - {str(e)}; retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
@@ -1,8 +1,11 @@
-from typing import Dict, Any
+from typing import Dict, Any, Set
 from workflows.nodes.base_node import BaseNode
 from workflows.nodes.http_node import HTTPRequestNode
 from workflows.nodes.delay_node import DelayNode
 from workflows.nodes.conditional_node import ConditionalNode
+from workflows.nodes.foreach_node import ForeachNode
+from workflows.nodes.transform_node import TransformNode
+from workflows.nodes.http_paginate_node import HTTPPaginateNode
 from utils.errors import NodeExecutionError
 
 
@@ -13,8 +16,14 @@ class NodeExecutorFactory:
         'http_request': HTTPRequestNode,
         'delay': DelayNode,
         'conditional': ConditionalNode,
+        'foreach': ForeachNode,
+        'transform': TransformNode,
+        'http_paginate': HTTPPaginateNode,
     }
     
+    # Types run in the worker's process pool unless a node sets "executor": "inline"
+    CPU_BOUND_TYPES: Set[str] = set()
+    
     @classmethod
     def create(cls, node_type: str, node_id: str, config: Dict[str, Any]) -> BaseNode:
         """
@@ -39,7 +48,24 @@ class NodeExecutorFactory:
         return node_class(node_id, config)
     
     @classmethod
-    def register_node_type(cls, node_type: str, node_class: type):
-        """Register a custom node type"""
+    def register_node_type(cls, node_type: str, node_class: type, cpu_bound: bool = False):
+        """
+        Register a custom node type
+        
+        Args:
+            node_type: Type name used in workflow definitions
+            node_class: Node class; must be importable by its module path to
+                run in the process pool
+            cpu_bound: Run nodes of this type in the worker's process pool
+                so they do not block the event loop
+        """
         cls.NODE_TYPES[node_type] = node_class
-
+        if cpu_bound:
+            cls.CPU_BOUND_TYPES.add(node_type)
+        else:
+            cls.CPU_BOUND_TYPES.discard(node_type)
+    
+    @classmethod
+    def is_cpu_bound(cls, node_type: str) -> bool:
+        """Check whether a node type was registered as CPU-bound"""
+        return node_type in cls.CPU_BOUND_TYPES
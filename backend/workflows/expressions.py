@@ -0,0 +1,541 @@
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+from functools import lru_cache
+import ast
+import operator
+from utils.errors import ValidationError
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional (pip install numpy); columns are then evaluated as Python lists
+    np = None
+
+# Largest integer power (in bits) and repeated string or list (in items)
+# an expression may build, so one record cannot pin the CPU or the memory
+MAX_POWER_BITS = 4096
+MAX_REPEAT_LENGTH = 1_000_000
+
+# Integer magnitudes NumPy handles exactly: int64 results, and integers
+# compared with floats (float64 represents every integer up to 2 ** 53)
+INT64_LIMIT = 2 ** 63
+FLOAT_EXACT_LIMIT = 2 ** 53
+
+
+def _multiply(left: Any, right: Any) -> Any:
+    """``*`` with a bound on repeated strings and lists"""
+    if isinstance(left, int) and isinstance(right, (str, list, tuple)):
+        left, right = right, left
+    if isinstance(left, (str, list, tuple)) and isinstance(right, int) and len(left) * right > MAX_REPEAT_LENGTH:
+        raise OverflowError(f"repeated value would exceed {MAX_REPEAT_LENGTH} items")
+    return left * right
+
+
+def _power(base: Any, exponent: Any) -> Any:
+    """``**`` with a bound on the size of integer results"""
+    if isinstance(base, int) and isinstance(exponent, int) and abs(base) > 1:
+        if exponent * (abs(base).bit_length() - 1) > MAX_POWER_BITS:
+            raise OverflowError(f"integer power would exceed {MAX_POWER_BITS} bits")
+    return base ** exponent
+
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _multiply,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _power,
+}
+
+COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+# Compiled expression node: columnar records -> result column
+Evaluator = Callable[["ColumnSet"], Any]
+
+
+class ColumnSet:
+    """
+    Columnar view of a list of records
+    
+    Columns are extracted from the records the first time an expression
+    reads them and cached, so each field is walked once per batch however
+    many expressions use it. With NumPy installed columns are arrays and
+    operators run vectorized; otherwise (or with ``vectorized=False``) they
+    are Python lists and every operator is one ``map`` over the column.
+    
+    Missing fields read as None, and None propagates the same way on both
+    paths: arithmetic with None gives None and ordering comparisons give
+    False. Columns holding None, strings or mixed values are object arrays,
+    which go through the same per-value operators as lists. Numeric arrays
+    only use NumPy's own operators where the result is the same as Python's
+    (see ``NATIVE_GUARDS``): integer arithmetic that could overflow int64,
+    a zero divisor, ``**`` and arithmetic on booleans run per value.
+    """
+    
+    def __init__(self, records: List[Dict[str, Any]], vectorized: Optional[bool] = None):
+        self.records = records
+        self.length = len(records)
+        self.vectorized = np is not None if vectorized is None else vectorized and np is not None
+        self._values: Dict[str, List[Any]] = {}
+        self._columns: Dict[str, Any] = {}
+    
+    def values(self, field: str) -> List[Any]:
+        """Get a field of every record as a Python list (None where missing)"""
+        column = self._values.get(field)
+        if column is None:
+            path = field.split('.')
+            if len(path) == 1:
+                try:
+                    column = list(map(operator.itemgetter(field), self.records))
+                except (KeyError, TypeError):
+                    # Missing fields read as None; non-dict items fail in get
+                    column = [record.get(field) for record in self.records]
+            else:
+                column = [_get_path(record, path) for record in self.records]
+            self._values[field] = column
+        return column
+    
+    def column(self, field: str) -> Any:
+        """Get a field as a column ready for vectorized operators"""
+        column = self._columns.get(field)
+        if column is None:
+            values = self.values(field)
+            column = _to_array(values) if self.vectorized else values
+            self._columns[field] = column
+        return column
+    
+    def constant(self, value: Any) -> Any:
+        """Turn a literal into an operand; arrays broadcast scalars themselves"""
+        if self.vectorized:
+            return value
+        return [value] * self.length
+    
+    def apply(self, function: Callable[..., Any], *columns: Any, native: Optional[Callable[..., bool]] = None) -> Any:
+        """
+        Apply an elementwise operator to columns
+        
+        Args:
+            function: Operator, taking one value of each column
+            columns: Operand columns or constants
+            native: Tells whether NumPy applying ``function`` to whole numeric
+                columns gives the same result as applying it per value;
+                without it the operator always runs per value
+        
+        Returns:
+            Result column
+        """
+        if self.vectorized:
+            if native is not None and all(map(_is_numeric, columns)) and native(*columns):
+                return function(*columns)
+            return np.frompyfunc(function, len(columns), 1)(*columns)
+        return list(map(function, *columns))
+    
+    def divide(self, left: Any, right: Any) -> Any:
+        """True division; a zero divisor gives None (NaN in float arrays)"""
+        if self.vectorized:
+            if _is_numeric(left) and _is_numeric(right) and _native_true_division(left, right):
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    return np.true_divide(left, right)
+            return _object_divide(left, right)
+        return list(map(_safe_divide, left, right))
+    
+    def logical_and(self, left: Any, right: Any) -> Any:
+        """Elementwise ``and``"""
+        if self.vectorized:
+            return np.logical_and(left, right)
+        return [bool(a and b) for a, b in zip(left, right)]
+    
+    def logical_or(self, left: Any, right: Any) -> Any:
+        """Elementwise ``or``"""
+        if self.vectorized:
+            return np.logical_or(left, right)
+        return [bool(a or b) for a, b in zip(left, right)]
+    
+    def logical_not(self, value: Any) -> Any:
+        """Elementwise ``not``"""
+        if self.vectorized:
+            return np.logical_not(value)
+        return [not v for v in value]
+    
+    def to_list(self, column: Any) -> List[Any]:
+        """
+        Convert a result column to plain Python values
+        
+        NaN and infinities (e.g. from a division by zero) become None, as
+        they have no JSON representation.
+        """
+        if not self.vectorized:
+            return [_finite_or_none(value) for value in column]
+        
+        column = np.asarray(column)
+        if column.ndim == 0:
+            column = np.full(self.length, column.item(), dtype=column.dtype)
+        if column.dtype.kind == 'f' and not np.isfinite(column).all():
+            return [value if value == value and abs(value) != float('inf') else None for value in column.tolist()]
+        if column.dtype.kind == 'O':
+            return [_finite_or_none(value) for value in column.tolist()]
+        return column.tolist()
+    
+    def select(self, indexes: Any) -> "ColumnSet":
+        """
+        Restrict the view to some rows
+        
+        Columns already extracted are sliced rather than read again from
+        the records, so a projection after a filter only walks kept rows.
+        """
+        if self.vectorized:
+            indexes = np.asarray(indexes, dtype=np.intp)
+            positions = indexes.tolist()
+        else:
+            positions = indexes
+        
+        selected = ColumnSet([self.records[i] for i in positions], self.vectorized)
+        for field, values in self._values.items():
+            selected._values[field] = [values[i] for i in positions]
+        for field, column in self._columns.items():
+            if isinstance(column, list):
+                selected._columns[field] = selected._values[field]
+            else:
+                selected._columns[field] = column[indexes]
+        return selected
+    
+    def mask_indexes(self, mask: Any) -> Any:
+        """Positions where a filter column is true"""
+        if self.vectorized:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.ndim == 0:
+                # Constant filter
+                return np.arange(self.length) if mask else np.arange(0)
+            return np.flatnonzero(mask)
+        return [i for i, keep in enumerate(mask) if keep]
+
+
+class ColumnExpression:
+    """
+    Arithmetic, comparison and boolean expression over record fields
+    
+    Expressions use Python syntax restricted to field names (dotted paths
+    reach into nested objects), literals, ``+ - * / // % **``, comparisons,
+    ``and``/``or``/``not`` and parentheses, e.g.
+    ``amount * (1 + tax_rate) > 100 and status == 'paid'``. The expression
+    is parsed and checked once; evaluation works on whole columns. Integer
+    powers and repeated strings or lists are capped (``MAX_POWER_BITS``,
+    ``MAX_REPEAT_LENGTH``) and fail with ``OverflowError`` beyond that.
+    """
+    
+    def __init__(self, source: str):
+        self.source = source
+        try:
+            tree = ast.parse(source.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValidationError(f"Invalid expression '{source}': {e.msg}")
+        
+        fields = set()
+        self._evaluate = _compile_node(tree.body, source, fields)
+        self.fields: FrozenSet[str] = frozenset(fields)
+        
+        # Bare field references are copied without converting the column
+        self.field: Optional[str] = _field_path(tree.body)
+    
+    def evaluate(self, columns: ColumnSet) -> Any:
+        """
+        Evaluate the expression for every row
+        
+        Args:
+            columns: Columnar view of the records
+        
+        Returns:
+            Result column (array or list, one value per record)
+        """
+        return self._evaluate(columns)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str) -> ColumnExpression:
+    """
+    Compile an expression over record fields
+    
+    Args:
+        source: Expression text
+    
+    Returns:
+        Compiled expression
+    
+    Raises:
+        ValidationError: If the expression is malformed or uses unsupported syntax
+    """
+    return ColumnExpression(source)
+
+
+def record_builder(names: List[str]) -> Callable[..., Dict[str, Any]]:
+    """
+    Build a function turning one value per name into a record
+    
+    ``map(record_builder(names), *columns)`` assembles output records about
+    twice as fast as ``dict(zip(names, row))``: the function is compiled
+    from a dict display with the names as constant keys. It is generated as
+    an AST, so names never pass through source text.
+    
+    Args:
+        names: Output field names
+    
+    Returns:
+        Function taking ``len(names)`` positional values
+    """
+    params = [f'_{i}' for i in range(len(names))]
+    function = ast.Lambda(
+        args=ast.arguments(
+            posonlyargs=[], args=[ast.arg(arg=param) for param in params],
+            kwonlyargs=[], kw_defaults=[], defaults=[],
+        ),
+        body=ast.Dict(
+            keys=[ast.Constant(name) for name in names],
+            values=[ast.Name(id=param, ctx=ast.Load()) for param in params],
+        ),
+    )
+    tree = ast.fix_missing_locations(ast.Expression(body=function))
+    return eval(compile(tree, '<record_builder>', 'eval'), {})
+
+
+def _compile_node(node: ast.AST, source: str, fields: set) -> Evaluator:
+    """Turn one AST node into a closure over a ColumnSet"""
+    field = _field_path(node)
+    if field is not None:
+        fields.add(field)
+        return lambda columns: columns.column(field)
+    
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool, type(None))):
+        value = node.value
+        return lambda columns: columns.constant(value)
+    
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        function = _propagate_none(BINARY_OPERATORS[type(node.op)])
+        native = NATIVE_GUARDS.get(BINARY_OPERATORS[type(node.op)])
+        left = _compile_node(node.left, source, fields)
+        right = _compile_node(node.right, source, fields)
+        if isinstance(node.op, ast.Div):
+            return lambda columns: columns.divide(left(columns), right(columns))
+        return lambda columns: columns.apply(function, left(columns), right(columns), native=native)
+    
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd, ast.Not)):
+        operand = _compile_node(node.operand, source, fields)
+        if isinstance(node.op, ast.Not):
+            return lambda columns: columns.logical_not(operand(columns))
+        unary = operator.neg if isinstance(node.op, ast.USub) else operator.pos
+        function = _propagate_none(unary)
+        return lambda columns: columns.apply(function, operand(columns), native=NATIVE_GUARDS[unary])
+    
+    if isinstance(node, ast.Compare) and all(type(op) in COMPARE_OPERATORS for op in node.ops):
+        operands = [_compile_node(node.left, source, fields)]
+        operands += [_compile_node(comparator, source, fields) for comparator in node.comparators]
+        functions = [_none_compares_false(COMPARE_OPERATORS[type(op)]) for op in node.ops]
+        
+        def compare(columns: ColumnSet) -> Any:
+            # a < b < c is (a < b) and (b < c)
+            values = [operand(columns) for operand in operands]
+            result = columns.apply(functions[0], values[0], values[1], native=_native_comparison)
+            for i in range(1, len(functions)):
+                result = columns.logical_and(
+                    result,
+                    columns.apply(functions[i], values[i], values[i + 1], native=_native_comparison),
+                )
+            return result
+        
+        return compare
+    
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile_node(value, source, fields) for value in node.values]
+        combine = 'logical_and' if isinstance(node.op, ast.And) else 'logical_or'
+        
+        def boolean(columns: ColumnSet) -> Any:
+            result = operands[0](columns)
+            for operand in operands[1:]:
+                result = getattr(columns, combine)(result, operand(columns))
+            return result
+        
+        return boolean
+    
+    raise ValidationError(f"Unsupported syntax in expression '{source}': {type(node).__name__}")
+
+
+def _field_path(node: ast.AST) -> Optional[str]:
+    """Dotted field path for names and attribute chains, None otherwise"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def _get_path(record: Any, path: List[str]) -> Any:
+    """Read a nested field, None if any level is missing"""
+    for part in path:
+        if not isinstance(record, dict):
+            return None
+        record = record.get(part)
+    return record
+
+
+def _to_array(values: List[Any]) -> Any:
+    """Build a 1-D array, keeping strings, mixed and nested values as Python objects"""
+    sample = next((value for value in values if value is not None), None)
+    
+    # Only all-numeric columns get a native dtype: NumPy would turn [1, 'a']
+    # into strings and nested lists into 2-D arrays, and converting strings
+    # to fixed-width arrays costs more than comparing them as objects
+    if isinstance(sample, (int, float)):
+        try:
+            array = np.asarray(values)
+        except (ValueError, TypeError):
+            array = None
+        if array is not None and array.ndim == 1 and array.dtype.kind in 'biuf':
+            return array
+    
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _is_numeric(column: Any) -> bool:
+    """Whether NumPy can apply an operator to a column or constant natively"""
+    if isinstance(column, np.ndarray):
+        return column.dtype.kind in 'biuf'
+    return isinstance(column, (int, float, np.number, np.bool_))
+
+
+def _is_bool(operand: Any) -> bool:
+    """Whether a numeric column or constant is boolean"""
+    if isinstance(operand, np.ndarray):
+        return operand.dtype.kind == 'b'
+    return isinstance(operand, (bool, np.bool_))
+
+
+def _magnitude(operand: Any) -> Optional[int]:
+    """Largest absolute value of an integer column or constant, None for floats"""
+    if isinstance(operand, np.ndarray):
+        if operand.dtype.kind == 'f':
+            return None
+        if operand.size == 0:
+            return 0
+        # In Python ints, as abs() of the smallest int64 overflows
+        return max(-int(operand.min()), int(operand.max()))
+    if isinstance(operand, (float, np.floating)):
+        return None
+    return abs(int(operand))
+
+
+def _native_sum(left: Any, right: Any) -> bool:
+    """``+`` and ``-``: not on booleans, and integer results must fit int64"""
+    if _is_bool(left) or _is_bool(right):
+        return False
+    magnitudes = (_magnitude(left), _magnitude(right))
+    return None in magnitudes or sum(magnitudes) < INT64_LIMIT
+
+
+def _native_product(left: Any, right: Any) -> bool:
+    """``*``: not on booleans, and integer results must fit int64"""
+    if _is_bool(left) or _is_bool(right):
+        return False
+    left_magnitude, right_magnitude = _magnitude(left), _magnitude(right)
+    return left_magnitude is None or right_magnitude is None or left_magnitude * right_magnitude < INT64_LIMIT
+
+
+def _native_division(left: Any, right: Any) -> bool:
+    """``//`` and ``%``: not on booleans or by zero, which Python rejects"""
+    if _is_bool(left) or _is_bool(right) or np.any(right == 0):
+        return False
+    magnitudes = (_magnitude(left), _magnitude(right))
+    # The only int64 overflow, the smallest int64 // -1, is excluded here
+    return None in magnitudes or max(magnitudes) < INT64_LIMIT
+
+
+def _native_true_division(left: Any, right: Any) -> bool:
+    """``/``: NumPy divides integers as floats, Python exactly"""
+    magnitudes = (_magnitude(left), _magnitude(right))
+    return None in magnitudes or max(magnitudes) <= FLOAT_EXACT_LIMIT
+
+
+def _native_sign(operand: Any) -> bool:
+    """Unary ``-`` and ``+``: not on booleans or the smallest int64"""
+    if _is_bool(operand):
+        return False
+    magnitude = _magnitude(operand)
+    return magnitude is None or magnitude < INT64_LIMIT
+
+
+def _native_comparison(left: Any, right: Any) -> bool:
+    """Comparisons: NumPy compares integers with floats as floats"""
+    magnitudes = (_magnitude(left), _magnitude(right))
+    if None not in magnitudes or magnitudes == (None, None):
+        return True
+    return max(magnitude for magnitude in magnitudes if magnitude is not None) <= FLOAT_EXACT_LIMIT
+
+
+# When NumPy's operators match the per-value ones on numeric operands;
+# ``**`` is missing on purpose (negative integer exponents, overflow and
+# fractional powers of negative numbers all differ), so it runs per value
+NATIVE_GUARDS: Dict[Callable[..., Any], Callable[..., bool]] = {
+    operator.add: _native_sum,
+    operator.sub: _native_sum,
+    _multiply: _native_product,
+    operator.floordiv: _native_division,
+    operator.mod: _native_division,
+    operator.neg: _native_sign,
+    operator.pos: _native_sign,
+}
+
+
+def _propagate_none(function: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an arithmetic operator to give None if any operand is None"""
+    def apply(*operands: Any) -> Any:
+        for operand in operands:
+            if operand is None:
+                return None
+        return function(*operands)
+    return apply
+
+
+def _none_compares_false(function: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+    """Wrap an ordering comparison to give False if an operand is None"""
+    if function in (operator.eq, operator.ne):
+        # Equality is defined for None, so ``field == None`` finds missing fields
+        return function
+    
+    def compare(left: Any, right: Any) -> Any:
+        if left is None or right is None:
+            return False
+        return function(left, right)
+    return compare
+
+
+def _object_divide(left: Any, right: Any) -> Any:
+    """``_safe_divide`` over object arrays, so the result matches the list path"""
+    return np.frompyfunc(_safe_divide, 2, 1)(left, right)
+
+
+def _safe_divide(left: Any, right: Any) -> Any:
+    """Divide two values, None if either is None or the divisor is zero"""
+    if left is None or right is None:
+        return None
+    try:
+        return left / right
+    except ZeroDivisionError:
+        return None
+
+
+def _finite_or_none(value: Any) -> Any:
+    """Replace NaN and infinities with None"""
+    if isinstance(value, float) and (value != value or abs(value) == float('inf')):
+        return None
+    return value
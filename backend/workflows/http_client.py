@@ -0,0 +1,96 @@
+from typing import Dict, Optional, Tuple
+import asyncio
+import httpx
+from core.config import settings
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class HTTPClientRegistry:
+    """
+    Worker-wide registry of pooled ``httpx.AsyncClient`` instances
+    
+    Clients are keyed by the settings that cannot change per request
+    (TLS verification, client certificate, proxy), so nodes sharing those
+    settings share one connection pool, TLS sessions and keep-alive
+    connections. Clients are bound to the event loop they were created on.
+    """
+    
+    def __init__(self):
+        self._clients: Dict[Tuple, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def get_client(
+        self,
+        verify: bool = True,
+        cert: Optional[str] = None,
+        proxy: Optional[str] = None,
+    ) -> httpx.AsyncClient:
+        """
+        Get the pooled client for a TLS/proxy configuration
+        
+        Args:
+            verify: Verify TLS certificates
+            cert: Path to a client certificate
+            proxy: Proxy URL
+        
+        Returns:
+            Shared async HTTP client
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._clients:
+                # Clients from a previous loop cannot be used or closed here
+                logger.warning("HTTP client registry: discarding clients bound to a previous event loop")
+                self._clients = {}
+            self._loop = loop
+        
+        key = (verify, cert, proxy)
+        client = self._clients.get(key)
+        
+        if client is None or client.is_closed:
+            client = self._create_client(verify, cert, proxy)
+            self._clients[key] = client
+        
+        return client
+    
+    async def aclose(self) -> None:
+        """Close all pooled clients"""
+        clients, self._clients = list(self._clients.values()), {}
+        self._loop = None
+        
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"HTTP client registry: error closing client - {str(e)}")
+    
+    @staticmethod
+    def _create_client(verify: bool, cert: Optional[str], proxy: Optional[str]) -> httpx.AsyncClient:
+        """Create a client with the configured pool limits"""
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        )
+        options = {
+            'limits': limits,
+            'verify': verify,
+            'cert': cert,
+            'proxies': proxy,
+            'timeout': settings.HTTP_CLIENT_DEFAULT_TIMEOUT,
+        }
+        
+        if settings.HTTP_CLIENT_HTTP2:
+            try:
+                return httpx.AsyncClient(http2=True, **options)
+            except ImportError:
+                # HTTP/2 needs the optional h2 package (pip install httpx[http2])
+                logger.warning("HTTP client registry: h2 is not installed, falling back to HTTP/1.1")
+        
+        return httpx.AsyncClient(**options)
+
+
+# Per-process registry shared by all HTTP nodes in a worker
+http_clients = HTTPClientRegistry()
@@ -2,11 +2,17 @@ from workflows.nodes.base_node import BaseNode
 from workflows.nodes.http_node import HTTPRequestNode
 from workflows.nodes.delay_node import DelayNode
 from workflows.nodes.conditional_node import ConditionalNode
+from workflows.nodes.foreach_node import ForeachNode
+from workflows.nodes.transform_node import TransformNode
+from workflows.nodes.http_paginate_node import HTTPPaginateNode
 
 __all__ = [
     "BaseNode",
     "HTTPRequestNode",
     "DelayNode",
     "ConditionalNode",
+    "ForeachNode",
+    "TransformNode",
+    "HTTPPaginateNode",
 ]
 
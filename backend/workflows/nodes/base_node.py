@@ -1,14 +1,34 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional
 from workflows.context import ExecutionContext
+from workflows.templates import compile_config
 
 
 class BaseNode(ABC):
     """Abstract base class for all workflow nodes"""
     
+    # Set to False in nodes that read other nodes' outputs in ways other than
+    # {{node_x...}} references in their config; this keeps all outputs alive
+    declares_inputs = True
+    
+    # Streaming protocol: nodes that produce a stream implement ``stream``,
+    # nodes that only consume one implement ``consume``. The engine runs a
+    # producer and its consuming successors as one pipeline (see
+    # ``workflows.streaming``)
+    produces_stream = False
+    consumes_stream = False
+    
     def __init__(self, node_id: str, config: Dict[str, Any]):
         self.node_id = node_id
         self.config = config
+        
+        # Parse {{...}} expressions once; executors are reused across executions
+        self._config_template = compile_config(config)
+    
+    @property
+    def input_references(self) -> FrozenSet[str]:
+        """IDs of nodes whose output this node reads through its config"""
+        return self._config_template.references
     
     @abstractmethod
     async def execute(self, context: ExecutionContext) -> Any:
@@ -43,5 +63,36 @@ class BaseNode(ABC):
         Returns:
             Config with resolved variables
         """
-        return context.resolve_dict_variables(self.config)
-
+        return self._config_template.render(context)
+    
+    async def stream(
+        self,
+        context: ExecutionContext,
+        upstream: Optional[AsyncIterator[List[Any]]],
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Yield record batches (for nodes with ``produces_stream``)
+        
+        Args:
+            context: Execution context
+            upstream: Batches of the predecessor if the node also has
+                ``consumes_stream``, otherwise None
+        
+        Returns:
+            Async iterator of record lists
+        """
+        raise NotImplementedError(f"Node {self.node_id} does not produce a stream")
+        yield  # Makes this an async generator like the overrides
+    
+    async def consume(self, context: ExecutionContext, upstream: AsyncIterator[List[Any]]) -> Any:
+        """
+        Read the predecessor's record batches (for sinks with ``consumes_stream``)
+        
+        Args:
+            context: Execution context
+            upstream: Batches of the predecessor
+        
+        Returns:
+            Output data from this node
+        """
+        raise NotImplementedError(f"Node {self.node_id} does not consume a stream")
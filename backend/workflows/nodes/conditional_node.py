@@ -1,10 +1,23 @@
 from typing import Any, Dict
+import operator
 from workflows.nodes.base_node import BaseNode
 from workflows.context import ExecutionContext
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Built once per process rather than on every evaluation
+CONDITION_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    'contains': lambda a, b: b in str(a),
+    'in': lambda a, b: a in str(b),
+}
+
 
 class ConditionalNode(BaseNode):
     """Node for conditional logic (if/else)"""
@@ -44,19 +57,9 @@ class ConditionalNode(BaseNode):
     
     def _evaluate(self, left: Any, operator: str, right: Any) -> bool:
         """Evaluate condition"""
-        operators = {
-            '==': lambda a, b: a == b,
-            '!=': lambda a, b: a != b,
-            '>': lambda a, b: a > b,
-            '<': lambda a, b: a < b,
-            '>=': lambda a, b: a >= b,
-            '<=': lambda a, b: a <= b,
-            'contains': lambda a, b: b in str(a),
-            'in': lambda a, b: a in str(b),
-        }
-        
-        if operator not in operators:
+        function = CONDITION_OPERATORS.get(operator)
+        if function is None:
             raise ValueError(f"Unknown operator: {operator}")
         
-        return operators[operator](left, right)
+        return function(left, right)
 
@@ -1,17 +1,32 @@
 from typing import Any, Dict
+from datetime import datetime, timedelta
 import asyncio
+from core.config import settings
 from workflows.nodes.base_node import BaseNode
 from workflows.context import ExecutionContext
+from utils.errors import ExecutionSuspended
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
 class DelayNode(BaseNode):
-    """Node for delaying execution"""
+    """
+    Node for delaying execution
+    
+    Short delays sleep in the worker. Delays of at least
+    ``DURABLE_DELAY_THRESHOLD_SECONDS`` suspend the execution instead, so
+    that no worker slot is held while waiting; the execution is
+    checkpointed and resumed by a task scheduled for the resume time.
+    """
     
     async def execute(self, context: ExecutionContext) -> Any:
-        """Execute delay"""
+        """
+        Execute delay
+        
+        Raises:
+            ExecutionSuspended: If the delay is long enough to be durable
+        """
         try:
             # Resolve variables in config
             resolved_config = self.resolve_config_variables(context)
@@ -22,18 +37,30 @@ class DelayNode(BaseNode):
             if delay_seconds < 0:
                 raise ValueError("Delay must be non-negative")
             
+            result = {
+                'delayed_seconds': delay_seconds,
+            }
+            
+            if delay_seconds >= settings.DURABLE_DELAY_THRESHOLD_SECONDS:
+                resume_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
+                logger.info(f"Node {self.node_id}: Suspending execution until {resume_at.isoformat()}")
+                raise ExecutionSuspended(
+                    f"Node {self.node_id} delays execution for {delay_seconds} seconds",
+                    resume_at=resume_at,
+                    output=result,
+                )
+            
             logger.info(f"Node {self.node_id}: Delaying for {delay_seconds} seconds")
             
             # Sleep for specified duration
             await asyncio.sleep(delay_seconds)
             
-            result = {
-                'delayed_seconds': delay_seconds,
-            }
-            
             logger.info(f"Node {self.node_id}: Delay completed")
             return result
             
+        except ExecutionSuspended:
+            raise
+            
         except Exception as e:
             logger.error(f"Node {self.node_id}: Delay failed - {str(e)}")
             raise
@@ -0,0 +1,227 @@
+from typing import Any, Dict, FrozenSet, List
+import asyncio
+import time
+from core.config import settings
+from workflows.nodes.base_node import BaseNode
+from workflows.context import ExecutionContext
+from workflows.templates import compile_reference
+from utils.errors import ExecutionSuspended, NodeExecutionError, ValidationError
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Errors kept in the output when on_item_error is "continue"; counters cover all
+MAX_REPORTED_ERRORS = 100
+
+
+class ForeachNode(BaseNode):
+    """
+    Node running a nested subgraph once per item of a list
+    
+    Config::
+        
+        {
+            "items": "{{node_1.body.items}}",
+            "concurrency": 5,
+            "nodes": [...],
+            "edges": [...],
+            "output_node": "node_fetch",
+            "on_item_error": "fail"
+        }
+    
+    Inside the subgraph the current item and its position are the global
+    variables ``item`` and ``item_index`` (``{{item.id}}``), and outputs of
+    outer nodes can be referenced as usual. Up to ``concurrency`` items run
+    at once. The output lists the ``output_node`` result of every item in
+    the order of ``items``, whatever order they finish in; by default the
+    last node of the subgraph provides it. With ``on_item_error: continue``
+    failed items yield None and are reported under ``errors`` instead of
+    failing the node.
+    
+    Child nodes write no execution log rows; progress is logged as counters
+    and the node's own log row carries the totals.
+    """
+    
+    def __init__(self, node_id: str, config: Dict[str, Any]):
+        super().__init__(node_id, config)
+        
+        # Imported here: the plan module imports the node registry
+        from workflows.plan import ExecutionPlan
+        
+        try:
+            self._plan = ExecutionPlan({
+                'nodes': config.get('nodes', []),
+                'edges': config.get('edges', []),
+            })
+        except ValidationError as e:
+            raise NodeExecutionError(f"Node {node_id}: invalid foreach subgraph - {str(e)}")
+        
+        self._items_template = compile_reference(config.get('items'))
+        self._output_index = self._plan.index.get(config.get('output_node'), len(self._plan) - 1)
+        
+        # Outer outputs read by child nodes are copied into each item's context
+        child_ids = set(self._plan.node_ids)
+        self._outer_references: FrozenSet[str] = frozenset(
+            node_id
+            for executor in self._plan.executors if executor is not None
+            for node_id in executor.input_references
+            if node_id not in child_ids
+        )
+    
+    @property
+    def input_references(self) -> FrozenSet[str]:
+        """IDs of outer nodes whose output the item list or the subgraph reads"""
+        return self._items_template.references | self._outer_references
+    
+    async def execute(self, context: ExecutionContext) -> Any:
+        """
+        Run the subgraph for every item
+        
+        Raises:
+            NodeExecutionError: If the items are not a list or an item fails
+                with ``on_item_error: fail``
+        """
+        items = self._items_template.render(context)
+        if items is None:
+            items = []
+        if not isinstance(items, list):
+            raise NodeExecutionError(f"Node {self.node_id}: 'items' must resolve to a list, got {type(items).__name__}")
+        if len(items) > settings.FOREACH_MAX_ITEMS:
+            raise NodeExecutionError(
+                f"Node {self.node_id}: {len(items)} items exceed the limit of {settings.FOREACH_MAX_ITEMS}"
+            )
+        
+        concurrency = max(1, int(self.config.get('concurrency', settings.FOREACH_DEFAULT_CONCURRENCY)))
+        continue_on_error = self.config.get('on_item_error', 'fail') == 'continue'
+        
+        results: List[Any] = [None] * len(items)
+        errors: List[Dict[str, Any]] = []
+        progress = {'succeeded': 0, 'failed': 0, 'logged_at': time.monotonic()}
+        pending = iter(enumerate(items))
+        
+        logger.info(f"Node {self.node_id}: Processing {len(items)} item(s), {concurrency} at a time")
+        
+        async def worker() -> None:
+            # Workers pull the next item, so only `concurrency` runs exist at once
+            for index, item in pending:
+                try:
+                    results[index] = await self._run_item(context, index, item)
+                    progress['succeeded'] += 1
+                except Exception as e:
+                    if not continue_on_error:
+                        raise NodeExecutionError(f"Node {self.node_id}: item {index} failed - {str(e)}")
+                    progress['failed'] += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({'index': index, 'error': str(e)})
+                
+                self._log_progress(progress, len(items))
+        
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(items)))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # Stop the other items when one fails or the node is cancelled
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        logger.info(
+            f"Node {self.node_id}: Processed {len(items)} item(s), "
+            f"{progress['succeeded']} succeeded, {progress['failed']} failed"
+        )
+        
+        return {
+            'results': results,
+            'total': len(items),
+            'succeeded': progress['succeeded'],
+            'failed': progress['failed'],
+            'errors': errors,
+        }
+    
+    def validate_config(self) -> bool:
+        """Validate foreach node configuration"""
+        if 'items' not in self.config or not self.config.get('nodes'):
+            return False
+        
+        output_node = self.config.get('output_node')
+        if output_node is not None and output_node not in self._plan.index:
+            return False
+        
+        try:
+            return int(self.config.get('concurrency', 1)) >= 1
+        except (TypeError, ValueError):
+            return False
+    
+    async def _run_item(self, context: ExecutionContext, index: int, item: Any) -> Any:
+        """
+        Run the subgraph for one item
+        
+        Nodes run one after another in topological order; ``when`` edges
+        prune branches as in the engine, and a child node marked
+        ``on_error: continue`` yields None instead of failing the item.
+        
+        Returns:
+            Output of the subgraph's output node, None if it was skipped
+        """
+        # Imported here: the plan module imports the node registry
+        from workflows.plan import branch_label
+        
+        plan = self._plan
+        item_context = context.fork(self._outer_references, {'item': item, 'item_index': index})
+        reachable = [not predecessors for predecessors in plan.predecessors]
+        
+        for i, node_id in enumerate(plan.node_ids):
+            if not reachable[i]:
+                continue
+            
+            try:
+                result = await self._run_child(item_context, i)
+            except Exception:
+                if plan.nodes[i].get('on_error') != 'continue':
+                    raise
+                result = None
+            
+            item_context.set_node_output(node_id, result)
+            
+            branch = branch_label(result.get('branch')) if isinstance(result, dict) else None
+            for neighbor, label in zip(plan.successors[i], plan.edge_labels[i]):
+                if label is None or label == branch:
+                    reachable[neighbor] = True
+        
+        return item_context.get_node_output(plan.node_ids[self._output_index])
+    
+    async def _run_child(self, context: ExecutionContext, index: int) -> Any:
+        """Run one child node, retrying transient failures per its retry policy"""
+        executor = self._plan.executors[index]
+        if executor is None:
+            raise NodeExecutionError(self._plan.executor_errors[index])
+        
+        policy = self._plan.retry_policies[index]
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            try:
+                result = await self._plan.execute_node(index, context)
+                policy.check_result(result)
+                return result
+            except ExecutionSuspended:
+                # Items cannot be checkpointed one by one
+                raise NodeExecutionError(f"Node {executor.node_id}: durable delays are not supported inside foreach")
+            except Exception as e:
+                if not policy.should_retry(e, attempt):
+                    raise
+                await asyncio.sleep(policy.backoff(attempt))
+    
+    def _log_progress(self, progress: Dict[str, Any], total: int) -> None:
+        """Log aggregated counters at most every FOREACH_PROGRESS_INTERVAL_SECONDS"""
+        now = time.monotonic()
+        if now - progress['logged_at'] < settings.FOREACH_PROGRESS_INTERVAL_SECONDS:
+            return
+        
+        progress['logged_at'] = now
+        done = progress['succeeded'] + progress['failed']
+        logger.info(
+            f"Node {self.node_id}: {done}/{total} item(s) done, "
+            f"{progress['succeeded']} succeeded, {progress['failed']} failed"
+        )
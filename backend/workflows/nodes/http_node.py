@@ -1,7 +1,11 @@
 from typing import Any, Dict
+from urllib.parse import urlsplit
 import httpx
 from workflows.nodes.base_node import BaseNode
 from workflows.context import ExecutionContext
+from workflows.http_client import http_clients
+from workflows.resilience import circuit_breakers
+from utils.errors import RetryableError
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -28,14 +32,14 @@ class HTTPRequestNode(BaseNode):
             
             logger.info(f"Node {self.node_id}: Making {method} request to {url}")
             
-            # Make HTTP request
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=body if body else None,
-                )
+            response = await self._send(
+                resolved_config,
+                method=method,
+                url=url,
+                headers=headers,
+                json=body if body else None,
+                timeout=timeout,
+            )
             
             # Parse response
             try:
@@ -56,6 +60,50 @@ class HTTPRequestNode(BaseNode):
             logger.error(f"Node {self.node_id}: HTTP request failed - {str(e)}")
             raise
     
+    async def _send(self, resolved_config: Dict[str, Any], method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request on the worker's pooled client, through the host's circuit breaker
+        
+        Args:
+            resolved_config: Config with resolved variables, for the TLS and proxy settings
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed on to ``httpx.AsyncClient.request``
+        
+        Returns:
+            HTTP response
+        
+        Raises:
+            RetryableError: On connection errors and timeouts
+        """
+        client = http_clients.get_client(
+            verify=resolved_config.get('verify_ssl', True),
+            cert=resolved_config.get('client_cert'),
+            proxy=resolved_config.get('proxy'),
+        )
+        
+        # Fail fast, before taking a connection, while the host is down.
+        # Nothing between here and the try may raise, or a half-open
+        # breaker would keep its trial call forever
+        breaker = circuit_breakers.get(urlsplit(url).netloc)
+        breaker.before_call()
+        try:
+            response = await client.request(method=method, url=url, **kwargs)
+        except httpx.TransportError as e:
+            # Connection errors and timeouts are transient
+            breaker.record_failure()
+            raise RetryableError(f"{e.__class__.__name__}: {str(e)}") from e
+        except BaseException:
+            breaker.release()
+            raise
+        
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        
+        return response
+    
     def validate_config(self) -> bool:
         """Validate HTTP node configuration"""
         required = ['method', 'url']
@@ -0,0 +1,134 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from workflows.nodes.base_node import BaseNode
+from workflows.context import ExecutionContext
+from workflows.expressions import ColumnExpression, ColumnSet, compile_expression, record_builder
+from workflows.templates import compile_reference
+from utils.errors import NodeExecutionError, ValidationError
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TransformNode(BaseNode):
+    """
+    Node filtering and projecting a list of records
+    
+    Config::
+        
+        {
+            "items": "{{node_1.body.orders}}",
+            "filter": "amount > 100 and status == 'paid'",
+            "fields": {
+                "id": "id",
+                "total": "amount * (1 + tax_rate)",
+                "country": "customer.country"
+            }
+        }
+    
+    ``filter`` keeps the records for which it is true; ``fields`` maps each
+    output field to an expression (see ``ColumnExpression``). Without
+    ``fields`` the kept records are returned unchanged. Expressions are
+    compiled once and evaluated over columns of the whole list (vectorized
+    with NumPy if it is installed) rather than record by record.
+    
+    With ``"stream": true`` the node transforms the record stream of its
+    predecessor batch by batch instead of reading ``items``.
+    """
+    
+    def __init__(self, node_id: str, config: Dict[str, Any]):
+        super().__init__(node_id, config)
+        
+        try:
+            self._filter: Optional[ColumnExpression] = (
+                compile_expression(config['filter']) if config.get('filter') else None
+            )
+            self._fields: List[Tuple[str, ColumnExpression]] = [
+                (name, compile_expression(expression))
+                for name, expression in (config.get('fields') or {}).items()
+            ]
+        except (ValidationError, AttributeError) as e:
+            raise NodeExecutionError(f"Node {node_id}: {str(e)}")
+        self._build_record = record_builder([name for name, _ in self._fields])
+        
+        self._items_template = compile_reference(config.get('items'))
+        
+        # Streaming is chosen per node, so the protocol flags are set here
+        self.produces_stream = self.consumes_stream = bool(config.get('stream'))
+    
+    async def execute(self, context: ExecutionContext) -> Any:
+        """
+        Transform the configured list of records
+        
+        Raises:
+            NodeExecutionError: If the items are not a list of records or an
+                expression cannot be evaluated on them
+        """
+        records = self._items_template.render(context)
+        if records is None:
+            records = []
+        if not isinstance(records, list):
+            raise NodeExecutionError(f"Node {self.node_id}: 'items' must resolve to a list, got {type(records).__name__}")
+        
+        result = self.transform(records)
+        
+        logger.info(f"Node {self.node_id}: Kept {len(result)} of {len(records)} record(s)")
+        return {
+            'records': result,
+            'count': len(result),
+            'input_count': len(records),
+        }
+    
+    async def stream(
+        self,
+        context: ExecutionContext,
+        upstream: Optional[AsyncIterator[List[Any]]],
+    ) -> AsyncIterator[List[Any]]:
+        """Transform each batch of the predecessor's stream"""
+        async for batch in upstream:
+            result = self.transform(batch)
+            if result:
+                yield result
+    
+    def validate_config(self) -> bool:
+        """Validate transform node configuration"""
+        if not self.config.get('stream') and 'items' not in self.config:
+            return False
+        return self._filter is not None or bool(self._fields)
+    
+    def transform(self, records: List[Any]) -> List[Any]:
+        """
+        Apply the filter and projection to a list of records
+        
+        Args:
+            records: Records (dictionaries)
+        
+        Returns:
+            Transformed records
+        
+        Raises:
+            NodeExecutionError: If an expression cannot be evaluated on the records
+        """
+        columns = ColumnSet(records)
+        try:
+            if self._filter is not None:
+                indexes = columns.mask_indexes(self._filter.evaluate(columns))
+                if not self._fields:
+                    return [records[i] for i in indexes]
+                # Project only the kept rows
+                columns = columns.select(indexes)
+            elif not self._fields:
+                return records
+            
+            output_columns = []
+            for _, expression in self._fields:
+                if expression.field is not None:
+                    # Copied fields keep their original Python values
+                    output_columns.append(columns.values(expression.field))
+                else:
+                    output_columns.append(columns.to_list(expression.evaluate(columns)))
+        except AttributeError:
+            raise NodeExecutionError(f"Node {self.node_id}: every item must be an object")
+        except (TypeError, ValueError, ArithmeticError) as e:
+            raise NodeExecutionError(f"Node {self.node_id}: could not evaluate expressions - {str(e)}")
+        
+        return list(map(self._build_record, *output_columns))
@@ -0,0 +1,388 @@
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import threading
+from core.config import settings
+from workflows.context import ExecutionContext
+from workflows.executor import NodeExecutorFactory
+from workflows.nodes.base_node import BaseNode
+from workflows.process_pool import node_spec, process_pool
+from workflows.resilience import RetryPolicy
+from workflows.validator import WorkflowValidator
+from utils.errors import ExecutionError, NodeExecutionError
+
+
+def branch_label(value: Any) -> Optional[str]:
+    """
+    Normalize an edge ``when`` label or a node's ``branch`` output
+    
+    Args:
+        value: Label such as ``True``, ``"true"`` or a custom branch name
+    
+    Returns:
+        Comparable string label, or None for unlabelled edges
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def definition_hash(definition: Dict[str, Any]) -> str:
+    """
+    Compute a stable hash of a workflow definition
+    
+    Args:
+        definition: Workflow definition dictionary
+    
+    Returns:
+        Hex digest that only changes when the definition content changes
+    """
+    payload = json.dumps(definition, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ExecutionPlan:
+    """
+    Compiled form of a workflow definition
+    
+    Nodes are addressed by their position in topological order, so the
+    predecessor/successor arrays and levels are plain lists of indexes.
+    ``edge_labels[i]`` is aligned with ``successors[i]`` and holds the
+    normalized ``when`` label of each outgoing edge (None if unlabelled).
+    ``inputs[i]`` lists the nodes whose output node ``i`` reads through
+    ``{{node_x...}}`` references, and ``release_outputs[i]`` says whether
+    node ``i``'s output may be dropped once all of its readers finished.
+    ``stream_input[i]`` is the producer whose record stream node ``i``
+    consumes, ``stream_consumers[i]`` the nodes consuming node ``i``'s
+    stream, and ``pipelines`` maps each pipeline's first producer to the
+    rest of its nodes. ``process_specs[i]`` is set for nodes that run in
+    the worker's process pool and ``timeouts[i]`` limits each call of node
+    ``i``. Executors are created and validated once here and shared by every
+    execution that uses the plan, so node executors must not keep
+    per-execution state on ``self``.
+    """
+    
+    def __init__(self, definition: Dict[str, Any], plan_hash: Optional[str] = None):
+        graph_order = WorkflowValidator.validate(definition)
+        
+        nodes = definition['nodes']
+        edges = definition['edges']
+        order = graph_order.node_ids
+        
+        self.definition = definition
+        self.hash = plan_hash or definition_hash(definition)
+        self.node_ids: List[str] = order
+        self.index: Dict[str, int] = {node_id: i for i, node_id in enumerate(order)}
+        
+        node_defs = {node['id']: node for node in nodes}
+        self.nodes: List[Dict[str, Any]] = [node_defs[node_id] for node_id in order]
+        
+        predecessors: List[List[int]] = [[] for _ in order]
+        successors: List[List[int]] = [[] for _ in order]
+        edge_labels: List[List[Optional[str]]] = [[] for _ in order]
+        for edge in edges:
+            source = self.index[edge['from']]
+            target = self.index[edge['to']]
+            successors[source].append(target)
+            edge_labels[source].append(branch_label(edge.get('when')))
+            predecessors[target].append(source)
+        
+        self.predecessors: List[Tuple[int, ...]] = [tuple(p) for p in predecessors]
+        self.successors: List[Tuple[int, ...]] = [tuple(s) for s in successors]
+        self.edge_labels: List[Tuple[Optional[str], ...]] = [tuple(labels) for labels in edge_labels]
+        
+        # Level of a node is the length of the longest path reaching it
+        node_levels = graph_order.levels
+        self.node_levels: List[int] = node_levels
+        self.levels: List[List[int]] = [[] for _ in range(max(node_levels) + 1)]
+        for i, level in enumerate(node_levels):
+            self.levels[level].append(i)
+        
+        # Executor creation errors are kept per node so that they surface when
+        # the node runs and still honour its on_error setting
+        self.executors: List[Optional[BaseNode]] = []
+        self.executor_errors: List[Optional[str]] = []
+        for node in self.nodes:
+            executor, error = self._create_executor(node)
+            self.executors.append(executor)
+            self.executor_errors.append(error)
+        
+        self.retry_policies: List[RetryPolicy] = [
+            RetryPolicy.from_definition(node.get('retry')) for node in self.nodes
+        ]
+        
+        self._configure_calls()
+        self._link_streams()
+        
+        # Static liveness: who reads each node's output
+        inputs: List[List[int]] = [[] for _ in order]
+        consumer_counts = [0] * len(order)
+        for i, executor in enumerate(self.executors):
+            if executor is None:
+                continue
+            for node_id in executor.input_references:
+                source = self.index.get(node_id)
+                if source is None or source == i:
+                    continue
+                inputs[i].append(source)
+                consumer_counts[source] += 1
+        
+        self.inputs: List[Tuple[int, ...]] = [tuple(sources) for sources in inputs]
+        self.consumer_counts: List[int] = consumer_counts
+        
+        # Outputs kept in the final result; all of them unless the workflow
+        # lists its output_nodes
+        output_nodes = definition.get('output_nodes')
+        kept = set(order) if output_nodes is None else set(output_nodes)
+        self.output_node_ids: List[str] = [node_id for node_id in order if node_id in kept]
+        
+        # Freeing is only safe if every node declares what it reads
+        can_release = all(executor is None or executor.declares_inputs for executor in self.executors)
+        self.release_outputs: List[bool] = [
+            can_release and node_id not in kept for node_id in order
+        ]
+        
+        # Producers keep their records as output when a node reads that output
+        # instead of consuming the stream, or when nothing consumes it
+        stream_readers = {
+            i: set() for i, executor in enumerate(self.executors)
+            if executor is not None and executor.produces_stream
+        }
+        for reader, sources in enumerate(self.inputs):
+            for source in sources:
+                if source in stream_readers:
+                    stream_readers[source].add(reader)
+        
+        self.materialize_stream: List[bool] = [False] * len(order)
+        for i, readers in stream_readers.items():
+            self.materialize_stream[i] = (
+                not can_release
+                or not self.stream_consumers[i]
+                or not readers.issubset(self.stream_consumers[i])
+            )
+    
+    def _configure_calls(self) -> None:
+        """
+        Decide where each node runs and how long a call may take
+        
+        Nodes with ``"executor": "process"``, or of a type registered as
+        CPU-bound unless they set ``"executor": "inline"``, run in the
+        worker's process pool; their specs are pickled once here. A node's
+        ``"timeout"`` (seconds) limits each call. Invalid settings, and
+        streaming nodes asked to run in a process, give an executor error.
+        """
+        count = len(self.node_ids)
+        self.process_specs: List[Optional[bytes]] = [None] * count
+        self.timeouts: List[Optional[float]] = [None] * count
+        
+        for i, node in enumerate(self.nodes):
+            executor = self.executors[i]
+            if executor is None:
+                continue
+            
+            mode = node.get('executor')
+            timeout = node.get('timeout')
+            streaming = executor.produces_stream or executor.consumes_stream
+            try:
+                if mode not in (None, 'inline', 'process'):
+                    raise NodeExecutionError(f"Node {node['id']}: executor must be 'inline' or 'process', got '{mode}'")
+                if timeout is not None:
+                    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+                        raise NodeExecutionError(f"Node {node['id']}: timeout must be a positive number of seconds")
+                    self.timeouts[i] = float(timeout)
+                if mode == 'process' and streaming:
+                    raise NodeExecutionError(f"Node {node['id']}: streaming nodes cannot run in a process")
+                
+                if mode == 'process' or (
+                    mode is None and not streaming and NodeExecutorFactory.is_cpu_bound(node['type'])
+                ):
+                    self.process_specs[i] = node_spec(executor)
+            except NodeExecutionError as e:
+                self.executors[i] = None
+                self.executor_errors[i] = str(e)
+    
+    def _link_streams(self) -> None:
+        """
+        Group stream producers and their consumers into pipelines
+        
+        A node with ``consumes_stream`` must have exactly one predecessor,
+        which produces a stream, over an unlabelled edge; otherwise it gets
+        an executor error. ``pipelines`` maps each producer that does not
+        itself read a stream to the plan indexes of all nodes fed from it,
+        in topological order.
+        """
+        count = len(self.node_ids)
+        self.stream_input: List[Optional[int]] = [None] * count
+        stream_consumers: List[List[int]] = [[] for _ in range(count)]
+        
+        for i, executor in enumerate(self.executors):
+            if executor is None or not executor.consumes_stream:
+                continue
+            
+            predecessors = self.predecessors[i]
+            source = predecessors[0] if len(predecessors) == 1 else None
+            producer = self.executors[source] if source is not None else None
+            if (
+                producer is None
+                or not producer.produces_stream
+                or self.edge_labels[source][self.successors[source].index(i)] is not None
+            ):
+                self.executors[i] = None
+                self.executor_errors[i] = (
+                    f"Node {self.node_ids[i]} reads a record stream and needs exactly one "
+                    f"predecessor producing one, over an edge without 'when'"
+                )
+                continue
+            
+            self.stream_input[i] = source
+            stream_consumers[source].append(i)
+        
+        self.stream_consumers: List[Tuple[int, ...]] = [tuple(c) for c in stream_consumers]
+        
+        self.pipelines: Dict[int, Tuple[int, ...]] = {}
+        for i, executor in enumerate(self.executors):
+            if executor is None or not executor.produces_stream or self.stream_input[i] is not None:
+                continue
+            
+            members = []
+            pending = list(self.stream_consumers[i])
+            while pending:
+                member = pending.pop()
+                members.append(member)
+                pending.extend(self.stream_consumers[member])
+            self.pipelines[i] = tuple(sorted(members))
+    
+    def __len__(self) -> int:
+        return len(self.node_ids)
+    
+    async def execute_node(self, index: int, context: ExecutionContext) -> Any:
+        """
+        Call a node's executor once, in the process pool if the node runs there
+        
+        Args:
+            index: Plan index of the node; its executor must exist
+            context: Execution context
+        
+        Returns:
+            Node output
+        
+        Raises:
+            NodeExecutionError: If the call exceeds the node's timeout
+        """
+        executor = self.executors[index]
+        timeout = self.timeouts[index]
+        
+        spec = self.process_specs[index]
+        if spec is not None:
+            # Only the outputs the node reads are sent to the process
+            references = executor.input_references if executor.declares_inputs else None
+            return await process_pool.run(executor.node_id, spec, context.fork(references, {}), timeout)
+        
+        if timeout is None:
+            return await executor.execute(context)
+        
+        try:
+            return await asyncio.wait_for(executor.execute(context), timeout)
+        except asyncio.TimeoutError:
+            raise NodeExecutionError(f"Node {executor.node_id}: timed out after {timeout:g}s")
+    
+    def get_node(self, node_id: str) -> Dict[str, Any]:
+        """Get node definition by ID"""
+        try:
+            return self.nodes[self.index[node_id]]
+        except KeyError:
+            raise ExecutionError(f"Node {node_id} not found in workflow definition")
+    
+    @staticmethod
+    def _create_executor(node: Dict[str, Any]) -> Tuple[Optional[BaseNode], Optional[str]]:
+        """Create and validate the executor for a node"""
+        try:
+            executor = NodeExecutorFactory.create(
+                node['type'],
+                node['id'],
+                node.get('config', {})
+            )
+        except NodeExecutionError as e:
+            return None, str(e)
+        
+        if not executor.validate_config():
+            return None, f"Invalid configuration for node {node['id']}"
+        
+        return executor, None
+
+
+class PlanCache:
+    """
+    LRU cache of compiled execution plans keyed by definition hash
+    
+    One instance lives in each worker process (see ``plan_cache``).
+    """
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans: "OrderedDict[str, ExecutionPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, definition: Dict[str, Any]) -> ExecutionPlan:
+        """
+        Get the plan for a definition, compiling it on a miss
+        
+        Args:
+            definition: Workflow definition dictionary
+        
+        Returns:
+            Compiled execution plan
+        
+        Raises:
+            ValidationError: If the definition is invalid
+        """
+        key = definition_hash(definition)
+        
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+        
+        # Compile outside the lock; a concurrent miss on the same key just
+        # compiles twice and the last writer wins
+        plan = ExecutionPlan(definition, key)
+        
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        
+        return plan
+    
+    def clear(self) -> None:
+        """Drop all cached plans and reset counters"""
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._plans),
+                'maxsize': self.maxsize,
+            }
+
+
+# Per-process plan cache shared by all tasks in a worker
+plan_cache = PlanCache(settings.PLAN_CACHE_SIZE)
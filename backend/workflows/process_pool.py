@@ -0,0 +1,287 @@
+from typing import Any, List, Optional, Set
+from functools import lru_cache
+import asyncio
+import os
+import pickle
+import signal
+import threading
+import billiard
+from core.config import settings
+from workflows.context import ExecutionContext
+from workflows.nodes.base_node import BaseNode
+from utils.errors import NodeExecutionError, RetryableError
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Node specs, inputs and outputs cross the process boundary as pickles
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+# Executors rebuilt in a pool process, keyed by node spec
+EXECUTOR_CACHE_SIZE = 256
+
+_SERIALIZATION_ERRORS = (pickle.PicklingError, TypeError, AttributeError)
+
+
+def node_spec(executor: BaseNode) -> bytes:
+    """
+    Serialize what a pool process needs to rebuild a node executor
+    
+    Args:
+        executor: Node executor
+    
+    Returns:
+        Pickled node class, ID and config
+    
+    Raises:
+        NodeExecutionError: If the node cannot be pickled
+    """
+    try:
+        return pickle.dumps((type(executor), executor.node_id, executor.config), PICKLE_PROTOCOL)
+    except _SERIALIZATION_ERRORS as e:
+        raise NodeExecutionError(f"Node {executor.node_id}: cannot run in a process - {str(e)}")
+
+
+class NodeProcessPool:
+    """
+    Process pool running CPU-bound nodes off the worker's event loop
+    
+    Each pool process serves one call at a time over its own pipe, so a
+    call that passes its timeout (or is cancelled) is stopped by killing
+    just that process; calls running in the other processes are not
+    affected, and a new process is started when one is needed. A process
+    that dies during a call fails it with ``RetryableError``, which follows
+    the node's retry policy.
+    
+    Processes are billiard's, which Celery ships with, because unlike
+    multiprocessing it lets a daemonic prefork child start them. They are
+    spawned rather than forked, because the worker has an event loop thread
+    and open connections, and reused across executions. A call sends the
+    node spec, pickled once per plan, and a context holding only the
+    outputs the node references. The process caches the executors it
+    rebuilds and runs them on its own event loop. Only the node's output
+    comes back; changes the node makes to the context do not.
+    """
+    
+    def __init__(self, max_workers: int, default_timeout: float):
+        self.max_workers = max(1, max_workers)
+        self.default_timeout = default_timeout
+        self._idle: List[_PoolProcess] = []
+        self._processes: Set[_PoolProcess] = set()
+        self._lock = threading.Lock()
+        
+        # Calls waiting for a free process; asyncio primitives are bound to
+        # one loop, so a new one is made if the pool is used from another
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def run(
+        self,
+        node_id: str,
+        spec: bytes,
+        context: ExecutionContext,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Run a node once in a pool process
+        
+        Args:
+            node_id: Node ID for error messages
+            spec: Node spec from ``node_spec``
+            context: Context holding the outputs the node reads
+            timeout: Seconds the call may take, the pool's default if None
+        
+        Returns:
+            Node output
+        
+        Raises:
+            NodeExecutionError: If the call times out or its inputs cannot
+                be serialized
+            RetryableError: If the pool process died during the call
+        """
+        try:
+            payload = pickle.dumps(context, PICKLE_PROTOCOL)
+        except _SERIALIZATION_ERRORS as e:
+            raise NodeExecutionError(f"Node {node_id}: inputs cannot be sent to a process - {str(e)}")
+        
+        limit = self.default_timeout if timeout is None else timeout
+        
+        async with self._get_slots():
+            process = await self._acquire(node_id)
+            try:
+                process.conn.send_bytes(pickle.dumps((spec, payload), PICKLE_PROTOCOL))
+                ok, value = pickle.loads(await asyncio.wait_for(_receive(process.conn), limit))
+            except asyncio.TimeoutError:
+                logger.warning(f"Node process pool: node {node_id} timed out after {limit:g}s, stopping its process")
+                self._kill(process)
+                raise NodeExecutionError(f"Node {node_id}: timed out after {limit:g}s")
+            except (EOFError, OSError):
+                self._kill(process)
+                raise RetryableError(f"Node {node_id}: pool process died during the call")
+            except BaseException:
+                # Cancelled, or an unreadable reply: the process may still be busy
+                self._kill(process)
+                raise
+            
+            with self._lock:
+                self._idle.append(process)
+        
+        if not ok:
+            raise value
+        return pickle.loads(value)
+    
+    def shutdown(self) -> None:
+        """Kill the pool processes"""
+        with self._lock:
+            processes = list(self._processes)
+        
+        for process in processes:
+            self._kill(process)
+        if processes:
+            logger.info("Node process pool: stopped")
+    
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Semaphore bounding calls to ``max_workers``, for the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._slots_loop is not loop:
+                self._slots = asyncio.Semaphore(self.max_workers)
+                self._slots_loop = loop
+            return self._slots
+    
+    async def _acquire(self, node_id: str) -> "_PoolProcess":
+        """Take an idle process, starting one if there is none"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        
+        process = _PoolProcess()
+        with self._lock:
+            self._processes.add(process)
+        
+        try:
+            # The process reports once its imports are done, so they do not
+            # count against the first call's timeout
+            await _receive(process.conn)
+        except (EOFError, OSError):
+            self._kill(process)
+            raise RetryableError(f"Node {node_id}: pool process failed to start")
+        except BaseException:
+            self._kill(process)
+            raise
+        
+        logger.info(f"Node process pool: started process {process.process.pid}")
+        return process
+    
+    def _kill(self, process: "_PoolProcess") -> None:
+        """Stop a process, whatever it is doing"""
+        with self._lock:
+            self._processes.discard(process)
+            if process in self._idle:
+                self._idle.remove(process)
+        process.kill()
+
+
+class _PoolProcess:
+    """A pool process and the parent's end of its pipe"""
+    
+    def __init__(self):
+        context = billiard.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+    
+    def kill(self) -> None:
+        """Kill the process; it shares no locks, so it can stop anywhere"""
+        self.conn.close()
+        if self.process.is_alive():
+            os.kill(self.process.pid, signal.SIGKILL)
+        self.process.join()
+
+
+async def _receive(conn: Any) -> bytes:
+    """Wait for a message on a pipe without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    ready = loop.create_future()
+    fd = conn.fileno()
+    loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+    try:
+        await ready
+    finally:
+        loop.remove_reader(fd)
+    return conn.recv_bytes()
+
+
+def _serve(conn: Any) -> None:
+    """
+    Main loop of a pool process: run calls until the parent closes the pipe
+    
+    Each reply is ``(True, pickled output)`` or ``(False, error)``.
+    """
+    conn.send_bytes(b'')
+    while True:
+        try:
+            spec, payload = pickle.loads(conn.recv_bytes())
+        except EOFError:
+            return
+        
+        try:
+            reply = (True, _run_node(spec, payload))
+        except Exception as e:
+            reply = (False, _portable_error(e))
+        conn.send_bytes(pickle.dumps(reply, PICKLE_PROTOCOL))
+
+
+# Event loop of a pool process, kept so loop-bound clients survive between calls
+_process_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+@lru_cache(maxsize=EXECUTOR_CACHE_SIZE)
+def _load_executor(spec: bytes) -> BaseNode:
+    """Rebuild a node executor in a pool process"""
+    node_class, node_id, config = pickle.loads(spec)
+    return node_class(node_id, config)
+
+
+def _run_node(spec: bytes, payload: bytes) -> bytes:
+    """
+    Run one node call in a pool process
+    
+    Args:
+        spec: Node spec from ``node_spec``
+        payload: Pickled execution context
+    
+    Returns:
+        Pickled node output
+    """
+    global _process_loop
+    if _process_loop is None:
+        _process_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_process_loop)
+    
+    executor = _load_executor(spec)
+    context = pickle.loads(payload)
+    
+    try:
+        result = _process_loop.run_until_complete(executor.execute(context))
+    except Exception as e:
+        raise _portable_error(e) from None
+    
+    try:
+        return pickle.dumps(result, PICKLE_PROTOCOL)
+    except _SERIALIZATION_ERRORS as e:
+        raise NodeExecutionError(f"Node {executor.node_id}: output cannot be sent back from a process - {str(e)}")
+
+
+def _portable_error(error: Exception) -> Exception:
+    """The error itself if it survives pickling, else a NodeExecutionError with its message"""
+    try:
+        pickle.loads(pickle.dumps(error, PICKLE_PROTOCOL))
+    except Exception:
+        return NodeExecutionError(f"{type(error).__name__}: {str(error)}")
+    return error
+
+
+# Per-process pool shared by all executions in a worker
+process_pool = NodeProcessPool(settings.PROCESS_POOL_SIZE, settings.PROCESS_POOL_TIMEOUT_SECONDS)
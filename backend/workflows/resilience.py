@@ -0,0 +1,198 @@
+from typing import Any, Dict, Optional
+import random
+import threading
+import time
+from core.config import settings
+from utils.errors import CircuitOpenError, RetryableError, ValidationError
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RetryPolicy:
+    """
+    Per-node retry policy
+    
+    Declared on the node definition next to ``on_error``::
+        
+        "retry": {
+            "max_attempts": 3,
+            "backoff_seconds": 1,
+            "backoff_multiplier": 2,
+            "max_backoff_seconds": 30,
+            "jitter": true,
+            "retry_on_status": [429, 502, 503, 504]
+        }
+    
+    Only transient failures are retried: ``RetryableError`` (raised by nodes
+    for transport errors and timeouts) and results whose ``status_code`` is
+    listed in ``retry_on_status``. Open circuit breakers are never retried.
+    """
+    
+    def __init__(
+        self,
+        max_attempts: int = 1,
+        backoff_seconds: float = 1.0,
+        backoff_multiplier: float = 2.0,
+        max_backoff_seconds: float = 30.0,
+        jitter: bool = True,
+        retry_on_status: Optional[list] = None,
+    ):
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_seconds = float(backoff_seconds)
+        self.backoff_multiplier = float(backoff_multiplier)
+        self.max_backoff_seconds = float(max_backoff_seconds)
+        self.jitter = bool(jitter)
+        self.retry_on_status = frozenset(int(code) for code in retry_on_status or ())
+    
+    @classmethod
+    def from_definition(cls, data: Optional[Dict[str, Any]]) -> "RetryPolicy":
+        """
+        Build a policy from a node's ``retry`` block
+        
+        Args:
+            data: Retry settings, or None for no retries
+        
+        Returns:
+            Retry policy
+        
+        Raises:
+            ValidationError: If the retry block is malformed
+        """
+        if data is None:
+            return cls()
+        
+        if not isinstance(data, dict):
+            raise ValidationError("Node 'retry' must be a dictionary")
+        
+        try:
+            return cls(**data)
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"Invalid retry policy: {str(e)}")
+    
+    def check_result(self, result: Any) -> None:
+        """
+        Turn a result with a retryable status code into an error
+        
+        Raises:
+            RetryableError: If the result's status code is retryable
+        """
+        if self.retry_on_status and isinstance(result, dict):
+            status_code = result.get('status_code')
+            if status_code in self.retry_on_status:
+                raise RetryableError(f"Retryable status code {status_code}", status_code=status_code)
+    
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """Check if another attempt should follow a failed one"""
+        return attempt < self.max_attempts and isinstance(error, RetryableError)
+    
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before the next attempt
+        
+        Exponential backoff capped at ``max_backoff_seconds``; with jitter
+        the delay is drawn uniformly from [0, backoff] so that executions
+        retrying against the same host spread out.
+        """
+        delay = min(
+            self.max_backoff_seconds,
+            self.backoff_seconds * self.backoff_multiplier ** (attempt - 1),
+        )
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one downstream host
+    
+    Closed: calls pass and consecutive failures are counted. After
+    ``failure_threshold`` failures the breaker opens and calls fail fast for
+    ``recovery_seconds``. Then it is half-open: a single trial call is let
+    through, and its outcome closes or re-opens the breaker.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, host: str, failure_threshold: int, recovery_seconds: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+    
+    def before_call(self) -> None:
+        """
+        Admit or reject a call
+        
+        Raises:
+            CircuitOpenError: If the breaker is open or a trial call is in flight
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_seconds:
+                raise CircuitOpenError(f"Circuit open for host {self.host}")
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                raise CircuitOpenError(f"Circuit half-open for host {self.host}, trial call in progress")
+            self._trial_in_flight = True
+    
+    def release(self) -> None:
+        """Release an admitted call that ended without a verdict on the host"""
+        self._trial_in_flight = False
+    
+    def record_success(self) -> None:
+        """Record a successful call"""
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit breaker: host {self.host} recovered")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Record a failed call"""
+        self.failures += 1
+        self._trial_in_flight = False
+        
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit breaker: opening for host {self.host} after {self.failures} failure(s)")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """Per-process circuit breakers keyed by host, shared across executions"""
+    
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, host: str) -> CircuitBreaker:
+        """Get the breaker for a host, creating it on first use"""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    host,
+                    CircuitBreaker(
+                        host,
+                        settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                        settings.CIRCUIT_BREAKER_RECOVERY_SECONDS,
+                    ),
+                )
+        return breaker
+    
+    def reset(self) -> None:
+        """Forget all breaker state"""
+        with self._lock:
+            self._breakers.clear()
+
+
+# Per-process breakers shared by all HTTP nodes in a worker
+circuit_breakers = CircuitBreakerRegistry()
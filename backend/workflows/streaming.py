@@ -0,0 +1,135 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+from workflows.context import ExecutionContext
+from workflows.plan import ExecutionPlan
+from utils.errors import StreamNodeError
+
+# Marks the end of a stream in a queue
+_END = object()
+
+
+class RecordStream:
+    """
+    Bounded queue of record batches between a producer and one consumer
+    
+    The producer waits in ``put`` while ``maxsize`` batches are pending, so a
+    slow consumer throttles its producer and memory stays bounded. The
+    consumer iterates the stream with ``async for``. A consumer that stops
+    reading early calls ``detach``; later batches are then dropped so the
+    producer can finish.
+    """
+    
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue = asyncio.Queue(max(1, maxsize))
+        self._detached = False
+    
+    async def put(self, batch: List[Any]) -> None:
+        """Hand a batch to the consumer, waiting while the queue is full"""
+        if not self._detached:
+            await self._queue.put(batch)
+    
+    async def close(self) -> None:
+        """Signal that no more batches follow"""
+        if not self._detached:
+            await self._queue.put(_END)
+    
+    def detach(self) -> None:
+        """Stop accepting batches and drop the pending ones"""
+        self._detached = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+    
+    def __aiter__(self) -> "RecordStream":
+        return self
+    
+    async def __anext__(self) -> List[Any]:
+        batch = await self._queue.get()
+        if batch is _END:
+            raise StopAsyncIteration
+        return batch
+
+
+async def run_pipeline(plan: ExecutionPlan, head: int, context: ExecutionContext, queue_size: int) -> Dict[int, Any]:
+    """
+    Run a stream producer and every node fed from it concurrently
+    
+    Each streaming edge gets a ``RecordStream``; producers push every batch
+    to all of their consumers, so batches flow through the whole pipeline
+    while the source is still reading. Producers output
+    ``{'batches': n, 'count': m}``, plus the ``records`` themselves if
+    ``plan.materialize_stream`` says another node reads them. Consumers
+    that only consume output whatever ``consume`` returns.
+    
+    Args:
+        plan: Execution plan containing the pipeline
+        head: Plan index of the pipeline's first producer
+        context: Execution context
+        queue_size: Batches buffered per streaming edge
+    
+    Returns:
+        Output per plan index of every node in the pipeline
+    
+    Raises:
+        StreamNodeError: If a node fails; the other nodes are cancelled
+    """
+    members = (head,) + plan.pipelines[head]
+    inputs = {member: RecordStream(queue_size) for member in plan.pipelines[head]}
+    outputs: Dict[int, Any] = {}
+    
+    async def run_member(index: int) -> None:
+        executor = plan.executors[index]
+        upstream: Optional[RecordStream] = inputs.get(index)
+        
+        try:
+            if executor.produces_stream:
+                outputs[index] = await _produce(
+                    executor.stream(context, upstream),
+                    [inputs[consumer] for consumer in plan.stream_consumers[index]],
+                    plan.materialize_stream[index],
+                )
+            else:
+                outputs[index] = await executor.consume(context, upstream)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise StreamNodeError(str(e), plan.node_ids[index]) from e
+        finally:
+            if upstream is not None:
+                upstream.detach()
+    
+    tasks = [asyncio.create_task(run_member(member)) for member in members]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            # Re-raises the first failure
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    return outputs
+
+
+async def _produce(batches: Any, consumers: List[RecordStream], materialize: bool) -> Dict[str, Any]:
+    """Forward a producer's batches to its consumers and count them"""
+    batch_count = 0
+    record_count = 0
+    records: Optional[List[Any]] = [] if materialize else None
+    
+    async for batch in batches:
+        batch_count += 1
+        record_count += len(batch)
+        if records is not None:
+            records.extend(batch)
+        
+        for consumer in consumers:
+            await consumer.put(batch)
+    
+    for consumer in consumers:
+        await consumer.close()
+    
+    output: Dict[str, Any] = {'batches': batch_count, 'count': record_count}
+    if records is not None:
+        output['records'] = records
+    return output
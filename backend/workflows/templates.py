@@ -0,0 +1,287 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
+from functools import lru_cache
+import re
+
+# Pattern to match {{...}}
+VARIABLE_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+
+
+class CompiledTemplate(ABC):
+    """
+    Pre-parsed form of a config value containing ``{{...}}`` expressions
+    
+    Constant parts are kept as-is and every expression becomes an accessor
+    closure, so rendering only touches the dynamic parts. Rendered values
+    may share constant sub-objects with the template and must be treated
+    as read-only.
+    """
+    
+    is_static = False
+    
+    @abstractmethod
+    def render(self, context: Any) -> Any:
+        """
+        Resolve the template against an execution context
+        
+        Args:
+            context: ExecutionContext providing node outputs and global variables
+        
+        Returns:
+            Resolved value
+        """
+        pass
+    
+    @property
+    def references(self) -> FrozenSet[str]:
+        """IDs of nodes whose output this template reads"""
+        return frozenset()
+
+
+class StaticTemplate(CompiledTemplate):
+    """Value without any expressions"""
+    
+    is_static = True
+    
+    def __init__(self, value: Any):
+        self.value = value
+    
+    def render(self, context: Any) -> Any:
+        return self.value
+
+
+class StringTemplate(CompiledTemplate):
+    """String with one or more ``{{...}}`` expressions"""
+    
+    def __init__(self, parts: List[Any], references: FrozenSet[str]):
+        # Each part is either a constant string or an accessor closure
+        self._parts = tuple(parts)
+        self._references = references
+    
+    def render(self, context: Any) -> str:
+        return ''.join(part if isinstance(part, str) else part(context) for part in self._parts)
+    
+    @property
+    def references(self) -> FrozenSet[str]:
+        return self._references
+
+
+class ContainerTemplate(CompiledTemplate):
+    """Dict or list where only some entries contain expressions"""
+    
+    def __init__(self, base: Any, dynamic: List[Tuple[Any, CompiledTemplate]]):
+        self._base = base
+        self._dynamic = tuple(dynamic)
+        self._references = frozenset().union(*(template.references for _, template in dynamic))
+    
+    def render(self, context: Any) -> Any:
+        result = self._base.copy()
+        for key, template in self._dynamic:
+            result[key] = template.render(context)
+        return result
+    
+    @property
+    def references(self) -> FrozenSet[str]:
+        return self._references
+
+
+# Returned by lookups that cannot resolve their path
+_MISSING = object()
+
+
+def _compile_lookup(var_path: str) -> Callable[[Any], Any]:
+    """
+    Build a closure reading the raw value at a dotted path
+    
+    Args:
+        var_path: Dotted path such as ``node_1.body.items``
+    
+    Returns:
+        Function mapping an execution context to the value; ``_MISSING`` if
+        the head is unknown or the path runs into a non-dictionary
+    """
+    parts = var_path.strip().split('.')
+    head = parts[0]
+    tail = tuple(parts[1:])
+    is_node_output = head.startswith('node_')
+    
+    def lookup(context: Any) -> Any:
+        # Check if it's a node output reference, then a global variable
+        if is_node_output:
+            value = context.get_node_output(head)
+        elif context.has_global_var(head):
+            value = context.get_global_var(head)
+        else:
+            return _MISSING
+        
+        # Navigate through the remaining path
+        for part in tail:
+            if isinstance(value, dict):
+                value = value.get(part)
+            else:
+                return _MISSING
+            
+            if value is None:
+                return None
+        
+        return value
+    
+    return lookup
+
+
+def _compile_accessor(expression: str, var_path: str) -> Callable[[Any], str]:
+    """
+    Build a closure resolving one ``{{var_path}}`` expression
+    
+    Args:
+        expression: Full original expression, returned when it cannot be resolved
+        var_path: Dotted path inside the braces
+    
+    Returns:
+        Function mapping an execution context to the resolved string
+    """
+    lookup = _compile_lookup(var_path)
+    
+    def accessor(context: Any) -> str:
+        value = lookup(context)
+        if value is _MISSING:
+            return expression
+        return str(value) if value is not None else ""
+    
+    return accessor
+
+
+@lru_cache(maxsize=4096)
+def compile_string(value: str) -> CompiledTemplate:
+    """
+    Compile a string that may contain ``{{...}}`` expressions
+    
+    Args:
+        value: Template string
+    
+    Returns:
+        Compiled template; static if the string has no expressions
+    """
+    parts: List[Any] = []
+    references = set()
+    position = 0
+    
+    for match in VARIABLE_PATTERN.finditer(value):
+        if match.start() > position:
+            parts.append(value[position:match.start()])
+        
+        var_path = match.group(1)
+        parts.append(_compile_accessor(match.group(0), var_path))
+        
+        head = var_path.strip().split('.')[0]
+        if head.startswith('node_'):
+            references.add(head)
+        
+        position = match.end()
+    
+    if not parts:
+        return StaticTemplate(value)
+    
+    if position < len(value):
+        parts.append(value[position:])
+    
+    return StringTemplate(parts, frozenset(references))
+
+
+class ReferenceTemplate(CompiledTemplate):
+    """Single ``{{...}}`` expression resolving to the raw value it points at"""
+    
+    def __init__(self, var_path: str):
+        self._lookup = _compile_lookup(var_path)
+        head = var_path.strip().split('.')[0]
+        self._references = frozenset([head]) if head.startswith('node_') else frozenset()
+    
+    def render(self, context: Any) -> Any:
+        value = self._lookup(context)
+        return None if value is _MISSING else value
+    
+    @property
+    def references(self) -> FrozenSet[str]:
+        return self._references
+
+
+def compile_reference(value: Any) -> CompiledTemplate:
+    """
+    Compile a config value that should keep the type of the data it references
+    
+    A string made of exactly one ``{{...}}`` expression, such as
+    ``"{{node_1.body.items}}"``, renders to the referenced object itself (a
+    list stays a list; None if it cannot be resolved). Other values are
+    compiled as usual.
+    
+    Args:
+        value: Config value
+    
+    Returns:
+        Compiled template
+    """
+    if isinstance(value, str):
+        match = VARIABLE_PATTERN.fullmatch(value.strip())
+        if match:
+            return ReferenceTemplate(match.group(1))
+    return _compile_value(value, nested_lists=True)
+
+
+def _compile_value(value: Any, nested_lists: bool) -> CompiledTemplate:
+    """Compile a single config value"""
+    if isinstance(value, str):
+        return compile_string(value)
+    if isinstance(value, dict):
+        return _compile_dict(value)
+    if isinstance(value, list) and nested_lists:
+        return _compile_list(value)
+    return StaticTemplate(value)
+
+
+def _compile_list(items: List[Any]) -> CompiledTemplate:
+    """Compile a list; nested lists inside lists are kept as-is"""
+    dynamic = []
+    for i, item in enumerate(items):
+        template = _compile_value(item, nested_lists=False)
+        if not template.is_static:
+            dynamic.append((i, template))
+    
+    if not dynamic:
+        return StaticTemplate(items)
+    
+    return ContainerTemplate(list(items), dynamic)
+
+
+def _compile_dict(data: Dict[str, Any]) -> CompiledTemplate:
+    """Compile a dictionary; static if no value contains expressions"""
+    dynamic = []
+    for key, value in data.items():
+        template = _compile_value(value, nested_lists=True)
+        if not template.is_static:
+            dynamic.append((key, template))
+    
+    if not dynamic:
+        return StaticTemplate(data)
+    
+    return ContainerTemplate(dict(data), dynamic)
+
+
+def compile_config(config: Dict[str, Any]) -> CompiledTemplate:
+    """
+    Compile a node config dictionary
+    
+    Resolves the same values as ``ExecutionContext.resolve_dict_variables``:
+    strings, nested dicts, and strings or dicts inside lists.
+    
+    Args:
+        config: Node configuration
+    
+    Returns:
+        Compiled template rendering to a new top-level dictionary
+    """
+    template = _compile_dict(config)
+    
+    if template.is_static:
+        return ContainerTemplate(dict(config), [])
+    
+    return template
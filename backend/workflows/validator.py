@@ -1,8 +1,23 @@
-from typing import Dict, List, Any
-from collections import defaultdict, deque
+from typing import Any, Dict, List
+from collections import deque
 from utils.errors import ValidationError
 
 
+class GraphOrder:
+    """
+    Topological order of a workflow graph
+    
+    ``levels[i]`` is the level of ``node_ids[i]``: the length of the longest
+    path reaching it, so nodes on the same level never depend on each other.
+    """
+    
+    __slots__ = ('node_ids', 'levels')
+    
+    def __init__(self, node_ids: List[str], levels: List[int]):
+        self.node_ids = node_ids
+        self.levels = levels
+
+
 class WorkflowValidator:
     """Validator for workflow definitions"""
     
@@ -17,6 +32,23 @@ class WorkflowValidator:
         Returns:
             True if valid
         
+        Raises:
+            ValidationError: If validation fails
+        """
+        WorkflowValidator.validate(definition)
+        return True
+    
+    @staticmethod
+    def validate(definition: Dict[str, Any]) -> GraphOrder:
+        """
+        Validate a workflow definition and order its nodes
+        
+        Args:
+            definition: Workflow definition dictionary
+        
+        Returns:
+            Topological order and levels of the nodes
+        
         Raises:
             ValidationError: If validation fails
         """
@@ -47,6 +79,9 @@ class WorkflowValidator:
             if 'id' not in node or 'type' not in node:
                 raise ValidationError(f"Node {i} must have 'id' and 'type'")
             
+            if node['id'] in node_ids:
+                raise ValidationError(f"Node {i}: duplicate node ID '{node['id']}'")
+            
             node_ids.add(node['id'])
         
         # Validate edges
@@ -62,55 +97,110 @@ class WorkflowValidator:
             
             if edge['to'] not in node_ids:
                 raise ValidationError(f"Edge {i}: target node '{edge['to']}' not found")
+            
+            if not isinstance(edge.get('when', ''), (str, bool)):
+                raise ValidationError(f"Edge {i}: 'when' must be a string or boolean")
         
-        # Check for cycles
-        if WorkflowValidator._has_cycle(nodes, edges):
-            raise ValidationError("Workflow contains a cycle")
+        output_nodes = definition.get('output_nodes')
+        if output_nodes is not None:
+            if not isinstance(output_nodes, list):
+                raise ValidationError("output_nodes must be a list of node IDs")
+            
+            for node_id in output_nodes:
+                if node_id not in node_ids:
+                    raise ValidationError(f"Output node '{node_id}' not found")
         
-        return True
+        return WorkflowValidator.order_graph(nodes, edges)
     
     @staticmethod
-    def _has_cycle(nodes: List[Dict], edges: List[Dict]) -> bool:
+    def order_graph(nodes: List[Dict], edges: List[Dict]) -> GraphOrder:
         """
-        Check if workflow graph contains a cycle using DFS
+        Sort a workflow graph topologically in one iterative pass
+        
+        Kahn's algorithm over an adjacency index of node positions, built
+        once; a node's level is settled when its last predecessor is taken
+        off the queue. Runs in O(nodes + edges) without recursion, so long
+        chains do not hit the interpreter's recursion limit.
         
         Args:
-            nodes: List of nodes
-            edges: List of edges
+            nodes: List of nodes with unique IDs
+            edges: List of edges between those nodes
         
         Returns:
-            True if cycle exists, False otherwise
+            Topological order and levels of the nodes
+        
+        Raises:
+            ValidationError: If the graph contains a cycle; the message names
+                the nodes along one cycle
         """
-        # Build adjacency list
-        graph = defaultdict(list)
+        node_ids = [node['id'] for node in nodes]
+        position = {node_id: i for i, node_id in enumerate(node_ids)}
+        
+        successors: List[List[int]] = [[] for _ in node_ids]
+        in_degree = [0] * len(node_ids)
         for edge in edges:
-            graph[edge['from']].append(edge['to'])
+            target = position[edge['to']]
+            successors[position[edge['from']]].append(target)
+            in_degree[target] += 1
         
-        # Track visited nodes and recursion stack
-        visited = set()
-        rec_stack = set()
+        node_levels = [0] * len(node_ids)
+        queue = deque(i for i, degree in enumerate(in_degree) if degree == 0)
+        order: List[int] = []
         
-        def has_cycle_dfs(node_id):
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            for neighbor in graph[node_id]:
-                if neighbor not in visited:
-                    if has_cycle_dfs(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            next_level = node_levels[i] + 1
             
-            rec_stack.remove(node_id)
-            return False
+            for target in successors[i]:
+                if node_levels[target] < next_level:
+                    node_levels[target] = next_level
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    queue.append(target)
+        
+        if len(order) != len(node_ids):
+            cycle = WorkflowValidator._find_cycle(successors, in_degree)
+            path = " -> ".join(str(node_ids[i]) for i in cycle)
+            raise ValidationError(f"Workflow contains a cycle: {path}")
+        
+        return GraphOrder([node_ids[i] for i in order], [node_levels[i] for i in order])
+    
+    @staticmethod
+    def _find_cycle(successors: List[List[int]], in_degree: List[int]) -> List[int]:
+        """
+        Find one cycle among the nodes Kahn's algorithm could not order
+        
+        Every such node still has a predecessor that is not ordered either,
+        so walking predecessors from any of them must revisit a node.
         
-        # Check all nodes
-        for node in nodes:
-            if node['id'] not in visited:
-                if has_cycle_dfs(node['id']):
-                    return True
+        Args:
+            successors: Adjacency index by node position
+            in_degree: Remaining in-degrees after the topological sort
         
-        return False
+        Returns:
+            Node positions along the cycle, first node repeated at the end
+        """
+        predecessor: Dict[int, int] = {}
+        for source, targets in enumerate(successors):
+            if in_degree[source] == 0:
+                continue
+            for target in targets:
+                predecessor.setdefault(target, source)
+        
+        # Walk back until a node repeats; the walk from there is the cycle
+        seen: Dict[int, int] = {}
+        walk: List[int] = []
+        i = next(iter(predecessor))
+        while i not in seen:
+            seen[i] = len(walk)
+            walk.append(i)
+            i = predecessor[i]
+        
+        cycle = walk[seen[i]:]
+        cycle.reverse()
+        cycle.append(cycle[0])
+        return cycle
     
     @staticmethod
     def get_execution_order(nodes: List[Dict], edges: List[Dict]) -> List[str]:
@@ -125,31 +215,6 @@ class WorkflowValidator:
             List of node IDs in execution order
         
         Raises:
-            ValidationError: If topological sort fails
+            ValidationError: If the graph contains a cycle
         """
-        # Build adjacency list and in-degree map
-        graph = defaultdict(list)
-        in_degree = {node['id']: 0 for node in nodes}
-        
-        for edge in edges:
-            graph[edge['from']].append(edge['to'])
-            in_degree[edge['to']] += 1
-        
-        # Kahn's algorithm
-        queue = deque([node_id for node_id, degree in in_degree.items() if degree == 0])
-        execution_order = []
-        
-        while queue:
-            node_id = queue.popleft()
-            execution_order.append(node_id)
-            
-            for neighbor in graph[node_id]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
-        
-        if len(execution_order) != len(nodes):
-            raise ValidationError("Cannot determine execution order (cycle detected)")
-        
-        return execution_order
-
+        return WorkflowValidator.order_graph(nodes, edges).node_ids